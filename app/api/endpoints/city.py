@@ -1,4 +1,4 @@
-from fastapi import FastAPI, HTTPException, APIRouter
+from fastapi import FastAPI, HTTPException, APIRouter, Request, Response
 from typing import List
 import pymysql
 from app.db.connect import *
@@ -8,7 +8,25 @@ router = APIRouter()
 
 
 @router.get("/locations")
-async def get_locations():
-    locations = await get_locations_service() 
+async def get_locations(request: Request):
+    locations = await get_locations_service()
 
-    return locations
+    headers = {
+        "ETag": locations["etag"],
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+
+    # 클라이언트가 가진 데이터와 같으면 본문 없이 304
+    if_none_match = [
+        tag.strip().removeprefix("W/")
+        for tag in request.headers.get("if-none-match", "").split(",")
+    ]
+    if locations["etag"] in if_none_match or "*" in if_none_match:
+        return Response(status_code=304, headers=headers)
+
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=locations["gzip"], media_type="application/json", headers=headers)
+
+    return Response(content=locations["body"], media_type="application/json", headers=headers)
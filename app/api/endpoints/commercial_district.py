@@ -3,8 +3,9 @@ import logging
 from fastapi import APIRouter, HTTPException, Query
 from typing import List, Optional
 
+from app.core.responses import FastJSONResponse
+
 from app.schemas.commercial_district import (
-    CommercialDistrictOutput,
     CommercialStatisticsData,
     CommercialStatisticsDataDate,
     CommercialStatisticsOutput,
@@ -48,7 +49,7 @@ def get_commercial_district_by_query(
     try:
         # logger.info(f"y_m:{y_m}")
 
-        results: CommercialDistrictOutput = (
+        results: List[dict] = (
             service_select_commercial_district_by_dynamic_query(
                 city_id,
                 district_id,
@@ -81,23 +82,24 @@ def get_commercial_district_by_query(
             # 각 상권의 통계 데이터 가져오기
             statistics_data: CommercialStatisticsData = (
                 service_select_statistics_by_sub_district_detail_category_new(
-                    item.city_name,
-                    item.district_name,
-                    item.sub_district_name,
-                    item.biz_detail_category_name,
-                    item.y_m,
+                    item["city_name"],
+                    item["district_name"],
+                    item["sub_district_name"],
+                    item["biz_detail_category_name"],
+                    item["y_m"],
                 )
             )
 
             # 결과와 통계 데이터를 결합
             combined_results.append(
-                CommercialStatisticsOutput(
-                    commercial_district_data=item,
-                    statistics_data=statistics_data,
-                )
+                {
+                    "commercial_district_data": item,
+                    "statistics_data": statistics_data,
+                }
             )
 
-        return combined_results
+        # 검증된 조회 결과이므로 response_model 재검증 없이 orjson 으로 직렬화
+        return FastJSONResponse(combined_results)
 
     except HTTPException as http_ex:
         raise http_ex
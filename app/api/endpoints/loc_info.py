@@ -1,4 +1,6 @@
+import asyncio
 from fastapi import APIRouter, HTTPException
+from app.core.responses import FastJSONResponse
 from app.service.loc_info import (
     get_init_stat_data,
     get_init_corr_data,
@@ -8,8 +10,10 @@ from app.service.loc_info import (
     select_stat_data_by_district,
     select_stat_data_by_sub_district,
     select_nation_j_score,
+    select_stat_data_columnar,
     select_loc_info_data_date as service_select_loc_info_data_date
 )
+from app.service.corr_cache import refresh_corr_cache
 from app.schemas.loc_info import *
 from fastapi import Request
 import logging
@@ -19,20 +23,24 @@ router = APIRouter()
 
 @router.post("/select/init/stat/corr")
 async def init_data():
-    init_stat_data = get_init_stat_data()
-    init_all_corr_matrix = get_init_corr_data()
+    init_stat_data, init_all_corr_matrix = await asyncio.gather(
+        get_init_stat_data(), get_init_corr_data()
+    )
 
     return {"init_all_corr" : init_all_corr_matrix, "init_stat_data":init_stat_data} 
 
+# loc_info 재적재 후 상관분석 캐시 초기화
+@router.post("/select/init/stat/corr/refresh")
+def refresh_corr_data():
+    refresh_corr_cache()
+    return {"success": True}
+
 @router.post("/select/list")
 async def filter_data(filters: FilterRequest):
     # 1. 기본 입지분성 값, 상관 분석 값 조회
     filters_dict = filters.dict(exclude_unset=True)
 
     if filters_dict.get('isLikeSearch') == False :
-        # 필터 데이터를 서비스 레이어로 전달
-        result, filter_corr_matrix = service_select_info_list(filters_dict)
-
         # 2. 필터에 따른 J-Score 조회
         city = filters_dict.get('city')
         district = filters_dict.get('district')
@@ -40,30 +48,41 @@ async def filter_data(filters: FilterRequest):
         
         # 2-1. 전국 범위 J-Score 조회
         if city is None:
-            stat_by_region = select_stat_data(filters_dict)
+            select_stat_by_region = select_stat_data
         # 2-2. 시/도 범위 J-Score 조회
         elif district is None:
-            stat_by_region = select_stat_data_by_city(filters_dict)
+            select_stat_by_region = select_stat_data_by_city
         # 2-3. 시/군/구 범위 J-Score 조회
         elif sub_district is None:
-            stat_by_region = select_stat_data_by_district(filters_dict)
+            select_stat_by_region = select_stat_data_by_district
         else:
-            stat_by_region = select_stat_data_by_sub_district(filters_dict)
-        
-        nation_j_score = select_nation_j_score(filters_dict)
+            select_stat_by_region = select_stat_data_by_sub_district
+
+        # 필터 데이터 / 지역 J-Score / 전국 J-Score 는 서로 독립적이므로 동시에 조회
+        (result, filter_corr_matrix), stat_by_region, nation_j_score = await asyncio.gather(
+            service_select_info_list(filters_dict),
+            select_stat_by_region(filters_dict),
+            select_nation_j_score(filters_dict),
+        )
 
         return {"filtered_data": result, "filter_corr" : filter_corr_matrix, "stat_by_region":stat_by_region, "nation_j_score":nation_j_score}
     
     else :
         # 필터 데이터를 서비스 레이어로 전달
-        result, base_data = service_select_info_list(filters_dict)
-
-        stat_by_region = select_stat_data(filters_dict)
-        
-        nation_j_score = select_nation_j_score(filters_dict)
+        (result, base_data), stat_by_region, nation_j_score = await asyncio.gather(
+            service_select_info_list(filters_dict),
+            select_stat_data(filters_dict),
+            select_nation_j_score(filters_dict),
+        )
 
         return {"filtered_data": result, "base_data":base_data, "stat_by_region":stat_by_region, "nation_j_score":nation_j_score}
 
+# 입지 통계 컬럼 형식 조회 (필드별 배열, keyset 페이지)
+@router.post("/select/stat/columnar", response_class=FastJSONResponse)
+async def select_stat_columnar(request: StatColumnarRequest):
+    result = await select_stat_data_columnar(request.dict(exclude_unset=True))
+    return FastJSONResponse(result)
+
 # 기준 날짜 조회
 @router.get("/data/date")
 def select_loc_info_data_date() -> List[LocInfoDataDate]:
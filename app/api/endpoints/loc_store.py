@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, File, HTTPException, UploadFile
 from app.service.loc_store import (
     filter_loc_store,
     select_loc_store_for_content_by_store_business_number as service_select_loc_store_for_content_by_store_business_number,
@@ -7,7 +7,12 @@ from app.service.loc_store import (
 from app.service.loc_store_to_report import (
     match_exist_store as service_match_exist_store,
     add_new_store as service_add_new_store,
+    add_new_stores_bulk as service_add_new_stores_bulk,
+    parse_store_upload as service_parse_store_upload,
+    BULK_STORE_MAX_ROWS,
     copy_new_store as service_copy_new_store,
+    start_report_regeneration as service_start_report_regeneration,
+    get_report_job as service_get_report_job,
     select_one_store as service_select_one_store
 )
 from app.schemas.loc_store import *
@@ -15,19 +20,30 @@ import logging
 import requests
 import os
 from fastapi.responses import JSONResponse
+from app.core.responses import FastJSONResponse, stream_json_list
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 # 필터로 조회
 @router.post("/select/store/list")
-def filter_data(filters: FilterRequest):
+async def filter_data(filters: FilterRequest):
     # 필터 정보를 서비스 레이어로 전달
-    data =  filter_loc_store(filters)
+    data = await filter_loc_store(filters)
 
-    return {
-        "filtered_data": data,     # 페이징된 데이터
-    }
+    if filters.pageSize:
+        return FastJSONResponse({
+            "filtered_data": data["rows"],
+            "next_cursor": data["next_cursor"],  # 마지막 페이지면 None
+            "total": data["total"],
+        })
+
+    if isinstance(data, list):
+        # 조회 결과 없음
+        return FastJSONResponse({"filtered_data": data})
+
+    # 전체 목록은 DB 에서 읽는 청크 단위로 orjson 직렬화해서 바로 전송
+    return stream_json_list("filtered_data", data)
 
 
 
@@ -103,6 +119,41 @@ def add_new_store(request: AddRequest):
         )
     
 
+# 매장 일괄 등록 (JSON)
+@router.post("/add/bulk")
+async def add_new_store_bulk(request: BulkAddRequest):
+    if len(request.stores) > BULK_STORE_MAX_ROWS:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {BULK_STORE_MAX_ROWS}개까지 등록할 수 있습니다.")
+
+    results = await service_add_new_stores_bulk(request.stores)
+    return FastJSONResponse({
+        "success_count": sum(1 for result in results if result["success"]),
+        "results": results,
+    })
+
+
+# 매장 일괄 등록 (CSV / XLSX 업로드)
+@router.post("/add/bulk/upload")
+async def add_new_store_bulk_upload(file: UploadFile = File(...)):
+    content = await file.read()
+    try:
+        rows = service_parse_store_upload(file.filename, content)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"store upload parse failed: {e}")
+        raise HTTPException(status_code=400, detail="파일을 읽을 수 없습니다.")
+
+    if len(rows) > BULK_STORE_MAX_ROWS:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {BULK_STORE_MAX_ROWS}개까지 등록할 수 있습니다.")
+
+    results = await service_add_new_stores_bulk(rows)
+    return FastJSONResponse({
+        "success_count": sum(1 for result in results if result["success"]),
+        "results": results,
+    })
+
+
 # 등록한 매장 Report DB 로 연동
 @router.post("/copy")
 def copy_new_store(request: ReportRequest):
@@ -114,6 +165,32 @@ def copy_new_store(request: ReportRequest):
     return [store_business_number]
 
 
+# 리포트 대량 재생성 (백그라운드 작업, job_id 로 진행 상황 조회 / 이어서 실행)
+@router.post("/copy/bulk")
+def copy_new_store_bulk(request: BulkReportRequest):
+    if not request.store_business_numbers and request.filters is None and not request.job_id:
+        raise HTTPException(status_code=400, detail="store_business_numbers 또는 filters 가 필요합니다.")
+
+    filters = request.filters.dict(exclude_unset=True) if request.filters else None
+    job_id = service_start_report_regeneration(
+        store_business_numbers=request.store_business_numbers,
+        filters=filters,
+        job_id=request.job_id,
+        workers=request.workers,
+        batch_size=request.batch_size,
+    )
+
+    return service_get_report_job(job_id)
+
+
+@router.get("/copy/bulk/{job_id}")
+def get_copy_new_store_bulk(job_id: str):
+    job = service_get_report_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return job
+
+
 
 # 매장 조회
 @router.post("/search")
@@ -3,12 +3,11 @@ from app.schemas.population import *
 from app.service.population import *
 from app.service.population import (
     filter_population_data,
-    download_data,
+    download_excel,
     select_population_data_date as service_select_population_data_date
 )
-import pandas as pd
-import io
 from fastapi.responses import StreamingResponse
+from app.core.responses import FastJSONResponse
 import logging
 
 logger = logging.getLogger(__name__)
@@ -27,7 +26,8 @@ async def select_population(filters: PopulationSearch):
         # 필터 데이터를 서비스 레이어로 전달하여 결과 가져옴
         result = await filter_population_data(filters_dict)
         # print(result)
-        return {"filtered_data": result}
+        # DB 조회 결과를 그대로 orjson 으로 직렬화
+        return FastJSONResponse({"filtered_data": result})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"검색 중 오류가 발생했습니다: {str(e)}")
     
@@ -51,9 +51,6 @@ async def download(filters: PopulationSearch):
     filters_dict = filters.dict(exclude_unset=True)
 
     try:
-        # 서비스 레이어를 통해 필터 데이터 기반의 결과 가져오기
-        result = await download_data(filters_dict)
-        
         # 기본적으로 가져올 컬럼들 (지역 및 성별)
         column_names = ['시/도 명', '시/군/구 명', '읍/면/동 명', '남성 총 인구', '여성 총 인구', '기준 날짜', '성별']
 
@@ -74,16 +71,8 @@ async def download(filters: PopulationSearch):
         # 나이 관련 컬럼을 최종 컬럼 이름 리스트에 추가
         column_names += age_columns
 
-        # 튜플 데이터를 DataFrame으로 변환 (컬럼 이름을 동적으로 설정)
-        df = pd.DataFrame(result, columns=column_names)
-
-        
-        # 메모리 내에서 엑셀 파일 생성
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-            df.to_excel(writer, index=False)
-        output.seek(0)  # 파일 포인터를 처음으로 이동
-        
+        # 서비스 레이어에서 조회 결과를 청크 단위로 받아 바로 엑셀 파일 생성
+        output = await download_excel(filters_dict, column_names)
         
         # 엑셀 파일을 클라이언트에 반환
         return StreamingResponse(
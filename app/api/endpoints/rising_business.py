@@ -2,6 +2,7 @@ from datetime import date
 import logging
 from fastapi import APIRouter, HTTPException, Query
 from typing import List, Optional
+from app.core.responses import FastJSONResponse
 from app.schemas.rising_business import RisingBusinessDataDate, RisingBusinessOutput
 from app.service.rising_business import (
     select_all_rising_business_by_dynamic_query as service_select_all_rising_business_by_dynamic_query,
@@ -42,7 +43,8 @@ def select_all_rising_business_by_dynamic_query(
             rank_max=rank_max,
             y_m=y_m
         )
-        return results
+        # 검증된 조회 결과이므로 response_model 재검증 없이 orjson 으로 직렬화
+        return FastJSONResponse(results)
     except HTTPException as http_ex:
         raise http_ex
     except Exception as e:
@@ -0,0 +1,130 @@
+import gzip
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # brotli 미설치 시 gzip 만 사용
+    brotli = None
+
+COMPRESSIBLE_CONTENT_TYPES = (
+    "application/json",
+    "application/javascript",
+    "image/svg+xml",
+    "text/",
+)
+
+
+def _accepted_encodings(accept_encoding):
+    accepted = set()
+    for token in accept_encoding.lower().split(","):
+        name, _, params = token.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip())
+    return accepted
+
+
+class CompressionMiddleware:
+    """
+    응답 압축 (brotli 우선, 없으면 gzip)
+    JSON / 텍스트 응답만 압축 - 한 번에 전송되는 응답은 minimum_size 이상일 때만,
+    스트리밍(more_body) 응답은 청크마다 이어서 압축한다. 이미 Content-Encoding 이 있으면 그대로 전달.
+    """
+
+    def __init__(self, app, minimum_size=1024, gzip_level=6, brotli_quality=4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accepted = _accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        if brotli is not None and "br" in accepted:
+            encoding = "br"
+        elif "gzip" in accepted:
+            encoding = "gzip"
+        else:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+        compressor = None
+
+        def set_encoding_headers():
+            start_message["headers"] = list(start_message["headers"])
+            headers = MutableHeaders(raw=start_message["headers"])
+            headers["Content-Encoding"] = encoding
+            headers.add_vary_header("Accept-Encoding")
+            return headers
+
+        async def send_with_compression(message):
+            nonlocal start_message, passthrough, compressor
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                if "content-encoding" in headers or not content_type.startswith(COMPRESSIBLE_CONTENT_TYPES):
+                    passthrough = True
+                    await send(message)
+                return
+
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is not None:
+                # 스트리밍 응답 이어서 압축
+                if encoding == "br":
+                    body = compressor.process(body) + (b"" if more_body else compressor.finish())
+                else:
+                    body = compressor.compress(body) + (b"" if more_body else compressor.flush())
+                if body or not more_body:
+                    await send({"type": "http.response.body", "body": body, "more_body": more_body})
+                return
+
+            if more_body:
+                # 스트리밍 응답 - 길이를 알 수 없으므로 Content-Length 제거
+                if encoding == "br":
+                    compressor = brotli.Compressor(quality=self.brotli_quality)
+                    body = compressor.process(body)
+                else:
+                    compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)  # 31 : gzip 헤더
+                    body = compressor.compress(body)
+                headers = set_encoding_headers()
+                if "content-length" in headers:
+                    del headers["Content-Length"]
+                await send(start_message)
+                if body:
+                    await send({"type": "http.response.body", "body": body, "more_body": True})
+                return
+
+            if len(body) < self.minimum_size:
+                # 작은 응답은 압축하지 않음
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            if encoding == "br":
+                body = brotli.compress(body, quality=self.brotli_quality)
+            else:
+                body = gzip.compress(body, compresslevel=self.gzip_level)
+
+            headers = set_encoding_headers()
+            headers["Content-Length"] = str(len(body))
+
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_with_compression)
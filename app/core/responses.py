@@ -0,0 +1,83 @@
+import decimal
+import typing
+
+import orjson
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+
+def _default(value):
+    """orjson 이 직접 처리하지 못하는 타입 변환 (DB 의 DECIMAL, Pydantic 모델 등)"""
+    if isinstance(value, decimal.Decimal):
+        if value.is_finite() and value == value.to_integral_value():
+            return int(value)
+        return float(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+_decimal_casts = {}  # 모델 -> {필드명: float / int}
+
+
+def _decimal_casts_for(model):
+    casts = _decimal_casts.get(model)
+    if casts is None:
+        casts = {}
+        for name, field in model.model_fields.items():
+            types = typing.get_args(field.annotation) or (field.annotation,)
+            if float in types:
+                casts[name] = float
+            elif int in types:
+                casts[name] = int
+        _decimal_casts[model] = casts
+    return casts
+
+
+def plain_row(model, **values):
+    """
+    검증 없이 model 응답 형식의 dict 생성 (DB 조회 결과 직렬화용)
+    DECIMAL 값은 모델의 필드 타입(float / int)에 맞춰 변환 - 모델 생성 / model_dump 비용 없음
+    """
+    casts = _decimal_casts_for(model)
+    for name, value in values.items():
+        if isinstance(value, decimal.Decimal) and name in casts:
+            values[name] = casts[name](value)
+    return values
+
+
+class FastJSONResponse(ORJSONResponse):
+    """
+    orjson 기반 응답 - date / datetime / numpy 는 orjson 이 직접, Decimal / 모델은 _default 로 변환
+    핸들러에서 이 응답을 직접 반환하면 FastAPI 의 jsonable_encoder / response_model 검증을 거치지 않는다
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
+
+
+async def _json_list_chunks(key, chunks):
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    yield b"{" + orjson.dumps(key) + b":["
+    first = True
+    async for rows in chunks:
+        if not rows:
+            continue
+        body = b",".join(orjson.dumps(row, default=_default, option=option) for row in rows)
+        yield body if first else b"," + body
+        first = False
+    yield b"]}"
+
+
+def stream_json_list(key, chunks):
+    """
+    {key: [...]} 응답을 행 청크(async iterable) 단위로 직렬화해서 바로 전송 - 전체 목록을 메모리에 모으지 않음
+    전송 도중 조회가 실패하면 응답이 잘린 채로 끝난다 (상태 코드는 이미 200 으로 전송됨)
+    """
+    return StreamingResponse(_json_list_chunks(key, chunks), media_type="application/json")
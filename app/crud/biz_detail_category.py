@@ -10,6 +10,11 @@ from app.db.connect import (
     commit,
     rollback,
 )
+from app.crud.dimension_cache import (
+    find_biz_detail_category_id,
+    find_biz_detail_category_name,
+    invalidate_dimensions,
+)
 from app.schemas.biz_detail_category import (
     BizDetailCategoryId,
     BizDetailCategoryOutput,
@@ -20,6 +25,10 @@ from app.schemas.category import CategoryListOutput
 def get_or_create_biz_detail_category_id(
     biz_sub_category_id: int, biz_detail_category_name: str
 ) -> int:
+    cached_id = find_biz_detail_category_id(biz_sub_category_id, biz_detail_category_name)
+    if cached_id is not None:
+        return cached_id
+
     connection = get_db_connection()
     cursor = connection.cursor()
     logger = logging.getLogger(__name__)
@@ -54,6 +63,7 @@ def get_or_create_biz_detail_category_id(
                 (biz_sub_category_id, biz_detail_category_name),
             )
             commit(connection)
+            invalidate_dimensions()
 
             return cursor.lastrowid
     except Exception as e:
@@ -67,6 +77,10 @@ def get_or_create_biz_detail_category_id(
 
 
 def get_detail_category_name_by_detial_category_id(detail_category_id: int) -> str:
+    cached_name = find_biz_detail_category_name(detail_category_id)
+    if cached_name is not None:
+        return cached_name
+
     connection = get_db_connection()
     cursor = connection.cursor()
 
@@ -11,9 +11,14 @@ from app.db.connect import (
     commit,
     rollback,
 )
+from app.crud.dimension_cache import find_biz_main_category_id, invalidate_dimensions
 
 
 def get_or_create_biz_main_category_id(biz_main_category_name: str) -> int:
+    cached_id = find_biz_main_category_id(biz_main_category_name)
+    if cached_id is not None:
+        return cached_id
+
     connection = get_db_connection()
     cursor = connection.cursor()
     # logger = logging.getLogger(__name__)
@@ -32,6 +37,7 @@ def get_or_create_biz_main_category_id(biz_main_category_name: str) -> int:
             )
             cursor.execute(insert_query, (biz_main_category_name))
             commit(connection)
+            invalidate_dimensions()
 
             return cursor.lastrowid
     except Exception as e:
@@ -13,11 +13,16 @@ from app.db.connect import (
     commit,
     rollback,
 )
+from app.crud.dimension_cache import find_biz_sub_category_id, invalidate_dimensions
 
 
 def get_or_create_biz_sub_category_id(
     biz_main_category_id: int, biz_sub_category_name: str
 ) -> int:
+    cached_id = find_biz_sub_category_id(biz_main_category_id, biz_sub_category_name)
+    if cached_id is not None:
+        return cached_id
+
     connection = get_db_connection()
     cursor = connection.cursor()
     logger = logging.getLogger(__name__)
@@ -48,6 +53,7 @@ def get_or_create_biz_sub_category_id(
 
             cursor.execute(insert_query, (biz_main_category_id, biz_sub_category_name))
             commit(connection)
+            invalidate_dimensions()
 
             return cursor.lastrowid
     except Exception as e:
@@ -11,9 +11,14 @@ from app.db.connect import (
     commit,
     rollback,
 )
+from app.crud.dimension_cache import find_city_id, find_city_name, invalidate_dimensions
 
 
 def get_or_create_city(city_data: City) -> City:
+    cached_id = find_city_id(city_data.city_name)
+    if cached_id is not None:
+        return City(city_id=cached_id, city_name=city_data.city_name)
+
     connection = get_db_connection()
     cursor = connection.cursor()
 
@@ -31,6 +36,7 @@ def get_or_create_city(city_data: City) -> City:
             insert_query = "INSERT INTO city (city_name) VALUES (%s)"
             cursor.execute(insert_query, (city_data.city_name,))
             connection.commit()
+            invalidate_dimensions()
 
             # 새로 삽입된 row의 ID를 포함한 City 스키마를 반환
             return City(city_id=cursor.lastrowid, city_name=city_data.city_name)
@@ -43,6 +49,10 @@ def get_or_create_city(city_data: City) -> City:
 
 
 def get_or_create_city_id(city_name: str) -> int:
+    cached_id = find_city_id(city_name)
+    if cached_id is not None:
+        return cached_id
+
     connection = get_db_connection()
     cursor = connection.cursor()
     logger = logging.getLogger(__name__)
@@ -60,6 +70,7 @@ def get_or_create_city_id(city_name: str) -> int:
             insert_query = "INSERT INTO city (city_name) VALUES (%s);"
             cursor.execute(insert_query, (city_name))
             commit()
+            invalidate_dimensions()
 
             return cursor.lastrowid
     except Exception as e:
@@ -71,6 +82,10 @@ def get_or_create_city_id(city_name: str) -> int:
 
 
 def get_city_id(city_name: str) -> int:
+    cached_id = find_city_id(city_name)
+    if cached_id is not None:
+        return cached_id
+
     connection = get_db_connection()
     cursor = connection.cursor()
 
@@ -92,6 +107,10 @@ def get_city_id(city_name: str) -> int:
 
 
 def get_city_name_by_city_id(city_id: int) -> str:
+    cached_name = find_city_name(city_id)
+    if cached_name is not None:
+        return cached_name
+
     connection = get_db_connection()
     cursor = connection.cursor()
 
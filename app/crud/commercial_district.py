@@ -8,6 +8,7 @@ from app.schemas.commercial_district import (
     CommercialDistrictOutput,
     CommercialStatisticsDataDate,
 )
+from app.core.responses import plain_row
 from app.db.connect import (
     get_db_connection,
     close_connection,
@@ -41,7 +42,7 @@ def select_commercial_district_by_dynamic_query(
     avg_profit_min: Optional[int] = None,
     avg_profit_max: Optional[int] = None,
     y_m: Optional[date] = None,
-) -> List[CommercialDistrictOutput]:
+) -> List[dict]:
     connection = get_db_connection()
     cursor = connection.cursor(pymysql.cursors.DictCursor)
     logger = logging.getLogger(__name__)
@@ -116,7 +117,8 @@ def select_commercial_district_by_dynamic_query(
             rows = cursor.fetchall()
 
             for row in rows:
-                commercial_district_output = CommercialDistrictOutput(
+                commercial_district_output = plain_row(
+                    CommercialDistrictOutput,
                     commercial_district_id=row.get("COMMERCIAL_DISTRICT_ID"),
                     city_name=row.get("CITY_NAME"),
                     district_name=row.get("DISTRICT_NAME"),
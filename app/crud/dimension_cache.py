@@ -0,0 +1,383 @@
+import json
+import logging
+import marshal
+import os
+import threading
+import time
+
+import pymysql
+from app.db.connect import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+# 지역 / 업종 기준 테이블 인메모리 캐시
+# 데이터 적재 시에만 바뀌는 테이블이라 TTL 동안 재사용하고,
+# get_or_create_* 로 새 값이 들어가면 invalidate_dimensions() 로 바로 버린다.
+DIMENSION_CACHE_TTL = float(os.getenv("DIMENSION_CACHE_TTL", "600"))
+
+# 워커 간 공유 - DIMENSION_CACHE_DIR 에 직렬화한 인덱스(dimensions.marshal)와 버전 스탬프(dimensions.stamp)를 두고
+# 워커는 스탬프 버전이 바뀐 경우에만 파일을 다시 읽는다. DB 에서 다시 읽는 건 워커 하나뿐이고
+# 워커가 재시작돼도 파일이 남아 있어 바로 사용할 수 있다.
+# 기본값("")은 프로세스별 캐시, 공유하려면 서버 전용 디렉터리의 절대 경로를 지정
+# 인덱스는 dict / tuple / int / str 만으로 되어 있어 marshal 로 저장 (pickle 과 달리 읽을 때 코드가 실행되지 않음)
+DIMENSION_CACHE_DIR = os.getenv("DIMENSION_CACHE_DIR", "")
+if DIMENSION_CACHE_DIR and not os.path.isabs(DIMENSION_CACHE_DIR):
+    logger.error(f"DIMENSION_CACHE_DIR must be an absolute path, shared dimension cache disabled: {DIMENSION_CACHE_DIR}")
+    DIMENSION_CACHE_DIR = ""
+# 스탬프 파일 확인 주기 (초)
+DIMENSION_STAMP_INTERVAL = float(os.getenv("DIMENSION_STAMP_INTERVAL", "1"))
+
+_dimensions = None
+_dimensions_loaded_at = 0.0
+_dimensions_checked_at = 0.0
+_dimensions_lock = threading.Lock()
+# invalidate 될 때마다 증가 - 기준 테이블로 만든 다른 캐시(지역 목록 응답 등)의 갱신 여부 판단용
+# 공유 모드에서는 스탬프 파일의 버전을 따른다
+_dimensions_version = 0
+
+
+class DimensionIndex:
+    """id <-> 이름 조회용 dict 모음"""
+
+    def __init__(self):
+        self.city_names = {}  # city_id -> city_name
+        self.city_ids = {}  # city_name -> city_id
+
+        self.districts = {}  # district_id -> (city_id, district_name)
+        self.district_ids = {}  # (city_id, district_name) -> district_id
+
+        self.sub_districts = {}  # sub_district_id -> (city_id, district_id, sub_district_name)
+        self.sub_district_ids = {}  # (city_id, district_id, sub_district_name) -> sub_district_id
+
+        self.biz_main_names = {}  # biz_main_category_id -> name
+        self.biz_main_ids = {}  # name -> biz_main_category_id
+        self.biz_subs = {}  # biz_sub_category_id -> (biz_main_category_id, name)
+        self.biz_sub_ids = {}  # (biz_main_category_id, name) -> biz_sub_category_id
+        self.biz_details = {}  # biz_detail_category_id -> (biz_sub_category_id, name)
+        self.biz_detail_ids = {}  # (biz_sub_category_id, name) -> biz_detail_category_id
+
+        # detail_category_code -> (business_area_category_id, main_name, sub_name, detail_name)
+        self.business_area_categories = {}
+        self.rep_ids = {}  # business_area_category_id -> rep_id (detail_category_mapping)
+        # 상권 소분류 코드(local_store.small_category_code) -> ((biz_main_id, biz_sub_id, biz_detail_id), ...)
+        # business_area_category -> detail_category_mapping -> biz_* 조인 결과 (매핑이 여러 개면 모두)
+        self.store_categories = {}
+
+
+def load_dimensions():
+    """기준 테이블 전체를 커넥션 1개로 읽어서 DimensionIndex 생성"""
+    connection = get_db_connection()
+    cursor = connection.cursor(pymysql.cursors.DictCursor)
+    index = DimensionIndex()
+
+    try:
+        cursor.execute("SELECT CITY_ID, CITY_NAME FROM CITY;")
+        for row in cursor.fetchall():
+            index.city_names[row["CITY_ID"]] = row["CITY_NAME"]
+            index.city_ids.setdefault(row["CITY_NAME"], row["CITY_ID"])
+
+        cursor.execute("SELECT DISTRICT_ID, CITY_ID, DISTRICT_NAME FROM DISTRICT;")
+        for row in cursor.fetchall():
+            index.districts[row["DISTRICT_ID"]] = (row["CITY_ID"], row["DISTRICT_NAME"])
+            index.district_ids.setdefault((row["CITY_ID"], row["DISTRICT_NAME"]), row["DISTRICT_ID"])
+
+        cursor.execute("SELECT SUB_DISTRICT_ID, CITY_ID, DISTRICT_ID, SUB_DISTRICT_NAME FROM SUB_DISTRICT;")
+        for row in cursor.fetchall():
+            key = (row["CITY_ID"], row["DISTRICT_ID"], row["SUB_DISTRICT_NAME"])
+            index.sub_districts[row["SUB_DISTRICT_ID"]] = key
+            index.sub_district_ids.setdefault(key, row["SUB_DISTRICT_ID"])
+
+        cursor.execute("SELECT BIZ_MAIN_CATEGORY_ID, BIZ_MAIN_CATEGORY_NAME FROM BIZ_MAIN_CATEGORY;")
+        for row in cursor.fetchall():
+            index.biz_main_names[row["BIZ_MAIN_CATEGORY_ID"]] = row["BIZ_MAIN_CATEGORY_NAME"]
+            index.biz_main_ids.setdefault(row["BIZ_MAIN_CATEGORY_NAME"], row["BIZ_MAIN_CATEGORY_ID"])
+
+        cursor.execute("SELECT BIZ_SUB_CATEGORY_ID, BIZ_MAIN_CATEGORY_ID, BIZ_SUB_CATEGORY_NAME FROM BIZ_SUB_CATEGORY;")
+        for row in cursor.fetchall():
+            key = (row["BIZ_MAIN_CATEGORY_ID"], row["BIZ_SUB_CATEGORY_NAME"])
+            index.biz_subs[row["BIZ_SUB_CATEGORY_ID"]] = key
+            index.biz_sub_ids.setdefault(key, row["BIZ_SUB_CATEGORY_ID"])
+
+        cursor.execute("SELECT BIZ_DETAIL_CATEGORY_ID, BIZ_SUB_CATEGORY_ID, BIZ_DETAIL_CATEGORY_NAME FROM BIZ_DETAIL_CATEGORY;")
+        for row in cursor.fetchall():
+            key = (row["BIZ_SUB_CATEGORY_ID"], row["BIZ_DETAIL_CATEGORY_NAME"])
+            index.biz_details[row["BIZ_DETAIL_CATEGORY_ID"]] = key
+            index.biz_detail_ids.setdefault(key, row["BIZ_DETAIL_CATEGORY_ID"])
+
+        cursor.execute("""
+            SELECT
+                BUSINESS_AREA_CATEGORY_ID, DETAIL_CATEGORY_CODE,
+                MAIN_CATEGORY_NAME, SUB_CATEGORY_NAME, DETAIL_CATEGORY_NAME
+            FROM BUSINESS_AREA_CATEGORY;
+        """)
+        for row in cursor.fetchall():
+            index.business_area_categories.setdefault(row["DETAIL_CATEGORY_CODE"], (
+                row["BUSINESS_AREA_CATEGORY_ID"],
+                row["MAIN_CATEGORY_NAME"],
+                row["SUB_CATEGORY_NAME"],
+                row["DETAIL_CATEGORY_NAME"],
+            ))
+
+        cursor.execute("SELECT BUSINESS_AREA_CATEGORY_ID, REP_ID FROM DETAIL_CATEGORY_MAPPING;")
+        for row in cursor.fetchall():
+            index.rep_ids.setdefault(row["BUSINESS_AREA_CATEGORY_ID"], row["REP_ID"])
+
+        cursor.execute("""
+            SELECT DISTINCT
+                BAC.DETAIL_CATEGORY_CODE, BSC.BIZ_MAIN_CATEGORY_ID, BSC.BIZ_SUB_CATEGORY_ID, BDC.BIZ_DETAIL_CATEGORY_ID
+            FROM BUSINESS_AREA_CATEGORY BAC
+            JOIN DETAIL_CATEGORY_MAPPING DCM ON BAC.BUSINESS_AREA_CATEGORY_ID = DCM.BUSINESS_AREA_CATEGORY_ID
+            JOIN BIZ_DETAIL_CATEGORY BDC ON DCM.REP_ID = BDC.BIZ_DETAIL_CATEGORY_ID
+            JOIN BIZ_SUB_CATEGORY BSC ON BDC.BIZ_SUB_CATEGORY_ID = BSC.BIZ_SUB_CATEGORY_ID
+            JOIN BIZ_MAIN_CATEGORY BMC ON BSC.BIZ_MAIN_CATEGORY_ID = BMC.BIZ_MAIN_CATEGORY_ID
+            ORDER BY BAC.DETAIL_CATEGORY_CODE, BDC.BIZ_DETAIL_CATEGORY_ID;
+        """)
+        store_categories = {}
+        for row in cursor.fetchall():
+            store_categories.setdefault(row["DETAIL_CATEGORY_CODE"], []).append((
+                row["BIZ_MAIN_CATEGORY_ID"], row["BIZ_SUB_CATEGORY_ID"], row["BIZ_DETAIL_CATEGORY_ID"],
+            ))
+        index.store_categories = {code: tuple(ids) for code, ids in store_categories.items()}
+
+        return index
+
+    finally:
+        if cursor:
+            cursor.close()
+        connection.close()
+
+
+def _shared_path(name):
+    return os.path.join(DIMENSION_CACHE_DIR, name)
+
+
+def _read_stamp():
+    """{"version": int, "built_at": epoch} - 없거나 읽을 수 없으면 None"""
+    try:
+        with open(_shared_path("dimensions.stamp"), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_stamp(version, built_at):
+    tmp_path = _shared_path(f"dimensions.stamp.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": version, "built_at": built_at}, f)
+    os.replace(tmp_path, _shared_path("dimensions.stamp"))
+
+
+def _read_shared_index(version):
+    """공유 파일의 인덱스 (스탬프와 버전이 다르면 None)"""
+    try:
+        with open(_shared_path("dimensions.marshal"), "rb") as f:
+            shared_version, data = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if shared_version != version:
+        return None
+    index = DimensionIndex()
+    index.__dict__.update(data)
+    return index
+
+
+def _write_shared_index(version, index):
+    tmp_path = _shared_path(f"dimensions.marshal.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        marshal.dump((version, index.__dict__), f)
+    os.replace(tmp_path, _shared_path("dimensions.marshal"))
+
+
+class _SharedLock:
+    """DB 재적재를 워커 하나만 하도록 잡는 파일 잠금 (fcntl 이 없는 환경에서는 잠금 없이 진행)"""
+
+    def __enter__(self):
+        self.file = open(_shared_path("dimensions.lock"), "a")
+        try:
+            import fcntl
+            fcntl.flock(self.file, fcntl.LOCK_EX)
+        except ImportError:
+            pass
+        return self
+
+    def __exit__(self, *exc):
+        self.file.close()  # 닫으면 잠금도 해제됨
+
+
+def _is_fresh(stamp):
+    return stamp is not None and time.time() - stamp["built_at"] < DIMENSION_CACHE_TTL
+
+
+def _get_shared_dimensions():
+    """스탬프 확인 -> 공유 파일 attach -> (만료 / 무효화 시) DB 재적재 후 공유 파일 갱신"""
+    global _dimensions, _dimensions_version
+
+    stamp = _read_stamp()
+    if _dimensions is not None and _is_fresh(stamp) and stamp["version"] == _dimensions_version:
+        return _dimensions
+
+    if _is_fresh(stamp):
+        index = _read_shared_index(stamp["version"])
+        if index is not None:
+            _dimensions, _dimensions_version = index, stamp["version"]
+            return _dimensions
+
+    os.makedirs(DIMENSION_CACHE_DIR, exist_ok=True)
+    with _SharedLock():
+        # 잠금을 기다리는 동안 다른 워커가 이미 다시 읽었을 수 있음
+        stamp = _read_stamp()
+        if _is_fresh(stamp):
+            index = _read_shared_index(stamp["version"])
+            if index is not None:
+                _dimensions, _dimensions_version = index, stamp["version"]
+                return _dimensions
+
+        index = load_dimensions()
+        version = (stamp["version"] if stamp else _dimensions_version) + 1
+        _write_shared_index(version, index)
+        _write_stamp(version, time.time())
+        _dimensions, _dimensions_version = index, version
+        return _dimensions
+
+
+def get_dimensions():
+    """
+    캐시된 DimensionIndex 반환 (TTL 이 지났으면 다시 읽음)
+    DB 오류로 읽지 못하면 None - 호출하는 쪽은 기존 쿼리로 조회
+    """
+    global _dimensions, _dimensions_loaded_at, _dimensions_checked_at
+
+    if DIMENSION_CACHE_DIR:
+        index = _dimensions
+        if index is not None and time.monotonic() - _dimensions_checked_at < DIMENSION_STAMP_INTERVAL:
+            return index
+
+        with _dimensions_lock:
+            try:
+                index = _get_shared_dimensions()
+            except Exception as e:
+                logger.error(f"dimension cache load failed: {e}")
+                return None
+            _dimensions_checked_at = time.monotonic()
+            return index
+
+    index = _dimensions
+    if index is not None and time.monotonic() - _dimensions_loaded_at < DIMENSION_CACHE_TTL:
+        return index
+
+    with _dimensions_lock:
+        if _dimensions is not None and time.monotonic() - _dimensions_loaded_at < DIMENSION_CACHE_TTL:
+            return _dimensions
+        try:
+            _dimensions = load_dimensions()
+            _dimensions_loaded_at = time.monotonic()
+        except Exception as e:
+            logger.error(f"dimension cache load failed: {e}")
+            return None
+        return _dimensions
+
+
+def invalidate_dimensions():
+    """기준 테이블에 INSERT 가 일어난 뒤 호출 - 다음 조회 시 다시 읽음 (공유 모드에서는 모든 워커)"""
+    global _dimensions, _dimensions_loaded_at, _dimensions_checked_at, _dimensions_version
+    with _dimensions_lock:
+        _dimensions = None
+        _dimensions_loaded_at = 0.0
+        _dimensions_checked_at = 0.0
+        _dimensions_version += 1
+
+        if DIMENSION_CACHE_DIR:
+            # built_at 0 = 만료 - 다음 조회 시 워커 하나가 DB 에서 다시 읽음
+            try:
+                os.makedirs(DIMENSION_CACHE_DIR, exist_ok=True)
+                stamp = _read_stamp()
+                _dimensions_version = max(_dimensions_version, (stamp["version"] if stamp else 0) + 1)
+                _write_stamp(_dimensions_version, 0)
+            except OSError as e:
+                logger.error(f"dimension cache stamp write failed: {e}")
+
+
+def get_dimensions_version():
+    if DIMENSION_CACHE_DIR:
+        # 다른 워커에서 invalidate 된 경우도 반영
+        stamp = _read_stamp()
+        if stamp is not None:
+            return stamp["version"]
+    return _dimensions_version
+
+
+# id <-> 이름 조회 (캐시에 없으면 None)
+def find_city_id(city_name):
+    index = get_dimensions()
+    return index.city_ids.get(city_name) if index else None
+
+
+def find_city_name(city_id):
+    index = get_dimensions()
+    return index.city_names.get(city_id) if index else None
+
+
+def find_district_id(city_id, district_name):
+    index = get_dimensions()
+    return index.district_ids.get((city_id, district_name)) if index else None
+
+
+def find_district_name(district_id):
+    index = get_dimensions()
+    district = index.districts.get(district_id) if index else None
+    return district[1] if district else None
+
+
+def find_sub_district_id(city_id, district_id, sub_district_name):
+    index = get_dimensions()
+    return index.sub_district_ids.get((city_id, district_id, sub_district_name)) if index else None
+
+
+def find_sub_district_name(sub_district_id):
+    index = get_dimensions()
+    sub_district = index.sub_districts.get(sub_district_id) if index else None
+    return sub_district[2] if sub_district else None
+
+
+def find_biz_main_category_id(biz_main_category_name):
+    index = get_dimensions()
+    return index.biz_main_ids.get(biz_main_category_name) if index else None
+
+
+def find_biz_sub_category_id(biz_main_category_id, biz_sub_category_name):
+    index = get_dimensions()
+    return index.biz_sub_ids.get((biz_main_category_id, biz_sub_category_name)) if index else None
+
+
+def find_biz_detail_category_id(biz_sub_category_id, biz_detail_category_name):
+    index = get_dimensions()
+    return index.biz_detail_ids.get((biz_sub_category_id, biz_detail_category_name)) if index else None
+
+
+def find_biz_detail_category_name(biz_detail_category_id):
+    index = get_dimensions()
+    detail = index.biz_details.get(biz_detail_category_id) if index else None
+    return detail[1] if detail else None
+
+
+def find_biz_categories(biz_detail_category_id):
+    """소분류 id -> (대분류 id, 중분류 id, 소분류명)"""
+    index = get_dimensions()
+    detail = index.biz_details.get(biz_detail_category_id) if index else None
+    if not detail:
+        return None
+    sub = index.biz_subs.get(detail[0])
+    if not sub:
+        return None
+    return (sub[0], detail[0], detail[1])
+
+
+def find_business_area_category(detail_category_code):
+    """상권 분류 코드 -> (business_area_category_id, 대분류명, 중분류명, 소분류명)"""
+    index = get_dimensions()
+    return index.business_area_categories.get(detail_category_code) if index else None
+
+
+def find_rep_id(business_area_category_id):
+    index = get_dimensions()
+    return index.rep_ids.get(business_area_category_id) if index else None
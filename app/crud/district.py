@@ -7,9 +7,18 @@ from app.db.connect import (
     commit,
     rollback,
 )
+from app.crud.dimension_cache import find_district_id, find_district_name, invalidate_dimensions
 
 
 def get_or_create_district(district_data: District) -> District:
+    cached_id = find_district_id(district_data.city_id, district_data.district_name)
+    if cached_id is not None:
+        return District(
+            district_id=cached_id,
+            district_name=district_data.district_name,
+            city_id=district_data.city_id,
+        )
+
     connection = get_db_connection()
     cursor = connection.cursor()
 
@@ -29,6 +38,7 @@ def get_or_create_district(district_data: District) -> District:
             )
             cursor.execute(insert_query, (district_data.district_name, district_data.city_id))
             commit(connection)  # 트랜잭션 커밋
+            invalidate_dimensions()
 
             # 새로 삽입된 row의 ID를 포함한 District 스키마를 반환
             return District(
@@ -45,6 +55,10 @@ def get_or_create_district(district_data: District) -> District:
 
 
 def get_or_create_district_id(city_id: int, district_name: str) -> int:
+    cached_id = find_district_id(city_id, district_name)
+    if cached_id is not None:
+        return cached_id
+
     connection = get_db_connection()
     cursor = connection.cursor()
     logger = logging.getLogger(__name__)
@@ -64,6 +78,7 @@ def get_or_create_district_id(city_id: int, district_name: str) -> int:
             )
             cursor.execute(insert_query, (district_name, city_id))
             commit(connection)
+            invalidate_dimensions()
 
             return cursor.lastrowid
     except Exception as e:
@@ -75,6 +90,10 @@ def get_or_create_district_id(city_id: int, district_name: str) -> int:
 
 
 def get_district_id(city_id: int, district_name: str) -> int:
+    cached_id = find_district_id(city_id, district_name)
+    if cached_id is not None:
+        return cached_id
+
     connection = get_db_connection()
     cursor = connection.cursor()
     logger = logging.getLogger(__name__)
@@ -99,6 +118,10 @@ def get_district_id(city_id: int, district_name: str) -> int:
 
 
 def get_district_name_by_district_id(district_id: int) -> str:
+    cached_name = find_district_name(district_id)
+    if cached_name is not None:
+        return cached_name
+
     connection = get_db_connection()
     cursor = connection.cursor()
 
@@ -0,0 +1,77 @@
+import logging
+import os
+import threading
+
+from app.db.connect import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+# 일련번호 발급 (ID_SEQUENCE 테이블의 시퀀스 행 기준)
+# 워커마다 ID_BLOCK_SIZE 개씩 번호 구간을 미리 예약해 두고 메모리 카운터로 하나씩 발급한다.
+# 예약은 UPDATE ... LAST_INSERT_ID(NEXT_VALUE + n) 한 문장이라 워커 / 서버가 여러 개여도 구간이 겹치지 않는다.
+# 워커가 재시작되면 남은 번호는 버려지므로 번호 사이에 빈 값이 생길 수 있다.
+# ID_SEQUENCE 테이블과 시퀀스 행은 app/dbscript/wiz_id_sequence.sql 로 미리 만들어 둔다.
+ID_BLOCK_SIZE = int(os.getenv("ID_BLOCK_SIZE", "20"))
+
+
+def reserve_block(name, size):
+    """시퀀스 name 에서 번호 size 개 예약 -> (시작, 끝) 반 열린 구간"""
+    connection = get_db_connection()
+    cursor = connection.cursor()
+    try:
+        cursor.execute("""
+            UPDATE ID_SEQUENCE
+            SET NEXT_VALUE = LAST_INSERT_ID(NEXT_VALUE + %s)
+            WHERE NAME = %s;
+        """, (size, name))
+        if not cursor.rowcount:
+            raise RuntimeError(f"id sequence not found: {name} (dbscript/wiz_id_sequence.sql)")
+
+        cursor.execute("SELECT LAST_INSERT_ID();")
+        end = cursor.fetchone()[0]
+        connection.commit()
+        return end - size, end
+
+    except Exception:
+        connection.rollback()
+        raise
+
+    finally:
+        if cursor:
+            cursor.close()
+        connection.close()
+
+
+class BlockAllocator:
+    """시퀀스 하나의 워커별 번호 구간 (구간을 다 쓰면 다음 구간 예약)"""
+
+    def __init__(self, name, block_size=ID_BLOCK_SIZE):
+        self.name = name
+        self.block_size = block_size
+        self.next_value = 0
+        self.end_value = 0
+        self.lock = threading.Lock()
+
+    def allocate(self):
+        with self.lock:
+            if self.next_value >= self.end_value:
+                self.next_value, self.end_value = reserve_block(self.name, self.block_size)
+            value = self.next_value
+            self.next_value += 1
+            return value
+
+
+_store_number_allocator = BlockAllocator("STORE_BUSINESS_NUMBER_JS")
+
+
+def next_store_business_number():
+    """새 매장 관리 번호 (JS0001 형식)"""
+    return f"JS{_store_number_allocator.allocate():04d}"
+
+
+def next_store_business_numbers(count):
+    """매장 관리 번호 count 개를 한 구간으로 예약 (일괄 등록용)"""
+    if count <= 0:
+        return []
+    start, end = reserve_block(_store_number_allocator.name, count)
+    return [f"JS{number:04d}" for number in range(start, end)]
@@ -1,8 +1,16 @@
+import asyncio
 import pymysql
 from app.db.connect import *
 from typing import Optional
 from app.schemas.loc_info import LocalInfoStatisticsResponse, StatisticsResult, LocInfoResult
 from app.db.connect import get_db_connection, close_connection, close_cursor
+from app.db.async_connect import get_async_db_connection, async_fetch_all, async_stream
+from app.crud.dimension_cache import get_dimensions
+from app.crud.loc_info_snapshot import (
+    LOC_INFO_VALUE_COLUMNS,
+    find_first_loc_info,
+    get_loc_info_snapshot,
+)
 from app.schemas.loc_info import (
     StatDataForExetend, StatDataByCityForExetend, StatDataByDistrictForExetend, StatDataForNation, StatDataForInit,LocInfoDataDate
 )
@@ -38,14 +46,12 @@ def select_local_info_statistics_by_sub_district_id(sub_district_id: int) -> Loc
     try:
         cursor = connection.cursor(pymysql.cursors.DictCursor)  # DictCursor 사용
        
-        # 첫 번째 쿼리: loc_info
-        loc_info_query = """
-            SELECT shop, move_pop, sales, work_pop, income, spend, house, resident 
-            FROM loc_info
-            WHERE sub_district_id = %s
-        """
-        cursor.execute(loc_info_query, (sub_district_id,))
-        loc_info_result = cursor.fetchone()  # 이 결과는 DictCursor로 인해 딕셔너리로 반환됨
+        # 첫 번째 조회: loc_info (스냅샷)
+        loc_info_row = find_first_loc_info(sub_district_id)
+        loc_info_result = {
+            key: loc_info_row[key]
+            for key in ("shop", "move_pop", "sales", "work_pop", "income", "spend", "house", "resident")
+        } if loc_info_row else None
 
         # 두 번째 쿼리: statistics
         statistics_query = """
@@ -70,14 +76,11 @@ def select_local_info_statistics_by_sub_district_id(sub_district_id: int) -> Loc
             connection.close()
 
 
-def get_all_corr(year):
+async def get_all_corr(year):
     """주어진 필터 조건을 바탕으로 데이터를 조회하는 함수"""
 
     # 여기서 직접 DB 연결을 설정
-    connection = get_db_connection()
-    cursor = None
-
-    try:
+    async with get_async_db_connection() as connection:
         query = """
             SELECT *
             FROM loc_info
@@ -88,27 +91,17 @@ def get_all_corr(year):
         """
         
 
-        cursor = connection.cursor(pymysql.cursors.DictCursor)
-        cursor.execute(query, (year,))
-        all_corr = cursor.fetchall()
+        all_corr = await async_fetch_all(query, (year,), connection)
 
         return all_corr
 
-    finally:
-        if cursor:
-            cursor.close()
-        connection.close()  # 연결 종료
-
 
 
-def get_filter_corr(filters, year):
+async def get_filter_corr(filters, year):
     """주어진 필터 조건을 바탕으로 데이터를 조회하는 함수"""
 
     # 여기서 직접 DB 연결을 설정
-    connection = get_db_connection()
-    cursor = None
-
-    try:
+    async with get_async_db_connection() as connection:
         query = """
             SELECT *
             FROM loc_info
@@ -124,25 +117,35 @@ def get_filter_corr(filters, year):
             query += " AND loc_info.city_id = %s"
             query_params.append(filters["city"])
 
-        cursor = connection.cursor(pymysql.cursors.DictCursor)
-        cursor.execute(query, query_params)
-        filter_corr = cursor.fetchall()
+        filter_corr = await async_fetch_all(query, query_params, connection)
 
         return filter_corr
 
-    finally:
-        if cursor:
-            cursor.close()
-        connection.close()  # 연결 종료
+
+async def get_corr_source_data(ref_date):
+    """상관분석 캐시 생성용 - 기준 날짜의 전체 loc_info 지표 (loc_info 스냅샷, 컬럼별 배열)"""
+    snapshot = await asyncio.to_thread(get_loc_info_snapshot, ref_date)
+    if snapshot is None:
+        return {"CITY_ID": [], "DISTRICT_NAME": []}
+
+    district_ids = snapshot.column("district_id").astype(int).tolist()
+    index = await asyncio.to_thread(get_dimensions)
+    districts = index.districts if index else {}
+
+    data = {
+        "CITY_ID": snapshot.column("city_id").astype(int),
+        "DISTRICT_NAME": [districts[district_id][1] if district_id in districts else None for district_id in district_ids],
+    }
+    for name in LOC_INFO_VALUE_COLUMNS:
+        data[name.upper()] = snapshot.column(name)
+    return data
 
 
 
 ################################################        
-def select_info_list(filters):
+async def select_info_list(filters):
 
-    connection = get_db_connection()
-    cursor = None
-    try:
+    async with get_async_db_connection() as connection:
         # 지역 관련 필터 조건 생성
         query_params_loc_info = []
         query_params_statistics = []
@@ -224,9 +227,7 @@ def select_info_list(filters):
                 query_params_loc_info.append(filters[filter_key])
 
         # Execute the loc_info query
-        cursor = connection.cursor(pymysql.cursors.DictCursor)
-        cursor.execute(query_1, query_params_loc_info)
-        loc_info_results = cursor.fetchall()
+        loc_info_results = await async_fetch_all(query_1, query_params_loc_info, connection)
 
         # loc_info_statistics 쿼리 (지역 및 날짜 필터 조건만 적용)
         query_2 = f"""
@@ -262,51 +263,39 @@ def select_info_list(filters):
                 query_params_statistics.append(filters[filter_key])
 
 
-        cursor.execute(query_2, query_params_statistics)
-        statistics_results = cursor.fetchall()
+        statistics_results = await async_fetch_all(query_2, query_params_statistics, connection)
 
         # 기준을 레코드 수가 적은 쪽으로 설정
+        # 같은 지역이라도 다른 달 데이터끼리 붙지 않도록 날짜까지 키로 사용 (loc_info.y_m = loc_info_statistics.ref_date)
         if len(loc_info_results) <= len(statistics_results):
-            primary_results = loc_info_results
-            secondary_results = statistics_results
-            match_keys = ["city_id", "district_id", "sub_district_id"]
+            primary_results, primary_date_key = loc_info_results, "y_m"
+            secondary_results, secondary_date_key = statistics_results, "ref_date"
         else:
-            primary_results = statistics_results
-            secondary_results = loc_info_results
-            match_keys = ["city_id", "district_id", "sub_district_id"]
+            primary_results, primary_date_key = statistics_results, "ref_date"
+            secondary_results, secondary_date_key = loc_info_results, "y_m"
+
+        match_keys = ["city_id", "district_id", "sub_district_id"]
 
-        # 병합 수행
+        # secondary 결과를 키로 색인 (같은 키가 여러 개면 첫 번째 행 사용)
+        secondary_index = {}
+        for secondary in secondary_results:
+            key = (*(secondary[k] for k in match_keys), secondary[secondary_date_key])
+            secondary_index.setdefault(key, secondary)
+
+        # 병합: matching되는 secondary가 있는 경우 합치고, 없으면 primary만 추가
         merged_results = []
         for primary in primary_results:
-            # primary 결과에 대해 matching되는 secondary 결과 찾기
-            matching_secondary = next(
-                (secondary for secondary in secondary_results
-                if all(primary[key] == secondary[key] for key in match_keys)),
-                None
-            )
+            key = (*(primary[k] for k in match_keys), primary[primary_date_key])
+            matching_secondary = secondary_index.get(key)
+            merged_results.append({**primary, **matching_secondary} if matching_secondary else primary)
 
-            # 병합: matching되는 secondary가 있는 경우 합치고, 없으면 primary만 추가
-            if matching_secondary:
-                merged_record = {**primary, **matching_secondary}
-            else:
-                merged_record = primary
-
-            merged_results.append(merged_record)
-        # print(merged_results)
         return merged_results
 
-    finally:
-        if cursor:
-            cursor.close()
-        connection.close()
-
 
 
-def select_info_list_similar(filters):
+async def select_info_list_similar(filters):
 
-    connection = get_db_connection()
-    cursor = None
-    try:
+    async with get_async_db_connection() as connection:
         # 지역 관련 필터 조건 생성
         query_params_loc_info = []
         query_params_statistics = []
@@ -367,9 +356,7 @@ def select_info_list_similar(filters):
         """
 
         # Execute the loc_info query
-        cursor = connection.cursor(pymysql.cursors.DictCursor)
-        cursor.execute(query_similar, query_params_similar)
-        loc_info_similar = cursor.fetchall()
+        loc_info_similar = await async_fetch_all(query_similar, query_params_similar, connection)
         # print(loc_info_similar)
 
         # 20% 조정
@@ -380,7 +367,8 @@ def select_info_list_similar(filters):
         else:
             raise ValueError("j_score_non_outliers 값이 loc_info_similar에 없습니다.")
 
-        # loc_info_statistics 쿼리 (지역 및 날짜 필터 조건만 적용)
+        # j_score 범위에 드는 loc_info_statistics 와 같은 지역의 loc_info 를 한 번에 조인
+        # (지역 하나당 loc_info 를 따로 조회하지 않음, 기존처럼 통계 행 단위로 묶이도록 정렬)
         query_2 = f"""
             SELECT
                 city.city_name AS city_name, 
@@ -394,77 +382,38 @@ def select_info_list_similar(filters):
                 loc_info_statistics.j_score,
                 loc_info_statistics.j_score_per_non_outliers,
                 loc_info_statistics.j_score_non_outliers,
-                loc_info_statistics.ref_date
+                loc_info_statistics.ref_date,
+                loc_info.loc_info_id,
+                loc_info.shop, loc_info.move_pop, loc_info.sales, loc_info.work_pop, 
+                loc_info.income, loc_info.spend, loc_info.house, loc_info.resident,
+                loc_info.y_m
             FROM loc_info_statistics
-            LEFT JOIN city ON loc_info_statistics.city_id = city.city_id
-            LEFT JOIN district ON loc_info_statistics.district_id = district.district_id
-            LEFT JOIN sub_district ON loc_info_statistics.sub_district_id = sub_district.sub_district_id
+            JOIN loc_info 
+                ON loc_info.city_id = loc_info_statistics.city_id
+                AND loc_info.district_id = loc_info_statistics.district_id
+                AND loc_info.sub_district_id = loc_info_statistics.sub_district_id
+                {date_conditions_loc_info}
+            LEFT JOIN city ON loc_info.city_id = city.city_id
+            LEFT JOIN district ON loc_info.district_id = district.district_id
+            LEFT JOIN sub_district ON loc_info.sub_district_id = sub_district.sub_district_id
             WHERE loc_info_statistics.target_item = 'j_score_avg' 
             {date_conditions_statistics}
             AND loc_info_statistics.j_score_non_outliers BETWEEN %s AND %s
+            ORDER BY loc_info_statistics.ref_date, loc_info_statistics.sub_district_id, loc_info.y_m
         """
-        
-        query_params_statistics.extend([min_j_score, max_j_score])
-        cursor.execute(query_2, query_params_statistics)
-        statistics_results = cursor.fetchall()
-        # print(statistics_results)
-
-        # statistics_results에서 3개씩 지역 ID 추출
-        combined_results = []  # 최종 결과 리스트
-
-        for stat in statistics_results:
-            city_id = stat["city_id"]
-            district_id = stat["district_id"]
-            sub_district_id = stat["sub_district_id"]
-
-            # loc_info 쿼리 (지역 필터 및 나머지 필터 조건)
-            query_1 = f"""
-                SELECT 
-                    city.city_name AS city_name, 
-                    district.district_name AS district_name, 
-                    sub_district.sub_district_name AS sub_district_name,
-                    city.city_id AS city_id, 
-                    district.district_id AS district_id, 
-                    sub_district.sub_district_id AS sub_district_id,
-                    loc_info.loc_info_id,
-                    loc_info.shop, loc_info.move_pop, loc_info.sales, loc_info.work_pop, 
-                    loc_info.income, loc_info.spend, loc_info.house, loc_info.resident,
-                    loc_info.y_m
-                FROM loc_info
-                LEFT JOIN city ON loc_info.city_id = city.city_id
-                LEFT JOIN district ON loc_info.district_id = district.district_id
-                LEFT JOIN sub_district ON loc_info.sub_district_id = sub_district.sub_district_id
-                WHERE loc_info.city_id = %s AND loc_info.district_id = %s AND loc_info.sub_district_id = %s
-                {date_conditions_loc_info}
-            """
-
-            # 지역별 쿼리 파라미터 준비
-            query_params = [city_id, district_id, sub_district_id]
-
-            # 날짜 조건 파라미터 추가
-            if filters.get("selectedOptions"):
-                query_params.extend(filters["selectedOptions"])
 
-
-            # 지역별 쿼리 실행
-            cursor.execute(query_1, query_params)
-            loc_info_result = cursor.fetchall()
-            
-            # 결과를 합치기
-            for loc_info in loc_info_result:
-                combined_data = {**stat, **loc_info}  # 두 딕셔너리를 병합
-                combined_results.append(combined_data)
-
-        print(combined_results)
-        
+        query_params = [*query_params_loc_info, *query_params_statistics, min_j_score, max_j_score]
+        combined_results = await async_fetch_all(query_2, query_params, connection)
 
         return combined_results, loc_info_similar
 
-    finally:
-        if cursor:
-            cursor.close()
-        connection.close()
 
+async def select_loc_info_features(ref_date):
+    """유사 지역(kNN) 계산용 - 기준 날짜의 전체 읍/면/동 입지 지표 (loc_info 스냅샷)"""
+    snapshot = await asyncio.to_thread(get_loc_info_snapshot, ref_date)
+    if snapshot is None:
+        return []
+    return await asyncio.to_thread(snapshot.rows, None, True)
 
 
 
@@ -506,16 +455,12 @@ def get_all_region_id():
 
 
 
-
 ################  값 조회 ######################
 # 초기 데이터 : 통계값
-def select_stat_data_avg()-> StatDataForInit:
+async def select_stat_data_avg()-> StatDataForInit:
     results = []
     # 여기서 직접 DB 연결을 설정
-    connection = get_db_connection()
-    cursor = None
-
-    try:
+    async with get_async_db_connection() as connection:
         query = """
             SELECT 
                 city.city_id AS CITY_ID, 
@@ -538,9 +483,7 @@ def select_stat_data_avg()-> StatDataForInit:
         """
         query_params = []
 
-        cursor = connection.cursor(pymysql.cursors.DictCursor)
-        cursor.execute(query, query_params)
-        rows = cursor.fetchall()
+        rows = await async_fetch_all(query, query_params, connection)
         # print(rows)
         for row in rows:
             loc_info_by_region = StatDataForInit(
@@ -562,23 +505,14 @@ def select_stat_data_avg()-> StatDataForInit:
 
         return results
 
-    finally:
-        if cursor:
-            cursor.close()
-        connection.close()  # 연결 종료
-
 
 
 # 전국에서 동 끼리 비교 J-Score 값 조회
-def get_stat_data(filters_dict)-> StatDataForExetend:
+async def get_stat_data(filters_dict)-> StatDataForExetend:
 
     results = []
     # 여기서 직접 DB 연결을 설정
-    connection = get_db_connection()
-    cursor = None
-
-
-    try:
+    async with get_async_db_connection() as connection:
         query = """
             SELECT 
                    city.city_id AS CITY_ID, 
@@ -610,61 +544,56 @@ def get_stat_data(filters_dict)-> StatDataForExetend:
                 query += f" AND ({date_conditions})"
                 query_params.extend(selected_options)
 
-        cursor = connection.cursor(pymysql.cursors.DictCursor)
-        cursor.execute(query, query_params)
-        rows = cursor.fetchall()
-
-        for row in rows:
-            loc_info_by_region = StatDataForExetend(
-                city_id= row.get("CITY_ID"),
-                city_name= row.get("CITY_NAME"),
-                district_id=row.get("DISTRICT_ID"),
-                district_name=row.get("DISTRICT_NAME"),
-                sub_district_id=row.get("SUB_DISTRICT_ID"),
-                sub_district_name=row.get("SUB_DISTRICT_NAME"),
-                target_item=row.get("TARGET_ITEM"),
-                ref_date=row.get("REF_DATE"),
-                avg_val=row.get("AVG_VAL"),
-                med_val= row.get("MED_VAL"),
-                std_val= row.get("STD_VAL"),
-                max_val= row.get("MAX_VAL"),
-                min_val= row.get("MIN_VAL"),
-                j_score= row.get("J_SCORE"),
-                j_score_rank = row.get("J_SCORE_RANK"),
-                j_score_per = row.get("J_SCORE_PER"),
-                j_score_non_outliers= row.get("J_SCORE_NON_OUTLIERS"),
-                j_score_per_non_outliers = row.get("J_SCORE_PER_NON_OUTLIERS")
-            )
-            results.append(loc_info_by_region)
+        # 전국 단위 조회라 서버 측 커서로 청크 단위로 읽으면서 변환
+        # 드라이버 버퍼는 줄지만 결과는 다른 조회 결과와 묶어 한 응답으로 보내므로 목록 전체(O(N))는 메모리에 남는다
+        async for rows in async_stream(query, query_params, connection):
+            for row in rows:
+                loc_info_by_region = StatDataForExetend(
+                    city_id= row.get("CITY_ID"),
+                    city_name= row.get("CITY_NAME"),
+                    district_id=row.get("DISTRICT_ID"),
+                    district_name=row.get("DISTRICT_NAME"),
+                    sub_district_id=row.get("SUB_DISTRICT_ID"),
+                    sub_district_name=row.get("SUB_DISTRICT_NAME"),
+                    target_item=row.get("TARGET_ITEM"),
+                    ref_date=row.get("REF_DATE"),
+                    avg_val=row.get("AVG_VAL"),
+                    med_val= row.get("MED_VAL"),
+                    std_val= row.get("STD_VAL"),
+                    max_val= row.get("MAX_VAL"),
+                    min_val= row.get("MIN_VAL"),
+                    j_score= row.get("J_SCORE"),
+                    j_score_rank = row.get("J_SCORE_RANK"),
+                    j_score_per = row.get("J_SCORE_PER"),
+                    j_score_non_outliers= row.get("J_SCORE_NON_OUTLIERS"),
+                    j_score_per_non_outliers = row.get("J_SCORE_PER_NON_OUTLIERS")
+                )
+                results.append(loc_info_by_region)
         
         return results
 
-    finally:
-        if cursor:
-            cursor.close()
-        connection.close()  # 연결 종료
 
 
 # 시/도 내의 동 끼리 비교 J-Score 값 조회
-def get_stat_data_by_city(filters_dict: dict) -> StatDataByCityForExetend:
+async def get_stat_data_by_city(filters_dict: dict) -> StatDataByCityForExetend:
     results = []
-    connection = get_db_connection()
-    cursor = None
 
-    try:
-        # 첫 번째 쿼리: loc_info_statistics 조회
+    async with get_async_db_connection() as connection:
+        # loc_info_statistics 조회
         query1 = """
             SELECT 
                    city.city_id AS CITY_ID, 
                    city.city_name AS CITY_NAME, 
                    sub_district.sub_district_id AS SUB_DISTRICT_ID,
                    sub_district.sub_district_name AS SUB_DISTRICT_NAME,
+                   IFNULL(district.district_name, '데이터 없음') AS DISTRICT_NAME,
                    TARGET_ITEM, REF_DATE,
                    AVG_VAL, MED_VAL, STD_VAL, MAX_VAL, MIN_VAL, J_SCORE_PER, J_SCORE_RANK, J_SCORE,
                    J_SCORE_PER_NON_OUTLIERS, J_SCORE_NON_OUTLIERS
             FROM loc_info_statistics li
             JOIN city ON li.city_id = city.city_id
             JOIN sub_district ON li.sub_district_id = sub_district.sub_district_id
+            LEFT JOIN district ON sub_district.district_id = district.district_id
             WHERE li.city_id IS NOT NULL 
               AND li.district_id IS NULL 
               AND li.sub_district_id IS NOT NULL
@@ -687,37 +616,16 @@ def get_stat_data_by_city(filters_dict: dict) -> StatDataByCityForExetend:
                 query1 += f" AND ({date_conditions})"
                 query_params.extend(selected_options)
 
-        cursor = connection.cursor(pymysql.cursors.DictCursor)
-        cursor.execute(query1, query_params)
-        stat_rows = cursor.fetchall()
-
-        # 두 번째 쿼리: district_name 조회
-        query2 = """
-            SELECT 
-                   district.district_name AS DISTRICT_NAME,
-                   sd.sub_district_id AS SUB_DISTRICT_ID
-            FROM sub_district sd
-            JOIN city ON sd.city_id = city.city_id
-            JOIN district ON sd.district_id = district.district_id
-            WHERE city.city_id = %s
-        """
-        cursor.execute(query2, (filters_dict["city"],))
-        district_rows = cursor.fetchall()
-
-        # sub_district_id를 기준으로 district_name을 매칭하여 결과 합치기
-        district_map = {row["SUB_DISTRICT_ID"]: row["DISTRICT_NAME"] for row in district_rows}
-        
+        # 시/군/구 이름은 sub_district 를 통해 같은 쿼리에서 조인
+        stat_rows = await async_fetch_all(query1, query_params, connection)
 
         for row in stat_rows:
-            sub_district_id = row.get("SUB_DISTRICT_ID")
-            district_name = district_map.get(sub_district_id, "데이터 없음")
-
             loc_info_by_region = StatDataByCityForExetend(
                 city_id= row.get("CITY_ID"),
                 city_name= row.get("CITY_NAME"),
-                sub_district_id=sub_district_id,
+                sub_district_id=row.get("SUB_DISTRICT_ID"),
                 sub_district_name=row.get("SUB_DISTRICT_NAME"),
-                district_name=district_name,  # 추가된 district_name
+                district_name=row.get("DISTRICT_NAME"),
                 target_item=row.get("TARGET_ITEM"),
                 ref_date=row.get("REF_DATE"),
                 avg_val=row.get("AVG_VAL"),
@@ -736,34 +644,30 @@ def get_stat_data_by_city(filters_dict: dict) -> StatDataByCityForExetend:
         
         return results
 
-    finally:
-        if cursor:
-            cursor.close()
-        connection.close()  # 연결 종료
 
 
     
 
 # 시/군/구 내의 동 끼리 비교 J-Score 값 조회
-def get_stat_data_by_distirct(filters_dict: dict) -> StatDataByDistrictForExetend:
+async def get_stat_data_by_distirct(filters_dict: dict) -> StatDataByDistrictForExetend:
     results = []
-    connection = get_db_connection()
-    cursor = None
 
-    try:
-        # 첫 번째 쿼리: loc_info_statistics 조회
+    async with get_async_db_connection() as connection:
+        # loc_info_statistics 조회
         query1 = """
             SELECT 
                    district.district_id AS DISTRICT_ID, 
                    district.district_name AS DISTRICT_NAME, 
                    sub_district.sub_district_id AS SUB_DISTRICT_ID,
                    sub_district.sub_district_name AS SUB_DISTRICT_NAME,
+                   IFNULL(city.city_name, '데이터 없음') AS CITY_NAME,
                    TARGET_ITEM, REF_DATE,
                    AVG_VAL, MED_VAL, STD_VAL, MAX_VAL, MIN_VAL, J_SCORE_PER, J_SCORE_RANK, J_SCORE,
                    J_SCORE_PER_NON_OUTLIERS, J_SCORE_NON_OUTLIERS
             FROM loc_info_statistics li
             JOIN district ON li.district_id = district.district_id
             JOIN sub_district ON li.sub_district_id = sub_district.sub_district_id
+            LEFT JOIN city ON sub_district.city_id = city.city_id
             WHERE li.city_id IS NULL 
               AND li.district_id IS NOT NULL 
               AND li.sub_district_id IS NOT NULL
@@ -786,36 +690,16 @@ def get_stat_data_by_distirct(filters_dict: dict) -> StatDataByDistrictForExeten
                 query1 += f" AND ({date_conditions})"
                 query_params.extend(selected_options)
 
-        cursor = connection.cursor(pymysql.cursors.DictCursor)
-        cursor.execute(query1, query_params)
-        stat_rows = cursor.fetchall()
-
+        # 시/도 이름은 sub_district 를 통해 같은 쿼리에서 조인
+        stat_rows = await async_fetch_all(query1, query_params, connection)
 
-        # 두 번째 쿼리: district_name 조회
-        query2 = """
-            SELECT 
-                   city.city_name AS CITY_NAME,
-                   sd.sub_district_id AS SUB_DISTRICT_ID
-            FROM sub_district sd
-            JOIN city ON sd.city_id = city.city_id
-            JOIN district ON sd.district_id = district.district_id
-            WHERE district.district_id = %s
-        """
-        cursor.execute(query2, (filters_dict["district"],))
-        city_rows = cursor.fetchall()
-        # sub_district_id를 기준으로 district_name을 매칭하여 결과 합치기
-        city_map = {row["SUB_DISTRICT_ID"]: row["CITY_NAME"] for row in city_rows}
-        
         for row in stat_rows:
-            sub_district_id = row.get("SUB_DISTRICT_ID")
-            city_name = city_map.get(sub_district_id, "데이터 없음")
-
             loc_info_by_region = StatDataByDistrictForExetend(
                 district_id= row.get("DISTRICT_ID"),
                 district_name= row.get("DISTRICT_NAME"),
-                sub_district_id=sub_district_id,
+                sub_district_id=row.get("SUB_DISTRICT_ID"),
                 sub_district_name=row.get("SUB_DISTRICT_NAME"),
-                city_name=city_name,  
+                city_name=row.get("CITY_NAME"),
                 target_item=row.get("TARGET_ITEM"),
                 ref_date=row.get("REF_DATE"),
                 avg_val=row.get("AVG_VAL"),
@@ -834,20 +718,13 @@ def get_stat_data_by_distirct(filters_dict: dict) -> StatDataByDistrictForExeten
 
         return results
 
-    finally:
-        if cursor:
-            cursor.close()
-        connection.close()  # 연결 종료
 
 
 # 동 하나 J-Score 값 조회
-def get_stat_data_by_sub_distirct(filters_dict: dict) -> StatDataForExetend:
+async def get_stat_data_by_sub_distirct(filters_dict: dict) -> StatDataForExetend:
     results = []
     # 여기서 직접 DB 연결을 설정
-    connection = get_db_connection()
-    cursor = None
-
-    try:
+    async with get_async_db_connection() as connection:
         query = """
             SELECT 
                    city.city_id AS CITY_ID, 
@@ -892,9 +769,7 @@ def get_stat_data_by_sub_distirct(filters_dict: dict) -> StatDataForExetend:
                 query += f" AND ({date_conditions})"
                 query_params.extend(selected_options)
 
-        cursor = connection.cursor(pymysql.cursors.DictCursor)
-        cursor.execute(query, query_params)
-        rows = cursor.fetchall()
+        rows = await async_fetch_all(query, query_params, connection)
 
         for row in rows:
             loc_info_by_region = StatDataForExetend(
@@ -921,24 +796,118 @@ def get_stat_data_by_sub_distirct(filters_dict: dict) -> StatDataForExetend:
 
         return results
 
-    finally:
-        if cursor:
-            cursor.close()
-        connection.close()  # 연결 종료
+
+
+# loc_info_statistics 컬럼 형식 조회 (필드별 배열 + keyset 페이지)
+# 응답 필드명 -> SELECT 식, 지역명은 sub_district 기준으로 조인
+STAT_COLUMNAR_FIELDS = {
+    "city_id": "sub_district.city_id",
+    "city_name": "city.city_name",
+    "district_id": "sub_district.district_id",
+    "district_name": "district.district_name",
+    "sub_district_id": "li.sub_district_id",
+    "sub_district_name": "sub_district.sub_district_name",
+    "target_item": "li.target_item",
+    "ref_date": "li.ref_date",
+    "avg_val": "li.avg_val",
+    "med_val": "li.med_val",
+    "std_val": "li.std_val",
+    "max_val": "li.max_val",
+    "min_val": "li.min_val",
+    "j_score_per": "li.j_score_per",
+    "j_score_rank": "li.j_score_rank",
+    "j_score": "li.j_score",
+    "j_score_per_non_outliers": "li.j_score_per_non_outliers",
+    "j_score_non_outliers": "li.j_score_non_outliers",
+}
+STAT_COLUMNAR_KEYS = ("ref_date", "sub_district_id", "target_item")
+
+# 비교 범위별 통계 행 조건 (기존 get_stat_data* 와 동일)
+STAT_COLUMNAR_SCOPES = {
+    "nation": "li.city_id IS NOT NULL AND li.district_id IS NOT NULL AND li.sub_district_id IS NOT NULL",
+    "city": "li.city_id IS NOT NULL AND li.district_id IS NULL AND li.sub_district_id IS NOT NULL",
+    "district": "li.city_id IS NULL AND li.district_id IS NOT NULL AND li.sub_district_id IS NOT NULL",
+    "sub_district": "li.city_id IS NOT NULL AND li.district_id IS NOT NULL AND li.sub_district_id IS NOT NULL",
+}
+
+
+async def get_stat_data_columnar(filters_dict: dict, scope: str, fields=None, cursor=None, limit=5000):
+    """
+    loc_info_statistics 를 (ref_date, sub_district_id, target_item) 순서로 limit 건씩 조회해서
+    필드별 배열로 반환 - {"fields": [...], "columns": {field: [...]}, "next_cursor": [...] | None}
+    """
+    fields = [field for field in (fields or STAT_COLUMNAR_FIELDS) if field in STAT_COLUMNAR_FIELDS]
+    select_fields = list(dict.fromkeys([*fields, *STAT_COLUMNAR_KEYS]))
+
+    query = f"""
+        SELECT {", ".join(f"{STAT_COLUMNAR_FIELDS[field]} AS {field}" for field in select_fields)}
+        FROM loc_info_statistics li
+        JOIN sub_district ON li.sub_district_id = sub_district.sub_district_id
+        LEFT JOIN city ON sub_district.city_id = city.city_id
+        LEFT JOIN district ON sub_district.district_id = district.district_id
+        WHERE {STAT_COLUMNAR_SCOPES[scope]}
+    """
+    query_params = []
+
+    region_filters = {
+        "nation": (),
+        "city": (("city", "li.city_id"),),
+        "district": (("district", "li.district_id"),),
+        "sub_district": (("city", "li.city_id"), ("district", "li.district_id"), ("subDistrict", "li.sub_district_id")),
+    }[scope]
+    for filter_key, column in region_filters:
+        if filters_dict.get(filter_key) is not None:
+            query += f" AND {column} = %s"
+            query_params.append(filters_dict[filter_key])
+
+    selected_options = filters_dict.get("selectedOptions")
+    if selected_options:
+        query += f" AND li.ref_date IN ({', '.join(['%s'] * len(selected_options))})"
+        query_params.extend(selected_options)
+
+    if cursor:
+        query += " AND (li.ref_date, li.sub_district_id, li.target_item) > (%s, %s, %s)"
+        query_params.extend(cursor)
+
+    # 다음 페이지 존재 여부 확인용으로 1건 더 조회
+    query += " ORDER BY li.ref_date, li.sub_district_id, li.target_item LIMIT %s"
+    query_params.append(limit + 1)
+
+    rows = await async_fetch_all(query, query_params, dict_cursor=False)
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = [
+            str(last[select_fields.index("ref_date")]),
+            last[select_fields.index("sub_district_id")],
+            last[select_fields.index("target_item")],
+        ]
+
+    values_by_field = list(zip(*rows)) if rows else [()] * len(select_fields)
+    columns = {}
+    for field in fields:
+        values = values_by_field[select_fields.index(field)]
+        if field == "ref_date":
+            columns[field] = [str(value) for value in values]
+        elif field in ("city_id", "district_id", "sub_district_id", "city_name", "district_name", "sub_district_name", "target_item"):
+            columns[field] = list(values)
+        else:
+            # DECIMAL -> float (JSON 직렬화용)
+            columns[field] = [None if value is None else float(value) for value in values]
+
+    return {"fields": fields, "count": len(rows), "columns": columns, "next_cursor": next_cursor}
 
 
 
 ########################
 
 
-def get_nation_j_score(filters_dict)-> StatDataForNation:
+async def get_nation_j_score(filters_dict)-> StatDataForNation:
     results = []
     # 여기서 직접 DB 연결을 설정
-    connection = get_db_connection()
-    cursor = None
-
-
-    try:
+    async with get_async_db_connection() as connection:
         query = """
             SELECT 
                    city.city_id AS CITY_ID, 
@@ -972,9 +941,7 @@ def get_nation_j_score(filters_dict)-> StatDataForNation:
             query += " AND li.sub_district_id = %s"
             query_params.append(filters_dict["subDistrict"])
 
-        cursor = connection.cursor(pymysql.cursors.DictCursor)
-        cursor.execute(query, query_params)
-        rows = cursor.fetchall()
+        rows = await async_fetch_all(query, query_params, connection)
 
         for row in rows:
             loc_info_by_region = StatDataForNation(
@@ -996,13 +963,6 @@ def get_nation_j_score(filters_dict)-> StatDataForNation:
 
         return results
 
-    finally:
-        if cursor:
-            cursor.close()
-        connection.close()  # 연결 종료
-
-
-
 
 
 # 기준 날짜 조회
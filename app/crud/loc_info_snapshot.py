@@ -0,0 +1,204 @@
+import logging
+import os
+import threading
+import time
+from datetime import date
+
+import numpy as np
+import pymysql
+from app.db.connect import get_db_connection
+from app.crud.dimension_cache import get_dimensions
+
+logger = logging.getLogger(__name__)
+
+# 기준 년월(Y_M)별 loc_info 스냅샷
+# Y_M 하나당 전체 읍/면/동(약 3,500 행)을 NumPy 배열 하나로 읽어두고 sub_district_id 로 조회한다.
+# LOC_INFO_SNAPSHOT_DIR 이 지정돼 있으면 .npy 파일로 저장 후 memmap 으로 읽어서
+# 같은 서버의 uvicorn 워커들이 같은 페이지를 공유한다 ("" 이면 메모리에만 보관).
+LOC_INFO_SNAPSHOT_DIR = os.getenv("LOC_INFO_SNAPSHOT_DIR", "loc_info_snapshot")
+# 새 Y_M 적재 / 기존 Y_M 재적재 여부를 확인하는 주기
+LOC_INFO_SNAPSHOT_TTL = float(os.getenv("LOC_INFO_SNAPSHOT_TTL", "60"))
+
+LOC_INFO_ID_COLUMNS = ("loc_info_id", "city_id", "district_id", "sub_district_id")
+LOC_INFO_VALUE_COLUMNS = ("shop", "move_pop", "sales", "work_pop", "income", "spend", "house", "resident", "apart_price")
+LOC_INFO_SNAPSHOT_COLUMNS = LOC_INFO_ID_COLUMNS + LOC_INFO_VALUE_COLUMNS
+
+_snapshots = {}  # Y_M(date) -> LocInfoSnapshot
+_snapshots_checked_at = 0.0
+_snapshots_lock = threading.Lock()
+
+
+class LocInfoSnapshot:
+    """Y_M 하나의 loc_info - 컬럼별 float64 배열 (NULL 은 NaN), 행 순서는 loc_info_id 오름차순"""
+
+    def __init__(self, ref_date, data, signature):
+        self.ref_date = ref_date
+        self.data = data
+        self.signature = signature
+        self.positions = {}  # sub_district_id -> 행 번호
+        for position, sub_district_id in enumerate(self.column("sub_district_id").tolist()):
+            self.positions.setdefault(int(sub_district_id), position)
+
+    def __len__(self):
+        return self.data.shape[0]
+
+    def column(self, name):
+        return self.data[:, LOC_INFO_SNAPSHOT_COLUMNS.index(name)]
+
+    def row(self, position, names=False):
+        """행 하나를 dict 로 (값은 int / None, y_m 포함, names=True 면 지역명 추가)"""
+        row = {
+            name: None if np.isnan(value) else int(value)
+            for name, value in zip(LOC_INFO_SNAPSHOT_COLUMNS, self.data[position].tolist())
+        }
+        row["y_m"] = self.ref_date
+        if names:
+            row.update(region_names(row["city_id"], row["district_id"], row["sub_district_id"]))
+        return row
+
+    def find(self, sub_district_id, names=False):
+        position = self.positions.get(sub_district_id)
+        return None if position is None else self.row(position, names)
+
+    def rows(self, mask=None, names=False):
+        positions = range(len(self)) if mask is None else np.flatnonzero(mask).tolist()
+        return [self.row(position, names) for position in positions]
+
+
+def region_names(city_id, district_id, sub_district_id):
+    """기준 테이블 캐시에서 시/도, 시/군/구, 읍/면/동 이름 조회"""
+    index = get_dimensions()
+    district = index.districts.get(district_id) if index else None
+    sub_district = index.sub_districts.get(sub_district_id) if index else None
+    return {
+        "city_name": index.city_names.get(city_id) if index else None,
+        "district_name": district[1] if district else None,
+        "sub_district_name": sub_district[2] if sub_district else None,
+    }
+
+
+def _select_signatures():
+    """Y_M 별 (행 수, 최대 id, 최종 수정 시각) - 값이 바뀐 Y_M 만 다시 읽는다"""
+    connection = get_db_connection()
+    cursor = connection.cursor(pymysql.cursors.DictCursor)
+    try:
+        cursor.execute("""
+            SELECT Y_M, COUNT(*) AS CNT, MAX(LOC_INFO_ID) AS MAX_ID, MAX(UPDATED_AT) AS UPDATED_AT
+            FROM LOC_INFO
+            WHERE Y_M IS NOT NULL
+            GROUP BY Y_M;
+        """)
+        return {
+            row["Y_M"]: f"{row['CNT']}-{row['MAX_ID']}-{row['UPDATED_AT'].strftime('%Y%m%d%H%M%S') if row['UPDATED_AT'] else 0}"
+            for row in cursor.fetchall()
+        }
+    finally:
+        if cursor:
+            cursor.close()
+        connection.close()
+
+
+def _select_loc_info_rows(ref_date):
+    connection = get_db_connection()
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"""
+            SELECT {", ".join(name.upper() for name in LOC_INFO_SNAPSHOT_COLUMNS)}
+            FROM LOC_INFO
+            WHERE Y_M = %s
+            ORDER BY LOC_INFO_ID;
+        """, (ref_date,))
+        rows = cursor.fetchall()
+    finally:
+        if cursor:
+            cursor.close()
+        connection.close()
+
+    return np.array(
+        [[np.nan if value is None else value for value in row] for row in rows],
+        dtype=np.float64,
+    ).reshape(len(rows), len(LOC_INFO_SNAPSHOT_COLUMNS))
+
+
+def _snapshot_path(ref_date, signature):
+    return os.path.join(LOC_INFO_SNAPSHOT_DIR, f"{ref_date.isoformat()}_{signature}.npy")
+
+
+def _load_snapshot(ref_date, signature):
+    """파일이 있으면 memmap 으로 열고, 없으면 DB 에서 읽어 저장"""
+    if not LOC_INFO_SNAPSHOT_DIR:
+        return LocInfoSnapshot(ref_date, _select_loc_info_rows(ref_date), signature)
+
+    path = _snapshot_path(ref_date, signature)
+    if not os.path.exists(path):
+        data = _select_loc_info_rows(ref_date)
+        try:
+            os.makedirs(LOC_INFO_SNAPSHOT_DIR, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, data)
+            os.replace(tmp_path, path)
+            _remove_stale_files(ref_date, path)
+        except OSError as e:
+            logger.error(f"loc_info snapshot write failed ({path}): {e}")
+            return LocInfoSnapshot(ref_date, data, signature)
+
+    return LocInfoSnapshot(ref_date, np.load(path, mmap_mode="r"), signature)
+
+
+def _remove_stale_files(ref_date, current_path):
+    prefix = f"{ref_date.isoformat()}_"
+    for name in os.listdir(LOC_INFO_SNAPSHOT_DIR):
+        path = os.path.join(LOC_INFO_SNAPSHOT_DIR, name)
+        if name.startswith(prefix) and name.endswith(".npy") and path != current_path:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def get_loc_info_snapshots():
+    """Y_M -> LocInfoSnapshot (Y_M 오름차순), TTL 마다 새 Y_M / 재적재 여부 확인"""
+    global _snapshots, _snapshots_checked_at
+
+    if _snapshots and time.monotonic() - _snapshots_checked_at < LOC_INFO_SNAPSHOT_TTL:
+        return _snapshots
+
+    with _snapshots_lock:
+        if _snapshots and time.monotonic() - _snapshots_checked_at < LOC_INFO_SNAPSHOT_TTL:
+            return _snapshots
+
+        signatures = _select_signatures()
+        snapshots = {}
+        for ref_date in sorted(signatures):
+            snapshot = _snapshots.get(ref_date)
+            if snapshot is None or snapshot.signature != signatures[ref_date]:
+                snapshot = _load_snapshot(ref_date, signatures[ref_date])
+            snapshots[ref_date] = snapshot
+
+        _snapshots = snapshots
+        _snapshots_checked_at = time.monotonic()
+        return _snapshots
+
+
+def get_loc_info_snapshot(ref_date):
+    """기준 년월 스냅샷 ('2024-08-01' 문자열 / date 모두 가능), 없으면 None"""
+    if not isinstance(ref_date, date):
+        ref_date = date.fromisoformat(str(ref_date)[:10])
+    return get_loc_info_snapshots().get(ref_date)
+
+
+def find_loc_info_rows(sub_district_id, names=False):
+    """읍/면/동 하나의 전체 Y_M 행 (Y_M 오름차순)"""
+    rows = []
+    for snapshot in get_loc_info_snapshots().values():
+        row = snapshot.find(sub_district_id, names)
+        if row is not None:
+            rows.append(row)
+    return rows
+
+
+def find_first_loc_info(sub_district_id, names=False):
+    """loc_info_id 가 가장 작은 행 (Y_M 조건 없이 한 건 조회하던 쿼리와 동일)"""
+    rows = find_loc_info_rows(sub_district_id, names)
+    return min(rows, key=lambda row: row["loc_info_id"]) if rows else None
@@ -1,7 +1,20 @@
+import asyncio
 import logging
+import os
+import time
+from collections import OrderedDict
 from typing import List
 import pymysql
+import aiomysql
 from app.db.connect import close_connection, close_cursor, get_db_connection
+from app.db.async_connect import get_async_db_connection, async_stream
+from app.crud.store_name_index import search_store_numbers
+from app.crud.store_category_map import (
+    category_filter,
+    decorate_store_rows,
+    find_store_category_codes,
+    get_store_category_map,
+)
 from app.schemas.loc_info import LocationInfoReportOutput
 from app.schemas.loc_store import (
     BusinessAreaCategoryReportOutput,
@@ -27,198 +40,366 @@ def execute_query(connection, query, params=None, fetch="all"):
         return cursor.fetchall() if fetch == "all" else cursor.fetchone()
 
 
-def get_filtered_loc_store(filters: dict):
-    """필터 조건에 따라 상권 정보 조회"""
-    connection = get_db_connection()
+async def execute_query_async(connection, query, params=None, fetch="all"):
+    """유틸리티 함수: 쿼리 실행 및 결과 반환 (비동기 커넥션)"""
+    async with connection.cursor(aiomysql.DictCursor) as cursor:
+        await cursor.execute("SET SESSION MAX_EXECUTION_TIME=240000;")
+
+        await cursor.execute(query, params or None)
+        return await cursor.fetchall() if fetch == "all" else await cursor.fetchone()
+
+
+async def store_name_candidates(filters):
+    """매장명 색인에서 포함 검색 후보 store_business_number 조회 (색인을 쓸 수 없으면 None)"""
+    city_id = filters.get("city") or None
+    district_id = (filters.get("district") or None) if city_id else None
+    sub_district_id = (filters.get("subDistrict") or None) if district_id else None
+    return await asyncio.to_thread(
+        search_store_numbers, filters["storeName"], city_id, district_id, sub_district_id
+    )
+
+async def stream_store_rows_async(query, params=None, store_name_filter=None, category_map=None, filters=None):
+    """
+    서버 측 커서로 매장 목록을 청크 단위로 yield - 상호명 포함 검색 / 분류명 추가도 청크마다 적용
+    결과 전체를 메모리에 올리지 않음 (커넥션은 응답을 다 보낼 때까지 유지)
+    """
+    async with get_async_db_connection() as connection:
+        async with connection.cursor() as cursor:
+            await cursor.execute("SET SESSION MAX_EXECUTION_TIME=240000;")
+
+        async for rows in async_stream(query, params, connection):
+            if store_name_filter:
+                rows = [row for row in rows if row["store_name"] and store_name_filter in row["store_name"]]
+            if category_map is not None:
+                rows = decorate_store_rows(category_map, rows, filters)
+            if rows:
+                yield rows
+
+
+async def get_filtered_loc_store(filters: dict):
+    """
+    필터 조건에 따라 상권 정보 조회
+    pageSize 가 있으면 페이지 dict, 없으면 청크(list) 단위로 yield 하는 async generator (결과가 없으면 [])
+    """
     # print(filters)
-    try:
-        if filters.get("reference") == 1:
-            # 기본 쿼리
-            
+    if filters.get("reference") == 1:
+        # 업종 매핑 캐시가 있으면 local_store 단일 테이블 조회 후 메모리에서 지역명 / 분류명 추가
+        category_map = await asyncio.to_thread(get_store_category_map)
+        if category_map is not None:
             base_data_query = """
-                SELECT DISTINCT
+                SELECT
                     local_store.store_business_number, local_store.store_name, local_store.branch_name, local_store.road_name_address,
                     local_store.large_category_name, local_store.medium_category_name, local_store.small_category_name,
                     local_store.industry_name, local_store.building_name, local_store.new_postal_code, local_store.dong_info,
                     local_store.floor_info, local_store.unit_info, local_store.local_year, local_store.local_quarter,
-                    city.city_name AS city_name, 
-                    district.district_name AS district_name, 
-                    sub_district.sub_district_name AS sub_district_name,
-                    biz_main_category.BIZ_MAIN_CATEGORY_NAME,
-                    biz_sub_category.BIZ_SUB_CATEGORY_NAME,
-                    biz_detail_category.BIZ_DETAIL_CATEGORY_NAME
+                    local_store.city_id, local_store.district_id, local_store.sub_district_id,
+                    local_store.small_category_code
                 FROM local_store
-                JOIN city ON local_store.city_id = city.city_id
-                JOIN district ON local_store.district_id = district.district_id
-                JOIN sub_district ON local_store.sub_district_id = sub_district.sub_district_id
-                JOIN business_area_category ON local_store.SMALL_CATEGORY_CODE = business_area_category.DETAIL_CATEGORY_CODE
-                JOIN detail_category_mapping ON business_area_category.BUSINESS_AREA_CATEGORY_ID = detail_category_mapping.BUSINESS_AREA_CATEGORY_ID
-                JOIN biz_detail_category ON detail_category_mapping.REP_ID = biz_detail_category.BIZ_DETAIL_CATEGORY_ID
-                JOIN biz_sub_category ON biz_detail_category.BIZ_SUB_CATEGORY_ID = biz_sub_category.BIZ_SUB_CATEGORY_ID
-                JOIN biz_main_category ON biz_sub_category.BIZ_MAIN_CATEGORY_ID = biz_main_category.BIZ_MAIN_CATEGORY_ID
                 WHERE IS_EXIST = 1
             """
-            # 필터 조건 추가
-            additional_conditions = {"query": "", "params": []}
-
-            if filters.get("selectedOptions"):
-                for option in filters["selectedOptions"]:
-                    if option == "KT_MYSHOP":
-                        additional_conditions["query"] += " AND local_store.ktmyshop = 1"
-                    elif option == "JSAM":
-                        additional_conditions["query"] += " AND local_store.jsam = 1"
-                    elif option == "PULMUONE":
-                        additional_conditions["query"] += " AND local_store.PULMUONE = 1"
-
-            if filters.get("city"):
-                additional_conditions["query"] += " AND local_store.city_id = %s"
-                additional_conditions["params"].append(filters["city"])
-
-                if filters.get("district"):
-                    additional_conditions["query"] += " AND local_store.district_id = %s"
-                    additional_conditions["params"].append(filters["district"])
-
-                    if filters.get("subDistrict"):
-                        additional_conditions["query"] += " AND local_store.sub_district_id = %s"
-                        additional_conditions["params"].append(filters["subDistrict"])
-
-            if filters.get("mainCategory"):
-                additional_conditions["query"] += " AND biz_main_category.BIZ_MAIN_CATEGORY_ID = %s"
-                additional_conditions["params"].append(filters["mainCategory"])
-
-                if filters.get("subCategory"):
-                    additional_conditions["query"] += " AND biz_sub_category.BIZ_SUB_CATEGORY_ID = %s"
-                    additional_conditions["params"].append(filters["subCategory"])
-
-                    if filters.get("detailCategory"):
-                        additional_conditions["query"] += " AND biz_detail_category.BIZ_DETAIL_CATEGORY_ID = %s"
-                        additional_conditions["params"].append(filters["detailCategory"])
-
-
-            # Step 1: 쿼리에 필터 조건 추가
-            data_query = base_data_query + additional_conditions["query"]
-
-            if filters.get("storeName"):
-                if filters.get("matchType") == "=":
-                    # SQL에서 정확히 일치 조건 추가
-                    data_query += " AND local_store.store_name = %s"
-                    additional_conditions["params"].append(filters["storeName"])
-                else:
-                    # Python에서 포함 검색 처리
-                    store_name_filter = filters["storeName"]
-
-            data_query += " ORDER BY local_store.store_name"
-
-            data_params = additional_conditions["params"]
-
-            # Step 2: SQL 쿼리 실행 (storeName 정확히 일치 조건은 SQL에서 처리)
-            query_results = execute_query(connection, data_query, data_params)
-
-            # Step 3: Python에서 포함 검색 추가 처리 (matchType != "=")
-            if filters.get("storeName") and filters.get("matchType") != "=":
-                store_name_filter = filters["storeName"]
-                query_results = [
-                    row for row in query_results
-                    if row["store_name"] and store_name_filter in row["store_name"]
-                ]
-
-            # Step 6: 결과 반환
-            return query_results
-
-        
-        else :
+        else:
+            # 기본 쿼리
             base_data_query = """
-                SELECT 
-                    local_store.store_business_number, local_store.store_name, local_store.branch_name, local_store.road_name_address,
-                    local_store.large_category_name, local_store.medium_category_name, local_store.small_category_name,
-                    local_store.industry_name, local_store.building_name, local_store.new_postal_code, local_store.dong_info,
-                    local_store.floor_info, local_store.unit_info, local_store.local_year, local_store.local_quarter,
-                    local_store.ktmyshop, local_store.jsam,
-                    city.city_name AS city_name, 
-                    district.district_name AS district_name, 
-                    sub_district.sub_district_name AS sub_district_name
-                FROM local_store 
-                JOIN city ON local_store.city_id = city.city_id
-                JOIN district ON local_store.district_id = district.district_id
-                JOIN sub_district ON local_store.sub_district_id = sub_district.sub_district_id
-                WHERE IS_EXIST = 1 
+            SELECT DISTINCT
+                local_store.store_business_number, local_store.store_name, local_store.branch_name, local_store.road_name_address,
+                local_store.large_category_name, local_store.medium_category_name, local_store.small_category_name,
+                local_store.industry_name, local_store.building_name, local_store.new_postal_code, local_store.dong_info,
+                local_store.floor_info, local_store.unit_info, local_store.local_year, local_store.local_quarter,
+                city.city_name AS city_name, 
+                district.district_name AS district_name, 
+                sub_district.sub_district_name AS sub_district_name,
+                biz_main_category.BIZ_MAIN_CATEGORY_NAME,
+                biz_sub_category.BIZ_SUB_CATEGORY_NAME,
+                biz_detail_category.BIZ_DETAIL_CATEGORY_NAME
+            FROM local_store
+            JOIN city ON local_store.city_id = city.city_id
+            JOIN district ON local_store.district_id = district.district_id
+            JOIN sub_district ON local_store.sub_district_id = sub_district.sub_district_id
+            JOIN business_area_category ON local_store.SMALL_CATEGORY_CODE = business_area_category.DETAIL_CATEGORY_CODE
+            JOIN detail_category_mapping ON business_area_category.BUSINESS_AREA_CATEGORY_ID = detail_category_mapping.BUSINESS_AREA_CATEGORY_ID
+            JOIN biz_detail_category ON detail_category_mapping.REP_ID = biz_detail_category.BIZ_DETAIL_CATEGORY_ID
+            JOIN biz_sub_category ON biz_detail_category.BIZ_SUB_CATEGORY_ID = biz_sub_category.BIZ_SUB_CATEGORY_ID
+            JOIN biz_main_category ON biz_sub_category.BIZ_MAIN_CATEGORY_ID = biz_main_category.BIZ_MAIN_CATEGORY_ID
+            WHERE IS_EXIST = 1
+        """
+        # 필터 조건 추가
+        additional_conditions = {"query": "", "params": []}
+
+        if filters.get("selectedOptions"):
+            for option in filters["selectedOptions"]:
+                if option == "KT_MYSHOP":
+                    additional_conditions["query"] += " AND local_store.ktmyshop = 1"
+                elif option == "JSAM":
+                    additional_conditions["query"] += " AND local_store.jsam = 1"
+                elif option == "PULMUONE":
+                    additional_conditions["query"] += " AND local_store.PULMUONE = 1"
+
+        if filters.get("city"):
+            additional_conditions["query"] += " AND local_store.city_id = %s"
+            additional_conditions["params"].append(filters["city"])
+
+            if filters.get("district"):
+                additional_conditions["query"] += " AND local_store.district_id = %s"
+                additional_conditions["params"].append(filters["district"])
+
+                if filters.get("subDistrict"):
+                    additional_conditions["query"] += " AND local_store.sub_district_id = %s"
+                    additional_conditions["params"].append(filters["subDistrict"])
+
+        if category_map is not None:
+            # 업종 조건에 맞는 매핑이 있는 소분류 코드만 (조건이 없어도 매핑이 없는 매장은 제외 - 기존 조인과 동일)
+            codes = find_store_category_codes(category_map, *category_filter(filters))
+            if not codes:
+                return empty_store_result(filters)
+            additional_conditions["query"] += f" AND local_store.small_category_code IN ({', '.join(['%s'] * len(codes))})"
+            additional_conditions["params"].extend(codes)
+
+        elif filters.get("mainCategory"):
+            additional_conditions["query"] += " AND biz_main_category.BIZ_MAIN_CATEGORY_ID = %s"
+            additional_conditions["params"].append(filters["mainCategory"])
+
+            if filters.get("subCategory"):
+                additional_conditions["query"] += " AND biz_sub_category.BIZ_SUB_CATEGORY_ID = %s"
+                additional_conditions["params"].append(filters["subCategory"])
+
+                if filters.get("detailCategory"):
+                    additional_conditions["query"] += " AND biz_detail_category.BIZ_DETAIL_CATEGORY_ID = %s"
+                    additional_conditions["params"].append(filters["detailCategory"])
+
+
+        # Step 1: 쿼리에 필터 조건 추가
+        data_query = base_data_query + additional_conditions["query"]
+
+        if filters.get("storeName"):
+            if filters.get("matchType") == "=":
+                # SQL에서 정확히 일치 조건 추가
+                data_query += " AND local_store.store_name = %s"
+                additional_conditions["params"].append(filters["storeName"])
+            else:
+                # 포함 검색 - 매장명 색인으로 후보 매장을 먼저 좁힘 (Python 필터는 그대로 적용)
+                candidates = await store_name_candidates(filters)
+                if candidates is not None:
+                    if not candidates:
+                        return empty_store_result(filters)
+                    data_query += f" AND local_store.store_business_number IN ({', '.join(['%s'] * len(candidates))})"
+                    additional_conditions["params"].extend(candidates)
+
+        data_params = additional_conditions["params"]
+
+        # Step 2: SQL 쿼리 실행 (storeName 정확히 일치 조건은 SQL에서 처리)
+        # Step 3: Python에서 포함 검색 추가 처리 (matchType != "=") - 청크 단위로 읽으면서 적용
+        store_name_filter = None
+        if filters.get("storeName") and filters.get("matchType") != "=":
+            store_name_filter = filters["storeName"]
+
+        # Step 4: pageSize 가 있으면 keyset 페이지 조회
+        if filters.get("pageSize"):
+            async with get_async_db_connection() as connection:
+                page = await fetch_store_page_async(connection, data_query, data_params, filters, store_name_filter)
+            if category_map is not None:
+                page["rows"] = decorate_store_rows(category_map, page["rows"], filters)
+            return page
+
+        # Step 5: 전체 목록은 청크 단위로 읽으면서 바로 응답으로 내보냄 (지역명 / 업종 분류명은 청크마다 추가)
+        data_query += " ORDER BY local_store.store_name"
+        return stream_store_rows_async(data_query, data_params, store_name_filter, category_map, filters)
+
+    
+    else :
+        base_data_query = """
+            SELECT 
+                local_store.store_business_number, local_store.store_name, local_store.branch_name, local_store.road_name_address,
+                local_store.large_category_name, local_store.medium_category_name, local_store.small_category_name,
+                local_store.industry_name, local_store.building_name, local_store.new_postal_code, local_store.dong_info,
+                local_store.floor_info, local_store.unit_info, local_store.local_year, local_store.local_quarter,
+                local_store.ktmyshop, local_store.jsam,
+                city.city_name AS city_name, 
+                district.district_name AS district_name, 
+                sub_district.sub_district_name AS sub_district_name
+            FROM local_store 
+            JOIN city ON local_store.city_id = city.city_id
+            JOIN district ON local_store.district_id = district.district_id
+            JOIN sub_district ON local_store.sub_district_id = sub_district.sub_district_id
+            WHERE IS_EXIST = 1 
+        """
+        # print(filters)
+        # 필터 조건 추가
+        additional_conditions = {"query": "", "params": []}
+
+        if filters.get("selectedOptions"):
+            conditions = []  # 조건을 저장할 리스트
+            for option in filters["selectedOptions"]:
+                if option == "ktmyshop":
+                    conditions.append("local_store.ktmyshop = 1")
+                elif option == "jsam":  # "JSAM"의 value 값은 "jsam"이라고 가정
+                    conditions.append("local_store.jsam = 1")
+                elif option == "PULMUONE":
+                    conditions.append("local_store.PULMUONE = 1")
+            
+            if conditions:
+                # 조건들을 OR로 묶어서 추가
+                additional_conditions["query"] += f" AND ({' OR '.join(conditions)})"
+
+        if filters.get("city"):
+            additional_conditions["query"] += " AND local_store.city_id = %s"
+            additional_conditions["params"].append(filters["city"])
+
+            if filters.get("district"):
+                additional_conditions["query"] += " AND local_store.district_id = %s"
+                additional_conditions["params"].append(filters["district"])
+
+                if filters.get("subDistrict"):
+                    additional_conditions["query"] += " AND local_store.sub_district_id = %s"
+                    additional_conditions["params"].append(filters["subDistrict"])
+
+
+        if filters.get("mainCategory"):
+            additional_conditions["query"] += " AND local_store.large_category_code = %s"
+            additional_conditions["params"].append(filters["mainCategory"])
+
+            if filters.get("subCategory"):
+                additional_conditions["query"] += " AND local_store.medium_category_code = %s"
+                additional_conditions["params"].append(filters["subCategory"])
+
+                if filters.get("detailCategory"):
+                    additional_conditions["query"] += " AND local_store.small_category_code = %s"
+                    additional_conditions["params"].append(filters["detailCategory"])
+
+        # Step 1: 쿼리에 필터 조건 추가
+        data_query = base_data_query + additional_conditions["query"]
+
+        if filters.get("storeName"):
+            if filters.get("matchType") == "=":
+                # SQL에서 정확히 일치 조건 추가
+                data_query += " AND local_store.store_name = %s"
+                additional_conditions["params"].append(filters["storeName"])
+            else:
+                # 포함 검색 - 매장명 색인으로 후보 매장을 먼저 좁힘 (Python 필터는 그대로 적용)
+                candidates = await store_name_candidates(filters)
+                if candidates is not None:
+                    if not candidates:
+                        return empty_store_result(filters)
+                    data_query += f" AND local_store.store_business_number IN ({', '.join(['%s'] * len(candidates))})"
+                    additional_conditions["params"].extend(candidates)
+
+        data_params = additional_conditions["params"]
+
+        # Step 2: SQL 쿼리 실행 (storeName 정확히 일치 조건은 SQL에서 처리)
+        # Step 3: Python에서 포함 검색 추가 처리 (matchType != "=") - 청크 단위로 읽으면서 적용
+        store_name_filter = None
+        if filters.get("storeName") and filters.get("matchType") != "=":
+            store_name_filter = filters["storeName"]
+
+        # Step 4: pageSize 가 있으면 keyset 페이지 조회
+        if filters.get("pageSize"):
+            async with get_async_db_connection() as connection:
+                return await fetch_store_page_async(connection, data_query, data_params, filters, store_name_filter)
+
+        # Step 5: 전체 목록은 청크 단위로 읽으면서 바로 응답으로 내보냄
+        data_query += " ORDER BY local_store.store_name"
+        return stream_store_rows_async(data_query, data_params, store_name_filter)
+
+
+# 매장 목록 페이지 조회
+LOC_STORE_PAGE_SIZE_MAX = int(os.getenv("LOC_STORE_PAGE_SIZE_MAX", "1000"))
+LOC_STORE_COUNT_TTL = float(os.getenv("LOC_STORE_COUNT_TTL", "300"))
+# 건수 캐시 최대 개수 (매장명 검색어 / 후보 목록마다 키가 달라지므로 제한)
+LOC_STORE_COUNT_CACHE_SIZE = int(os.getenv("LOC_STORE_COUNT_CACHE_SIZE", "1000"))
+
+# 필터 조건(쿼리 + 파라미터) -> (조회 시각, 전체 건수), 저장한 순서 (오래된 것이 앞)
+_store_count_cache = OrderedDict()
+
+
+def _cache_store_count(key, total):
+    """만료된 항목을 지우고 LOC_STORE_COUNT_CACHE_SIZE 를 넘으면 오래된 것부터 제거"""
+    now = time.monotonic()
+    _store_count_cache.pop(key, None)
+    while _store_count_cache:
+        oldest_key, (cached_at, _) = next(iter(_store_count_cache.items()))
+        if now - cached_at < LOC_STORE_COUNT_TTL and len(_store_count_cache) < LOC_STORE_COUNT_CACHE_SIZE:
+            break
+        del _store_count_cache[oldest_key]
+    _store_count_cache[key] = (now, total)
+
+
+def empty_store_result(filters):
+    """조회 결과가 없을 때 - 페이지 조회면 페이지 형식으로 반환"""
+    if filters.get("pageSize"):
+        return {"rows": [], "next_cursor": None, "total": 0 if filters.get("withTotal") else None}
+    return []
+
+
+async def fetch_store_page_async(connection, data_query, data_params, filters, store_name_filter=None):
+    """
+    (store_name, store_business_number) keyset 페이지 조회
+    cursor 는 이전 페이지의 next_cursor, withTotal 이 "exact" / "approx" 면 전체 건수도 반환
+    """
+    page_size = min(max(int(filters["pageSize"]), 1), LOC_STORE_PAGE_SIZE_MAX)
+    params = list(data_params)
+
+    # 포함 검색은 LIMIT 전에 SQL 에서 걸러야 페이지 크기 / 전체 건수가 맞음
+    # LIKE BINARY : 전체 목록의 Python 포함 검색과 같이 대소문자 구분
+    if store_name_filter:
+        escaped = store_name_filter.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        data_query += " AND local_store.store_name LIKE BINARY %s"
+        params.append(f"%{escaped}%")
+
+    total = None
+    if filters.get("withTotal") in ("exact", "approx"):
+        total = await count_store_rows_async(connection, data_query, params, filters["withTotal"])
+
+    page_query = data_query
+    page_params = list(params)
+    cursor = filters.get("cursor")
+    if cursor:
+        if len(cursor) != 2:
+            raise HTTPException(status_code=400, detail="cursor 는 [store_name, store_business_number] 형식이어야 합니다.")
+        cursor_name, cursor_number = cursor
+        if cursor_name is None:
+            # NULL 매장명은 가장 앞에 정렬됨
+            page_query += """
+                AND (local_store.store_name IS NOT NULL
+                     OR local_store.store_business_number > %s)
             """
-            # print(filters)
-            # 필터 조건 추가
-            additional_conditions = {"query": "", "params": []}
-
-            if filters.get("selectedOptions"):
-                conditions = []  # 조건을 저장할 리스트
-                for option in filters["selectedOptions"]:
-                    if option == "ktmyshop":
-                        conditions.append("local_store.ktmyshop = 1")
-                    elif option == "jsam":  # "JSAM"의 value 값은 "jsam"이라고 가정
-                        conditions.append("local_store.jsam = 1")
-                    elif option == "PULMUONE":
-                        conditions.append("local_store.PULMUONE = 1")
-                
-                if conditions:
-                    # 조건들을 OR로 묶어서 추가
-                    additional_conditions["query"] += f" AND ({' OR '.join(conditions)})"
-
-            if filters.get("city"):
-                additional_conditions["query"] += " AND local_store.city_id = %s"
-                additional_conditions["params"].append(filters["city"])
-
-                if filters.get("district"):
-                    additional_conditions["query"] += " AND local_store.district_id = %s"
-                    additional_conditions["params"].append(filters["district"])
-
-                    if filters.get("subDistrict"):
-                        additional_conditions["query"] += " AND local_store.sub_district_id = %s"
-                        additional_conditions["params"].append(filters["subDistrict"])
-
-
-            if filters.get("mainCategory"):
-                additional_conditions["query"] += " AND local_store.large_category_code = %s"
-                additional_conditions["params"].append(filters["mainCategory"])
-
-                if filters.get("subCategory"):
-                    additional_conditions["query"] += " AND local_store.medium_category_code = %s"
-                    additional_conditions["params"].append(filters["subCategory"])
-
-                    if filters.get("detailCategory"):
-                        additional_conditions["query"] += " AND local_store.small_category_code = %s"
-                        additional_conditions["params"].append(filters["detailCategory"])
-
-            # Step 1: 쿼리에 필터 조건 추가
-            data_query = base_data_query + additional_conditions["query"]
-
-            if filters.get("storeName"):
-                if filters.get("matchType") == "=":
-                    # SQL에서 정확히 일치 조건 추가
-                    data_query += " AND local_store.store_name = %s"
-                    additional_conditions["params"].append(filters["storeName"])
-                else:
-                    # Python에서 포함 검색 처리
-                    store_name_filter = filters["storeName"]
-
-            data_query += " ORDER BY local_store.store_name"
-
-            data_params = additional_conditions["params"]
-
-            # Step 2: SQL 쿼리 실행 (storeName 정확히 일치 조건은 SQL에서 처리)
-            query_results = execute_query(connection, data_query, data_params)
-
-            # Step 3: Python에서 포함 검색 추가 처리 (matchType != "=")
-            if filters.get("storeName") and filters.get("matchType") != "=":
-                store_name_filter = filters["storeName"]
-                query_results = [
-                    row for row in query_results
-                    if row["store_name"] and store_name_filter in row["store_name"]
-                ]
-
-            # Step 6: 결과 반환
-            return query_results
-
+            page_params.append(cursor_number)
+        else:
+            page_query += " AND (local_store.store_name, local_store.store_business_number) > (%s, %s)"
+            page_params.extend([cursor_name, cursor_number])
+
+    page_query += " ORDER BY local_store.store_name, local_store.store_business_number LIMIT %s"
+    page_params.append(page_size + 1)
+
+    rows = await execute_query_async(connection, page_query, page_params)
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = [rows[-1]["store_name"], rows[-1]["store_business_number"]]
+
+    return {"rows": rows, "next_cursor": next_cursor, "total": total}
+
+
+async def count_store_rows_async(connection, data_query, params, mode="exact"):
+    """필터 조건별 전체 건수 - exact : COUNT(*), approx : EXPLAIN 예상 행 수 (LOC_STORE_COUNT_TTL 동안 캐시)"""
+    key = (mode, data_query, tuple(params))
+    cached = _store_count_cache.get(key)
+    if cached is not None and time.monotonic() - cached[0] < LOC_STORE_COUNT_TTL:
+        return cached[1]
+
+    if mode == "approx":
+        plan = await execute_query_async(connection, f"EXPLAIN {data_query}", params)
+        total = 0
+        if plan:
+            first = plan[0]
+            total = int((first.get("rows") or 0) * float(first.get("filtered") or 100) / 100)
+    else:
+        row = await execute_query_async(
+            connection, f"SELECT COUNT(*) AS total FROM ({data_query}) AS filtered_store", params, fetch="one"
+        )
+        total = row["total"] if row else 0
 
-    finally:
-        connection.close()
+    _cache_store_count(key, total)
+    return total
 
 
 def check_previous_quarter_data_exists(connection, year, quarter):
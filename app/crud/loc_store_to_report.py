@@ -2,7 +2,18 @@ import logging
 from typing import List
 import pymysql
 from app.db.connect import close_connection, close_cursor, get_db_connection, get_re_db_connection
+from app.crud.loc_info_snapshot import get_loc_info_snapshot, find_loc_info_rows
+from app.crud.store_name_index import search_store_numbers, add_store_to_index
+from app.crud.dimension_cache import (
+    find_biz_categories,
+    find_biz_detail_category_name,
+    find_business_area_category,
+    find_district_name,
+    find_rep_id,
+    find_sub_district_name,
+)
 
+logger = logging.getLogger(__name__)
 
 
 # 기존 매장 1개조회
@@ -29,10 +40,20 @@ def select_one_store(
                 SMALL_CATEGORY_CODE = %s
         """
 
-        cursor.execute(select_query, (
+        query_params = [
             city_id, district_id, sub_district_id,
             large_category_code, medium_category_code, small_category_code
-        ))
+        ]
+
+        # 매장명 색인으로 후보 매장을 먼저 좁힘 (이미 만들어진 최신 파티션이 있을 때만 - 없으면 아래 쿼리 그대로)
+        candidates = search_store_numbers(store_name, city_id, district_id, sub_district_id)
+        if candidates is not None:
+            if not candidates:
+                return []
+            select_query += f" AND STORE_BUSINESS_NUMBER IN ({', '.join(['%s'] * len(candidates))})"
+            query_params.extend(candidates)
+
+        cursor.execute(select_query, query_params)
         rows = cursor.fetchall()
 
         # 2. Python 내에서 store_name 기준 LIKE 필터
@@ -91,6 +112,10 @@ def match_exist_store(
 
 # 카테고리 명 가져오기
 def get_category_name(small_category_code):
+    cached = find_business_area_category(small_category_code)
+    if cached is not None:
+        return cached[1:]
+
     connection = get_db_connection()
     cursor = connection.cursor(pymysql.cursors.DictCursor)
 
@@ -123,34 +148,6 @@ def get_category_name(small_category_code):
         connection.close()
 
 
-# MAX 값 뽑기
-def get_max_number():
-    connection = get_db_connection()
-    cursor = connection.cursor(pymysql.cursors.DictCursor)
-
-    try:
-        select_query = """
-            SELECT MAX(CAST(SUBSTRING(store_business_number, 3) AS UNSIGNED)) AS max_js_number
-            FROM local_store
-            WHERE store_business_number LIKE 'JS%';
-        """
-
-        cursor.execute(select_query)
-        row = cursor.fetchone()
-
-        if row:
-            return (
-                row["max_js_number"],
-            )
-        else:
-            return (None, None, None)
-
-
-    finally:
-        if cursor:
-            cursor.close()
-        connection.close()
-
 # 새 매장 추가
 def add_new_store(
     store_business_number, city_id, district_id, sub_district_id, reference_id, 
@@ -205,6 +202,8 @@ def add_new_store(
         ))
 
         connection.commit()
+        # 매장명 색인에도 반영
+        add_store_to_index(store_business_number, district_id, sub_district_id, store_name)
         return True
 
     except Exception as e:
@@ -219,6 +218,109 @@ def add_new_store(
 
 
 
+STORE_KEY_COLUMNS = (
+    "CITY_ID", "DISTRICT_ID", "SUB_DISTRICT_ID",
+    "LARGE_CATEGORY_CODE", "MEDIUM_CATEGORY_CODE", "SMALL_CATEGORY_CODE",
+    "STORE_NAME",
+)
+
+
+# 이미 등록된 매장 일괄 확인 (match_exist_store 와 같은 조건) -> 존재하는 키 집합
+def find_existing_stores(keys, chunk_size=1000):
+    connection = get_db_connection()
+    cursor = connection.cursor()
+    existing = set()
+
+    try:
+        keys = list(keys)
+        for start in range(0, len(keys), chunk_size):
+            chunk = keys[start:start + chunk_size]
+            placeholders = ", ".join(["(%s, %s, %s, %s, %s, %s, %s)"] * len(chunk))
+            cursor.execute(f"""
+                SELECT {", ".join(STORE_KEY_COLUMNS)}
+                FROM LOCAL_STORE
+                WHERE ({", ".join(STORE_KEY_COLUMNS)}) IN ({placeholders});
+            """, [value for key in chunk for value in key])
+            existing.update(tuple(row) for row in cursor.fetchall())
+
+        return existing
+
+    finally:
+        if cursor:
+            cursor.close()
+        connection.close()
+
+
+# 새 매장 일괄 추가 (한 트랜잭션, multi-row INSERT) - 실패 시 전체 롤백
+def add_new_stores(stores):
+    connection = get_db_connection()
+    cursor = connection.cursor()
+
+    try:
+        insert_query = """
+            INSERT INTO local_store (
+                store_business_number,
+                city_id,
+                district_id,
+                sub_district_id,
+                reference_id,
+                large_category_code,
+                medium_category_code,
+                small_category_code,
+                large_category_name,
+                medium_category_name,
+                small_category_name,
+                store_name,
+                road_name_address,
+                longitude,
+                latitude,
+                is_exist,
+                jsam, ktmyshop, PULMUONE
+            )
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """
+
+        # executemany 는 INSERT ... VALUES 를 여러 행짜리 문장으로 묶어서 실행
+        # (VALUES 가 전부 %s 여야 묶임 - 상수가 섞이면 행마다 INSERT 하므로 is_exist 도 파라미터로 넘김)
+        cursor.executemany(insert_query, [
+            (
+                store["store_business_number"],
+                store["city_id"],
+                store["district_id"],
+                store["sub_district_id"],
+                store["reference_id"],
+                store["large_category_code"],
+                store["medium_category_code"],
+                store["small_category_code"],
+                store["large_category_name"],
+                store["medium_category_name"],
+                store["small_category_name"],
+                store["store_name"],
+                store["road_name"],
+                store["longitude"],
+                store["latitude"],
+                1,
+                store["tag_flags"]["jsam"], store["tag_flags"]["ktmyshop"], store["tag_flags"]["PULMUONE"],
+            )
+            for store in stores
+        ])
+
+        connection.commit()
+        for store in stores:
+            add_store_to_index(store["store_business_number"], store["district_id"], store["sub_district_id"], store["store_name"])
+        return True
+
+    except Exception as e:
+        logger.error(f"bulk store insert failed: {e}")
+        connection.rollback()
+        return False
+
+    finally:
+        if cursor:
+            cursor.close()
+        connection.close()
+
+
 # 매장 정보 가져오기
 def get_store_data(store_business_number):
     connection = get_db_connection()
@@ -291,43 +393,25 @@ def get_city_data(sub_district_id):
         connection.close()
 
 
-# 입지 정보 데이터 가져오기
+# 입지 정보 데이터 가져오기 (가장 최근 Y_M, loc_info 스냅샷에서 조회)
 def get_loc_info_data(sub_district_id):
-    connection = get_db_connection()
-    cursor = connection.cursor(pymysql.cursors.DictCursor)
-
-    try:
-        select_query = """
-            SELECT 
-                SHOP, MOVE_POP, SALES, WORK_POP, INCOME, SPEND, HOUSE, RESIDENT, Y_M
-            FROM loc_info
-            WHERE SUB_DISTRICT_ID = %s
-            ORDER BY Y_M DESC
-            LIMIT 1;
-
-        """
-
-        cursor.execute(select_query, (sub_district_id))
-        row = cursor.fetchone()
-
-        if row:
-            return (
-                row["SHOP"],
-                row["MOVE_POP"],
-                row["SALES"],
-                row["WORK_POP"],
-                row["INCOME"],
-                row["SPEND"],
-                row["HOUSE"],
-                row["RESIDENT"],
-                row["Y_M"]
-            )
-        else:
-            return (None, None, None, None, None, None, None, None)
-    finally:
-        if cursor:
-            cursor.close()
-        connection.close()
+    rows = find_loc_info_rows(sub_district_id)
+
+    if rows:
+        row = rows[-1]
+        return (
+            row["shop"],
+            row["move_pop"],
+            row["sales"],
+            row["work_pop"],
+            row["income"],
+            row["spend"],
+            row["house"],
+            row["resident"],
+            row["y_m"]
+        )
+    else:
+        return (None, None, None, None, None, None, None, None)
 
 
 # 입지 정보 통계값 가져오기
@@ -391,6 +475,10 @@ def get_district_move_pop(district_id, loc_info_ref_date):
 
 # 카테고리 ID 가져오기
 def get_category_data(small_category_code):
+    cached = find_business_area_category(small_category_code)
+    if cached is not None:
+        return (cached[0],)
+
     connection = get_db_connection()
     cursor = connection.cursor(pymysql.cursors.DictCursor)
 
@@ -418,6 +506,10 @@ def get_category_data(small_category_code):
 
 
 def get_biz_id(detail_category_id):
+    cached = find_rep_id(detail_category_id)
+    if cached is not None:
+        return cached
+
     connection = get_db_connection()
     cursor = connection.cursor(pymysql.cursors.DictCursor)
 
@@ -445,6 +537,10 @@ def get_biz_id(detail_category_id):
 
 
 def get_biz_category_name(rep_id):
+    cached = find_biz_categories(rep_id)
+    if cached is not None:
+        return cached
+
     connection = get_db_connection()
     cursor = connection.cursor(pymysql.cursors.DictCursor)
 
@@ -882,6 +978,10 @@ def get_rising_nation():
 
 
 def get_district_name(id):
+    cached = find_district_name(id)
+    if cached is not None:
+        return cached
+
     connection = get_db_connection()
     cursor = connection.cursor(pymysql.cursors.DictCursor)
 
@@ -910,6 +1010,10 @@ def get_district_name(id):
 
 
 def get_sub_district_name_nation(id):
+    cached = find_sub_district_name(id)
+    if cached is not None:
+        return cached
+
     connection = get_db_connection()
     cursor = connection.cursor(pymysql.cursors.DictCursor)
 
@@ -977,6 +1081,10 @@ def get_rising(id):
 
 
 def get_nice_category_name(id):
+    cached = find_biz_detail_category_name(id)
+    if cached is not None:
+        return cached
+
     connection = get_db_connection()
     cursor = connection.cursor(pymysql.cursors.DictCursor)
 
@@ -1045,34 +1153,567 @@ def get_hot_place(district_id, loc_info_ref_date):
 
 
 def get_hot_place_loc_info(sub_district_id, loc_info_ref_date):
+    # loc_info 스냅샷에서 조회
+    snapshot = get_loc_info_snapshot(loc_info_ref_date)
+    row = snapshot.find(sub_district_id) if snapshot else None
+
+    if row:
+        return (
+            row["move_pop"],
+            row["sales"]
+        )
+    else:
+        return (None)
+
+
+# 리포트용 입지 정보 통계 항목
+REPORT_LOC_INFO_TARGET_ITEMS = (
+    "j_score_average", "resident", "work_pop", "move_pop", "shop",
+    "income", "spend", "sales", "house",
+)
+
+# 리포트용 전국 상권 통계 테이블
+REPORT_NATION_COMMERCIAL_TABLES = (
+    "commercial_district_sub_district_density_statistics",
+    "commercial_district_market_size_statistics",
+    "commercial_district_average_sales_statistics",
+    "commercial_district_average_payment_statistics",
+    "commercial_district_useage_count_statistics",
+)
+
+
+# 전국 뜨는 업종 TOP5 (+ 이름)
+REPORT_NATION_RISING_QUERY = """
+    SELECT 
+        'nation_rising' AS KIND, rb.GROWTH_RATE AS SORT_VAL,
+        d.DISTRICT_NAME, sd.SUB_DISTRICT_NAME, bdc.BIZ_DETAIL_CATEGORY_NAME AS CATEGORY_NAME,
+        NULL AS AVERAGE_SALES, rb.GROWTH_RATE, NULL AS J_SCORE_NON_OUTLIERS,
+        NULL AS MOVE_POP, NULL AS SALES
+    FROM rising_business rb
+    LEFT JOIN DISTRICT d ON rb.DISTRICT_ID = d.DISTRICT_ID
+    LEFT JOIN SUB_DISTRICT sd ON rb.SUB_DISTRICT_ID = sd.SUB_DISTRICT_ID
+    LEFT JOIN BIZ_DETAIL_CATEGORY bdc ON rb.BIZ_DETAIL_CATEGORY_ID = bdc.BIZ_DETAIL_CATEGORY_ID
+    WHERE rb.Y_M = '2024-11-30'
+    ORDER BY rb.GROWTH_RATE DESC
+    LIMIT 5
+"""
+
+
+# 리포트 대량 재생성 대상 매장 번호 조회 (지역 / 카테고리 / 태그 필터)
+def select_store_business_numbers_by_filter(filters):
     connection = get_db_connection()
     cursor = connection.cursor(pymysql.cursors.DictCursor)
 
     try:
-        select_query = """
+        query = """
+            SELECT STORE_BUSINESS_NUMBER
+            FROM LOCAL_STORE
+            WHERE IS_EXIST = 1
+        """
+        params = []
+
+        if filters.get("city"):
+            query += " AND CITY_ID = %s"
+            params.append(filters["city"])
+        if filters.get("district"):
+            query += " AND DISTRICT_ID = %s"
+            params.append(filters["district"])
+        if filters.get("subDistrict"):
+            query += " AND SUB_DISTRICT_ID = %s"
+            params.append(filters["subDistrict"])
+
+        if filters.get("mainCategory"):
+            query += " AND LARGE_CATEGORY_CODE = %s"
+            params.append(filters["mainCategory"])
+        if filters.get("subCategory"):
+            query += " AND MEDIUM_CATEGORY_CODE = %s"
+            params.append(filters["subCategory"])
+        if filters.get("detailCategory"):
+            query += " AND SMALL_CATEGORY_CODE = %s"
+            params.append(filters["detailCategory"])
+
+        # 태그는 OR 로 묶음 (매장 목록 조회와 동일)
+        tag_columns = {"jsam": "JSAM", "ktmyshop": "KTMYSHOP", "PULMUONE": "PULMUONE"}
+        conditions = [
+            f"{tag_columns[option]} = 1"
+            for option in filters.get("selectedOptions") or []
+            if option in tag_columns
+        ]
+        if conditions:
+            query += f" AND ({' OR '.join(conditions)})"
+
+        query += " ORDER BY STORE_BUSINESS_NUMBER"
+        cursor.execute(query, params)
+        return [row["STORE_BUSINESS_NUMBER"] for row in cursor.fetchall()]
+
+    finally:
+        if cursor:
+            cursor.close()
+        connection.close()
+
+
+# 리포트 공통 데이터 조회 (상권 기준 날짜, 전국 뜨는 업종, 소분류별 상권 가중 평균 j_score)
+# 대량 재생성 시 한 번만 조회해서 매장별 조회에 넘겨준다.
+def get_report_shared_data():
+    connection = get_db_connection()
+    cursor = connection.cursor(pymysql.cursors.DictCursor)
+
+    try:
+        cursor.execute("select MAX(Y_M) as REF_DATE from commercial_district;")
+        nice_biz_map_data_ref_date = cursor.fetchone()["REF_DATE"]
+
+        cursor.execute(REPORT_NATION_RISING_QUERY)
+        nation_rising = list(cursor.fetchall())
+
+        weighted_query = """
             SELECT 
-                MOVE_POP, SALES
-            FROM LOC_INFO 
-            WHERE SUB_DISTRICT_ID = %s and Y_M = %s
+                w.BIZ_DETAIL_CATEGORY_ID, w.J_SCORE_AVG
+            FROM commercial_district_weighted_average w
+            JOIN (
+                SELECT BIZ_DETAIL_CATEGORY_ID, MAX(REF_DATE) AS REF_DATE
+                FROM commercial_district_weighted_average
+                GROUP BY BIZ_DETAIL_CATEGORY_ID
+            ) latest
+            ON w.BIZ_DETAIL_CATEGORY_ID = latest.BIZ_DETAIL_CATEGORY_ID AND w.REF_DATE = latest.REF_DATE;
+        """
+        cursor.execute(weighted_query)
+        weighted_averages = {}
+        for row in cursor.fetchall():
+            weighted_averages.setdefault(row["BIZ_DETAIL_CATEGORY_ID"], row["J_SCORE_AVG"])
+
+        return {
+            "nice_biz_map_data_ref_date": nice_biz_map_data_ref_date,
+            "nation_rising": nation_rising,
+            "weighted_averages": weighted_averages,
+        }
+
+    finally:
+        if cursor:
+            cursor.close()
+        connection.close()
+
+
+# 리포트 원천 데이터 일괄 조회 (커넥션 1개, 쿼리 7번)
+# shared 를 넘기면 공통 데이터는 조회하지 않고 그 값을 사용
+def get_report_source_data(store_business_number, shared=None):
+    connection = get_db_connection()
+    cursor = connection.cursor(pymysql.cursors.DictCursor)
 
+    try:
+        # 1. 매장 + 지역명 + 카테고리 매핑 + 최신 입지 정보 + 상권 기준 날짜
+        # 공통 데이터가 있으면 상권 기준 날짜는 조회하지 않고 그 값(date)을 사용
+        # (SQL 로 바인딩해서 다시 받으면 문자열이 되어 COMMERCIAL_DISTRICT.Y_M 과 비교되지 않음)
+        if shared is None:
+            nice_ref_date_column = "(SELECT MAX(Y_M) FROM commercial_district)"
+        else:
+            nice_ref_date_column = "NULL"
+        store_params = (store_business_number, store_business_number)
+
+        store_query = f"""
+            SELECT 
+                ls.SUB_DISTRICT_ID,
+                ls.STORE_NAME, ls.ROAD_NAME_ADDRESS,
+                ls.SMALL_CATEGORY_NAME, ls.SMALL_CATEGORY_CODE,
+                ls.LONGITUDE, ls.LATITUDE,
+                c.CITY_NAME,
+                d.DISTRICT_NAME, d.DISTRICT_ID,
+                sd.SUB_DISTRICT_NAME,
+                bac.BUSINESS_AREA_CATEGORY_ID,
+                dcm.REP_ID,
+                sc.BIZ_MAIN_CATEGORY_ID,
+                sc.BIZ_SUB_CATEGORY_ID,
+                dc.BIZ_DETAIL_CATEGORY_NAME,
+                li.SHOP, li.MOVE_POP, li.SALES, li.WORK_POP, li.INCOME,
+                li.SPEND, li.HOUSE, li.RESIDENT, li.Y_M AS LOC_INFO_REF_DATE,
+                {nice_ref_date_column} AS NICE_BIZ_MAP_DATA_REF_DATE
+            FROM LOCAL_STORE ls
+            LEFT JOIN SUB_DISTRICT sd ON ls.SUB_DISTRICT_ID = sd.SUB_DISTRICT_ID
+            LEFT JOIN DISTRICT d ON sd.DISTRICT_ID = d.DISTRICT_ID
+            LEFT JOIN CITY c ON d.CITY_ID = c.CITY_ID
+            LEFT JOIN business_area_category bac ON bac.DETAIL_CATEGORY_CODE = ls.SMALL_CATEGORY_CODE
+            LEFT JOIN detail_category_mapping dcm ON dcm.BUSINESS_AREA_CATEGORY_ID = bac.BUSINESS_AREA_CATEGORY_ID
+            LEFT JOIN biz_detail_category dc ON dc.BIZ_DETAIL_CATEGORY_ID = dcm.REP_ID
+            LEFT JOIN biz_sub_category sc ON dc.BIZ_SUB_CATEGORY_ID = sc.BIZ_SUB_CATEGORY_ID
+            LEFT JOIN (
+                SELECT 
+                    SUB_DISTRICT_ID, SHOP, MOVE_POP, SALES, WORK_POP, INCOME, SPEND, HOUSE, RESIDENT, Y_M
+                FROM loc_info
+                WHERE SUB_DISTRICT_ID = (
+                    SELECT SUB_DISTRICT_ID FROM LOCAL_STORE WHERE STORE_BUSINESS_NUMBER = %s
+                )
+                ORDER BY Y_M DESC
+                LIMIT 1
+            ) li ON li.SUB_DISTRICT_ID = ls.SUB_DISTRICT_ID
+            WHERE ls.STORE_BUSINESS_NUMBER = %s
+            LIMIT 1;
+        """
+        cursor.execute(store_query, store_params)
+        store = cursor.fetchone()
+
+        if not store:
+            return None
+        if shared is not None:
+            store["NICE_BIZ_MAP_DATA_REF_DATE"] = shared["nice_biz_map_data_ref_date"]
+
+        sub_district_id = store["SUB_DISTRICT_ID"]
+        district_id = store["DISTRICT_ID"]
+        rep_id = store["REP_ID"]
+        loc_info_ref_date = store["LOC_INFO_REF_DATE"]
+        nice_biz_map_data_ref_date = store["NICE_BIZ_MAP_DATA_REF_DATE"]
+
+        # 2. 입지 j_score (항목 9개) + 시/군/구 유동인구 평균 + MZ j_score
+        placeholders = ",".join(["%s"] * len(REPORT_LOC_INFO_TARGET_ITEMS))
+        stat_query = f"""
+            SELECT 
+                'loc_info' AS KIND, TARGET_ITEM, J_SCORE_NON_OUTLIERS, NULL AS AVG_VAL
+            FROM loc_info_statistics
+            WHERE sub_district_id = %s and ref_date = %s and target_item IN ({placeholders})
+            AND CITY_ID is NOT NULL and DISTRICT_ID is NOT NULL
+            UNION ALL
+            SELECT 
+                'district_move_pop', TARGET_ITEM, NULL, AVG_VAL
+            FROM loc_info_statistics
+            WHERE sub_district_id = %s and ref_date = %s 
+            and target_item = 'move_pop' and STAT_LEVEL = "시/군/구"
+            UNION ALL
+            SELECT 
+                'mz', NULL, J_SCORE_NON_OUTLIERS, NULL
+            FROM population_info_mz_statistics 
+            WHERE SUB_DISTRICT_ID = %s and REF_DATE = %s
+            AND CITY_ID is NOT NULL and DISTRICT_ID is NOT NULL;
         """
+        cursor.execute(stat_query, (
+            sub_district_id, loc_info_ref_date, *REPORT_LOC_INFO_TARGET_ITEMS,
+            district_id, loc_info_ref_date,
+            sub_district_id, loc_info_ref_date,
+        ))
+        stat_rows = {}
+        for row in cursor.fetchall():
+            # 기존 단건 조회(fetchone)와 같이 항목별 첫 번째 값 사용
+            stat_rows.setdefault((row["KIND"], row["TARGET_ITEM"]), row)
+        loc_info_j_scores = {
+            target_item: row["J_SCORE_NON_OUTLIERS"]
+            for (kind, target_item), row in stat_rows.items() if kind == "loc_info"
+        }
+        district_move_pop = stat_rows.get(("district_move_pop", "move_pop"), {}).get("AVG_VAL")
+        mz_j_score = stat_rows.get(("mz", None), {}).get("J_SCORE_NON_OUTLIERS")
+
+        # 3. 성별 최신 인구 분포
+        population_query = """
+            SELECT 
+                p.GENDER_ID,
+                p.AGE_UNDER_10s, p.AGE_10s, p.AGE_20s, p.AGE_30s, p.AGE_40s, p.AGE_50s, p.AGE_PLUS_60s, p.REF_DATE
+            FROM population_age p
+            WHERE p.SUB_DISTRICT_ID = %s AND p.GENDER_ID IN (1, 2)
+            AND p.REF_DATE = (
+                SELECT MAX(p2.REF_DATE) FROM population_age p2
+                WHERE p2.SUB_DISTRICT_ID = p.SUB_DISTRICT_ID AND p2.GENDER_ID = p.GENDER_ID
+            );
+        """
+        cursor.execute(population_query, (sub_district_id,))
+        population = {}
+        for row in cursor.fetchall():
+            population.setdefault(row["GENDER_ID"], row)
 
-        cursor.execute(select_query, (sub_district_id, loc_info_ref_date))
-        row = cursor.fetchone()
+        # 4. 해당 동/소분류 상권 정보 (TOP 메뉴 + 기준 날짜 상권 값)
+        commercial_query = """
+            SELECT
+                Y_M,
+                TOP_MENU_1, TOP_MENU_2, TOP_MENU_3, TOP_MENU_4, TOP_MENU_5,
+                SUB_DISTRICT_DENSITY, MARKET_SIZE, AVERAGE_SALES, AVERAGE_PAYMENT, USAGE_COUNT,
+                AVG_PROFIT_PER_MON, AVG_PROFIT_PER_TUE, AVG_PROFIT_PER_WED, AVG_PROFIT_PER_THU,
+                AVG_PROFIT_PER_FRI, AVG_PROFIT_PER_SAT, AVG_PROFIT_PER_SUN,
+                AVG_PROFIT_PER_06_09, AVG_PROFIT_PER_09_12, AVG_PROFIT_PER_12_15,
+                AVG_PROFIT_PER_15_18, AVG_PROFIT_PER_18_21, AVG_PROFIT_PER_21_24, AVG_PROFIT_PER_24_06,
+                AVG_CLIENT_PER_M_20, AVG_CLIENT_PER_M_30, AVG_CLIENT_PER_M_40, AVG_CLIENT_PER_M_50, AVG_CLIENT_PER_M_60,
+                AVG_CLIENT_PER_F_20, AVG_CLIENT_PER_F_30, AVG_CLIENT_PER_F_40, AVG_CLIENT_PER_F_50, AVG_CLIENT_PER_F_60
+            FROM COMMERCIAL_DISTRICT
+            WHERE SUB_DISTRICT_ID = %s AND BIZ_DETAIL_CATEGORY_ID = %s;
+        """
+        cursor.execute(commercial_query, (sub_district_id, rep_id))
+        commercial_rows = cursor.fetchall()
+        top_menu = commercial_rows[0] if commercial_rows else None
+        commercial = next(
+            (row for row in commercial_rows if row["Y_M"] == nice_biz_map_data_ref_date), None
+        )
+
+        # 5. 대분류 별 업소 수 (6개 한번에)
+        count_query = """
+            SELECT
+                BIZ_MAIN_CATEGORY_ID, COUNT(BIZ_MAIN_CATEGORY_ID) AS category_count
+            FROM COMMERCIAL_DISTRICT
+            WHERE SUB_DISTRICT_ID = %s AND Y_M = %s
+            AND BIZ_MAIN_CATEGORY_ID BETWEEN 1 AND 6
+            GROUP BY BIZ_MAIN_CATEGORY_ID;
+        """
+        cursor.execute(count_query, (sub_district_id, nice_biz_map_data_ref_date))
+        category_counts = {row["BIZ_MAIN_CATEGORY_ID"]: row["category_count"] for row in cursor.fetchall()}
+
+        # 6. 전국 상권 통계 (5개 테이블) + 상권 가중 평균 j_score
+        nation_parts = []
+        nation_params = []
+        for table_name in REPORT_NATION_COMMERCIAL_TABLES:
+            nation_parts.append(f"""
+                SELECT '{table_name}' AS TABLE_NAME, AVG_VAL, J_SCORE, NULL AS J_SCORE_AVG
+                FROM {table_name}
+                WHERE SUB_DISTRICT_ID = %s and BIZ_DETAIL_CATEGORY_ID = %s AND REF_DATE = %s
+            """)
+            nation_params.extend([sub_district_id, rep_id, nice_biz_map_data_ref_date])
+        if shared is None:
+            nation_parts.append("""
+                (
+                    SELECT 'commercial_district_weighted_average', NULL, NULL, J_SCORE_AVG
+                    FROM commercial_district_weighted_average
+                    WHERE BIZ_DETAIL_CATEGORY_ID = %s
+                    ORDER BY REF_DATE DESC
+                    LIMIT 1
+                )
+            """)
+            nation_params.append(rep_id)
+        cursor.execute(" UNION ALL ".join(nation_parts), nation_params)
+        nation_commercial = {}
+        for row in cursor.fetchall():
+            nation_commercial.setdefault(row["TABLE_NAME"], row)
+        if shared is not None and rep_id in shared["weighted_averages"]:
+            nation_commercial["commercial_district_weighted_average"] = {
+                "J_SCORE_AVG": shared["weighted_averages"][rep_id]
+            }
 
-        if row:
-            return (
-                row["MOVE_POP"],
-                row["SALES"]
+        # 7. 순위 목록 (시/군/구 매출 TOP5, 전국/동 뜨는 업종, 핫플레이스 TOP5) + 이름
+        ranking_parts = ["""
+            (
+                SELECT 
+                    'top_sales' AS KIND, cd.AVERAGE_SALES AS SORT_VAL,
+                    NULL AS DISTRICT_NAME, sd.SUB_DISTRICT_NAME, NULL AS CATEGORY_NAME,
+                    cd.AVERAGE_SALES, NULL AS GROWTH_RATE, NULL AS J_SCORE_NON_OUTLIERS,
+                    NULL AS MOVE_POP, NULL AS SALES
+                FROM commercial_district cd
+                LEFT JOIN SUB_DISTRICT sd ON cd.SUB_DISTRICT_ID = sd.SUB_DISTRICT_ID
+                WHERE cd.district_id = %s and cd.Y_M = %s and cd.biz_detail_category_id = %s
+                ORDER BY cd.AVERAGE_SALES DESC
+                LIMIT 5
             )
-        else:
-            return (None)
+        """, """
+            (
+                SELECT 
+                    'local_rising', TO_DAYS(rb.Y_M),
+                    d.DISTRICT_NAME, sd.SUB_DISTRICT_NAME, bdc.BIZ_DETAIL_CATEGORY_NAME,
+                    NULL, rb.GROWTH_RATE, NULL, NULL, NULL
+                FROM rising_business rb
+                LEFT JOIN DISTRICT d ON rb.DISTRICT_ID = d.DISTRICT_ID
+                LEFT JOIN SUB_DISTRICT sd ON rb.SUB_DISTRICT_ID = sd.SUB_DISTRICT_ID
+                LEFT JOIN BIZ_DETAIL_CATEGORY bdc ON rb.BIZ_DETAIL_CATEGORY_ID = bdc.BIZ_DETAIL_CATEGORY_ID
+                WHERE rb.SUB_DISTRICT_ID = %s
+                ORDER BY rb.Y_M DESC
+                LIMIT 3
+            )
+        """, """
+            (
+                SELECT 
+                    'hot_place', lis.J_SCORE_NON_OUTLIERS,
+                    NULL, sd.SUB_DISTRICT_NAME, NULL,
+                    NULL, NULL, lis.J_SCORE_NON_OUTLIERS,
+                    (SELECT li.MOVE_POP FROM LOC_INFO li WHERE li.SUB_DISTRICT_ID = lis.SUB_DISTRICT_ID AND li.Y_M = %s LIMIT 1),
+                    (SELECT li.SALES FROM LOC_INFO li WHERE li.SUB_DISTRICT_ID = lis.SUB_DISTRICT_ID AND li.Y_M = %s LIMIT 1)
+                FROM loc_info_statistics lis
+                LEFT JOIN SUB_DISTRICT sd ON lis.SUB_DISTRICT_ID = sd.SUB_DISTRICT_ID
+                WHERE lis.DISTRICT_ID = %s
+                AND lis.ref_date = %s
+                AND lis.J_SCORE_NON_OUTLIERS < 10
+                AND lis.STAT_LEVEL = '전국'
+                AND lis.TARGET_ITEM = 'j_score_avg'
+                ORDER BY lis.J_SCORE_NON_OUTLIERS DESC
+                LIMIT 5
+            )
+        """]
+        ranking_params = [
+            district_id, nice_biz_map_data_ref_date, rep_id,
+            sub_district_id,
+            loc_info_ref_date, loc_info_ref_date, district_id, loc_info_ref_date,
+        ]
+        if shared is None:
+            ranking_parts.append(f"({REPORT_NATION_RISING_QUERY})")
+        cursor.execute(" UNION ALL ".join(ranking_parts), ranking_params)
+        rankings = {"top_sales": [], "nation_rising": [], "local_rising": [], "hot_place": []}
+        for row in cursor.fetchall():
+            rankings[row["KIND"]].append(row)
+        if shared is not None:
+            rankings["nation_rising"] = list(shared["nation_rising"])
+        # UNION 결과 순서는 보장되지 않으므로 각 목록의 정렬 기준으로 다시 정렬
+        for rows in rankings.values():
+            rows.sort(key=lambda row: row["SORT_VAL"] if row["SORT_VAL"] is not None else float("-inf"), reverse=True)
+
+        return {
+            "store": store,
+            "loc_info_j_scores": loc_info_j_scores,
+            "district_move_pop": district_move_pop,
+            "mz_j_score": mz_j_score,
+            "population": population,
+            "top_menu": top_menu,
+            "commercial": commercial,
+            "category_counts": category_counts,
+            "nation_commercial": nation_commercial,
+            "rankings": rankings,
+        }
+
     finally:
         if cursor:
             cursor.close()
         connection.close()
 
 
+# REPORT 테이블 컬럼 (insert_into_report 인자 순서와 동일)
+REPORT_COLUMNS = (
+    "STORE_BUSINESS_NUMBER",
+    "CITY_NAME",
+    "DISTRICT_NAME",
+    "SUB_DISTRICT_NAME",
+
+    "DETAIL_CATEGORY_NAME",
+    "STORE_NAME",
+    "ROAD_NAME",
+    "LATITUDE",
+    "LONGITUDE",
+    "BUSINESS_AREA_CATEGORY_ID",
+    "BIZ_DETAIL_CATEGORY_REP_NAME",
+    "BIZ_MAIN_CATEGORY_ID",
+    "BIZ_SUB_CATEGORY_ID",
+
+    "DETAIL_CATEGORY_TOP1_ORDERED_MENU",
+    "DETAIL_CATEGORY_TOP2_ORDERED_MENU",
+    "DETAIL_CATEGORY_TOP3_ORDERED_MENU",
+    "DETAIL_CATEGORY_TOP4_ORDERED_MENU",
+    "DETAIL_CATEGORY_TOP5_ORDERED_MENU",
+
+    "LOC_INFO_J_SCORE_AVERAGE",
+
+    "POPULATION_TOTAL",
+    "POPULATION_MALE_PERCENT",
+    "POPULATION_FEMALE_PERCENT",
+    "POPULATION_AGE_10_UNDER",
+    "POPULATION_AGE_10S",
+    "POPULATION_AGE_20S",
+    "POPULATION_AGE_30S",
+    "POPULATION_AGE_40S",
+    "POPULATION_AGE_50S",
+    "POPULATION_AGE_60_OVER",
+
+    "LOC_INFO_RESIDENT_K",
+    "LOC_INFO_WORK_POP_K",
+    "LOC_INFO_MOVE_POP_K",
+    "LOC_INFO_SHOP_K",
+    "LOC_INFO_AVERAGE_SALES_K",
+    "LOC_INFO_AVERAGE_SPEND_K",
+    "LOC_INFO_HOUSE_K",
+    "LOC_INFO_INCOME_WON",
+
+    "LOC_INFO_RESIDENT_J_SCORE",
+    "LOC_INFO_WORK_POP_J_SCORE",
+    "LOC_INFO_MOVE_POP_J_SCORE",
+    "LOC_INFO_SHOP_J_SCORE",
+    "LOC_INFO_INCOME_J_SCORE",
+    "LOC_INFO_MZ_POPULATION_J_SCORE",
+    "LOC_INFO_AVERAGE_SPEND_J_SCORE",
+    "LOC_INFO_AVERAGE_SALES_J_SCORE",
+    "LOC_INFO_HOUSE_J_SCORE",
+
+    "LOC_INFO_RESIDENT",
+    "LOC_INFO_WORK_POP",
+    "LOC_INFO_RESIDENT_PERCENT",
+    "LOC_INFO_WORK_POP_PERCENT",
+
+    "LOC_INFO_MOVE_POP",
+    "LOC_INFO_CITY_MOVE_POP",
+
+    "COMMERCIAL_DISTRICT_J_SCORE_AVERAGE",
+
+    "COMMERCIAL_DISTRICT_FOOD_BUSINESS_COUNT",
+    "COMMERCIAL_DISTRICT_HEALTHCARE_BUSINESS_COUNT",
+    "COMMERCIAL_DISTRICT_EDUCATION_BUSINESS_COUNT",
+    "COMMERCIAL_DISTRICT_ENTERTAINMENT_BUSINESS_COUNT",
+    "COMMERCIAL_DISTRICT_LIFESTYLE_BUSINESS_COUNT",
+    "COMMERCIAL_DISTRICT_RETAIL_BUSINESS_COUNT",
+
+    "COMMERCIAL_DISTRICT_NATIONAL_MARKET_SIZE",
+    "COMMERCIAL_DISTRICT_SUB_DISTRICT_MARKET_SIZE",
+    "COMMERCIAL_DISTRICT_NATIONAL_DENSITY_AVERAGE",
+    "COMMERCIAL_DISTRICT_SUB_DISTRICT_DENSITY_AVERAGE",
+    "COMMERCIAL_DISTRICT_NATIONAL_AVERAGE_SALES",
+    "COMMERCIAL_DISTRICT_SUB_DISTRICT_AVERAGE_SALES",
+    "COMMERCIAL_DISTRICT_NATIONAL_AVERAGE_PAYMENT",
+    "COMMERCIAL_DISTRICT_SUB_DISTRICT_AVERAGE_PAYMENT",
+    "COMMERCIAL_DISTRICT_NATIONAL_USAGE_COUNT",
+    "COMMERCIAL_DISTRICT_SUB_DISTRICT_USAGE_COUNT",
+
+    "COMMERCIAL_DISTRICT_MARKET_SIZE_J_SCORE",
+    "COMMERCIAL_DISTRICT_AVERAGE_SALES_J_SCORE",
+    "COMMERCIAL_DISTRICT_USAGE_COUNT_J_SCORE",
+    "COMMERCIAL_DISTRICT_SUB_DISTRICT_DENSITY_J_SCORE",
+    "COMMERCIAL_DISTRICT_AVERAGE_PAYMENT_J_SCORE",
+
+    "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_MON",
+    "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_TUE",
+    "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_WED",
+    "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_THU",
+    "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_FRI",
+    "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_SAT",
+    "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_SUN",
+    "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_06_09",
+    "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_09_12",
+    "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_12_15",
+    "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_15_18",
+    "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_18_21",
+    "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_21_24",
+
+    "COMMERCIAL_DISTRICT_AVG_CLIENT_PER_M_20S",
+    "COMMERCIAL_DISTRICT_AVG_CLIENT_PER_M_30S",
+    "COMMERCIAL_DISTRICT_AVG_CLIENT_PER_M_40S",
+    "COMMERCIAL_DISTRICT_AVG_CLIENT_PER_M_50S",
+    "COMMERCIAL_DISTRICT_AVG_CLIENT_PER_M_60_OVER",
+
+    "COMMERCIAL_DISTRICT_AVG_CLIENT_PER_F_20S",
+    "COMMERCIAL_DISTRICT_AVG_CLIENT_PER_F_30S",
+    "COMMERCIAL_DISTRICT_AVG_CLIENT_PER_F_40S",
+    "COMMERCIAL_DISTRICT_AVG_CLIENT_PER_F_50S",
+    "COMMERCIAL_DISTRICT_AVG_CLIENT_PER_F_60_OVER",
+
+    "COMMERCIAL_DISTRICT_DETAIL_CATEGORY_AVERAGE_SALES_TOP1_INFO",
+    "COMMERCIAL_DISTRICT_DETAIL_CATEGORY_AVERAGE_SALES_TOP2_INFO",
+    "COMMERCIAL_DISTRICT_DETAIL_CATEGORY_AVERAGE_SALES_TOP3_INFO",
+    "COMMERCIAL_DISTRICT_DETAIL_CATEGORY_AVERAGE_SALES_TOP4_INFO",
+    "COMMERCIAL_DISTRICT_DETAIL_CATEGORY_AVERAGE_SALES_TOP5_INFO",
+
+    "RISING_BUSINESS_NATIONAL_RISING_SALES_TOP1_INFO",
+    "RISING_BUSINESS_NATIONAL_RISING_SALES_TOP2_INFO",
+    "RISING_BUSINESS_NATIONAL_RISING_SALES_TOP3_INFO",
+    "RISING_BUSINESS_NATIONAL_RISING_SALES_TOP4_INFO",
+    "RISING_BUSINESS_NATIONAL_RISING_SALES_TOP5_INFO",
+
+    "RISING_BUSINESS_SUB_DISTRICT_RISING_SALES_TOP1_INFO",
+    "RISING_BUSINESS_SUB_DISTRICT_RISING_SALES_TOP2_INFO",
+    "RISING_BUSINESS_SUB_DISTRICT_RISING_SALES_TOP3_INFO",
+
+    "LOC_INFO_DISTRICT_HOT_PLACE_TOP1_INFO",
+    "LOC_INFO_DISTRICT_HOT_PLACE_TOP2_INFO",
+    "LOC_INFO_DISTRICT_HOT_PLACE_TOP3_INFO",
+    "LOC_INFO_DISTRICT_HOT_PLACE_TOP4_INFO",
+    "LOC_INFO_DISTRICT_HOT_PLACE_TOP5_INFO",
+
+    "LOC_INFO_DATA_REF_DATE",
+    "NICE_BIZ_MAP_DATA_REF_DATE",
+    "POPULATION_DATA_REF_DATE",
+)
+
+
+def _build_report_insert_query(row_count=1):
+    """REPORT INSERT 쿼리 (row_count 개의 VALUES 를 한 번에)"""
+    placeholders = "(" + ", ".join(["%s"] * len(REPORT_COLUMNS)) + ")"
+    return (
+        f"INSERT INTO REPORT ({', '.join(REPORT_COLUMNS)}) VALUES "
+        + ", ".join([placeholders] * row_count)
+    )
+
+
 def insert_into_report(
     store_business_number, city_name, district_name, sub_district_name,
     small_category_name, store_name, road_name, latitude, longitude, business_area_category_id, biz_detail_category_name, biz_main_category_id, biz_sub_category_id,
@@ -1104,176 +1745,7 @@ def insert_into_report(
     cursor = connection.cursor()
 
     try:
-        insert_query = """
-            INSERT INTO REPORT (
-                STORE_BUSINESS_NUMBER,
-                CITY_NAME,
-                DISTRICT_NAME,
-                SUB_DISTRICT_NAME,
-
-                DETAIL_CATEGORY_NAME,
-                STORE_NAME,
-                ROAD_NAME,
-                LATITUDE,
-                LONGITUDE,
-                BUSINESS_AREA_CATEGORY_ID,
-                BIZ_DETAIL_CATEGORY_REP_NAME,
-                BIZ_MAIN_CATEGORY_ID,
-                BIZ_SUB_CATEGORY_ID,
-
-                DETAIL_CATEGORY_TOP1_ORDERED_MENU,
-                DETAIL_CATEGORY_TOP2_ORDERED_MENU,
-                DETAIL_CATEGORY_TOP3_ORDERED_MENU,
-                DETAIL_CATEGORY_TOP4_ORDERED_MENU,
-                DETAIL_CATEGORY_TOP5_ORDERED_MENU,
-
-                LOC_INFO_J_SCORE_AVERAGE,
-
-                POPULATION_TOTAL, 
-                POPULATION_MALE_PERCENT,
-                POPULATION_FEMALE_PERCENT,
-                POPULATION_AGE_10_UNDER,
-                POPULATION_AGE_10S,
-                POPULATION_AGE_20S,
-                POPULATION_AGE_30S,
-                POPULATION_AGE_40S,
-                POPULATION_AGE_50S,
-                POPULATION_AGE_60_OVER,
-
-                LOC_INFO_RESIDENT_K,
-                LOC_INFO_WORK_POP_K,
-                LOC_INFO_MOVE_POP_K,
-                LOC_INFO_SHOP_K,
-                LOC_INFO_AVERAGE_SALES_K,
-                LOC_INFO_AVERAGE_SPEND_K,
-                LOC_INFO_HOUSE_K,
-                LOC_INFO_INCOME_WON,
-
-                LOC_INFO_RESIDENT_J_SCORE,
-                LOC_INFO_WORK_POP_J_SCORE,
-                LOC_INFO_MOVE_POP_J_SCORE,
-                LOC_INFO_SHOP_J_SCORE,
-                LOC_INFO_INCOME_J_SCORE,
-                LOC_INFO_MZ_POPULATION_J_SCORE,
-                LOC_INFO_AVERAGE_SPEND_J_SCORE,
-                LOC_INFO_AVERAGE_SALES_J_SCORE,
-                LOC_INFO_HOUSE_J_SCORE,
-
-                LOC_INFO_RESIDENT, 
-                LOC_INFO_WORK_POP,
-                LOC_INFO_RESIDENT_PERCENT,
-                LOC_INFO_WORK_POP_PERCENT,
-
-                LOC_INFO_MOVE_POP,
-                LOC_INFO_CITY_MOVE_POP,
-
-                COMMERCIAL_DISTRICT_J_SCORE_AVERAGE,
-
-                COMMERCIAL_DISTRICT_FOOD_BUSINESS_COUNT,
-                COMMERCIAL_DISTRICT_HEALTHCARE_BUSINESS_COUNT,
-                COMMERCIAL_DISTRICT_EDUCATION_BUSINESS_COUNT,
-                COMMERCIAL_DISTRICT_ENTERTAINMENT_BUSINESS_COUNT,
-                COMMERCIAL_DISTRICT_LIFESTYLE_BUSINESS_COUNT,
-                COMMERCIAL_DISTRICT_RETAIL_BUSINESS_COUNT,
-
-                COMMERCIAL_DISTRICT_NATIONAL_MARKET_SIZE,
-                COMMERCIAL_DISTRICT_SUB_DISTRICT_MARKET_SIZE,
-                COMMERCIAL_DISTRICT_NATIONAL_DENSITY_AVERAGE,
-                COMMERCIAL_DISTRICT_SUB_DISTRICT_DENSITY_AVERAGE,
-                COMMERCIAL_DISTRICT_NATIONAL_AVERAGE_SALES,
-                COMMERCIAL_DISTRICT_SUB_DISTRICT_AVERAGE_SALES,
-                COMMERCIAL_DISTRICT_NATIONAL_AVERAGE_PAYMENT,
-                COMMERCIAL_DISTRICT_SUB_DISTRICT_AVERAGE_PAYMENT,
-                COMMERCIAL_DISTRICT_NATIONAL_USAGE_COUNT,
-                COMMERCIAL_DISTRICT_SUB_DISTRICT_USAGE_COUNT,
-
-                COMMERCIAL_DISTRICT_MARKET_SIZE_J_SCORE,
-                COMMERCIAL_DISTRICT_AVERAGE_SALES_J_SCORE,
-                COMMERCIAL_DISTRICT_USAGE_COUNT_J_SCORE,
-                COMMERCIAL_DISTRICT_SUB_DISTRICT_DENSITY_J_SCORE,
-                COMMERCIAL_DISTRICT_AVERAGE_PAYMENT_J_SCORE,
-
-                COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_MON,
-                COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_TUE,
-                COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_WED,
-                COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_THU,
-                COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_FRI,
-                COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_SAT,
-                COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_SUN,
-                COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_06_09,
-                COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_09_12,
-                COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_12_15,
-                COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_15_18,
-                COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_18_21,
-                COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_21_24,
-
-                COMMERCIAL_DISTRICT_AVG_CLIENT_PER_M_20S,
-                COMMERCIAL_DISTRICT_AVG_CLIENT_PER_M_30S,
-                COMMERCIAL_DISTRICT_AVG_CLIENT_PER_M_40S,
-                COMMERCIAL_DISTRICT_AVG_CLIENT_PER_M_50S,
-                COMMERCIAL_DISTRICT_AVG_CLIENT_PER_M_60_OVER,
-
-                COMMERCIAL_DISTRICT_AVG_CLIENT_PER_F_20S,
-                COMMERCIAL_DISTRICT_AVG_CLIENT_PER_F_30S,
-                COMMERCIAL_DISTRICT_AVG_CLIENT_PER_F_40S,
-                COMMERCIAL_DISTRICT_AVG_CLIENT_PER_F_50S,
-                COMMERCIAL_DISTRICT_AVG_CLIENT_PER_F_60_OVER,
-
-                COMMERCIAL_DISTRICT_DETAIL_CATEGORY_AVERAGE_SALES_TOP1_INFO,
-                COMMERCIAL_DISTRICT_DETAIL_CATEGORY_AVERAGE_SALES_TOP2_INFO,
-                COMMERCIAL_DISTRICT_DETAIL_CATEGORY_AVERAGE_SALES_TOP3_INFO,
-                COMMERCIAL_DISTRICT_DETAIL_CATEGORY_AVERAGE_SALES_TOP4_INFO,
-                COMMERCIAL_DISTRICT_DETAIL_CATEGORY_AVERAGE_SALES_TOP5_INFO,
-
-                RISING_BUSINESS_NATIONAL_RISING_SALES_TOP1_INFO,
-                RISING_BUSINESS_NATIONAL_RISING_SALES_TOP2_INFO,
-                RISING_BUSINESS_NATIONAL_RISING_SALES_TOP3_INFO,
-                RISING_BUSINESS_NATIONAL_RISING_SALES_TOP4_INFO,
-                RISING_BUSINESS_NATIONAL_RISING_SALES_TOP5_INFO,
-
-                RISING_BUSINESS_SUB_DISTRICT_RISING_SALES_TOP1_INFO,
-                RISING_BUSINESS_SUB_DISTRICT_RISING_SALES_TOP2_INFO,
-                RISING_BUSINESS_SUB_DISTRICT_RISING_SALES_TOP3_INFO,
-
-                LOC_INFO_DISTRICT_HOT_PLACE_TOP1_INFO,
-                LOC_INFO_DISTRICT_HOT_PLACE_TOP2_INFO,
-                LOC_INFO_DISTRICT_HOT_PLACE_TOP3_INFO,
-                LOC_INFO_DISTRICT_HOT_PLACE_TOP4_INFO,
-                LOC_INFO_DISTRICT_HOT_PLACE_TOP5_INFO,
-
-                LOC_INFO_DATA_REF_DATE,
-                NICE_BIZ_MAP_DATA_REF_DATE,
-                POPULATION_DATA_REF_DATE
-
-                
-            )
-            VALUES (
-                %s, %s, %s, %s,                             
-                %s, %s, %s, %s, %s, %s, %s, %s, %s,         
-                %s, %s, %s, %s, %s,                         
-                %s,                                         
-                %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,     
-                %s, %s, %s, %s, %s, %s, %s, %s,             
-                %s, %s, %s, %s, %s,                      
-                %s, %s, %s, %s,     
-                %s, %s, %s, %s,     
-                %s, %s,             
-                %s,         
-                %s, %s, %s, %s, %s, %s,
-                %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-                %s, %s, %s, %s, %s,
-                %s, %s, %s, %s, %s, %s, %s,
-                %s, %s, %s, %s, %s, %s,
-                %s, %s, %s, %s, %s,
-                %s, %s, %s, %s, %s,
-                %s, %s, %s, %s, %s,
-                %s, %s, %s, %s, %s,
-                %s, %s, %s,
-                %s, %s, %s, %s, %s,
-                %s, %s, %s
-                  
-            );
-        """
+        insert_query = _build_report_insert_query()
 
         cursor.execute(insert_query, (
             store_business_number, city_name, district_name, sub_district_name,
@@ -1317,3 +1789,39 @@ def insert_into_report(
         connection.close()
 
 
+# 대량 재생성용 REPORT 저장
+# REPORT 의 STORE_BUSINESS_NUMBER 에 유니크 키가 보장되지 않아 UPSERT 대신
+# 같은 트랜잭션 안에서 기존 행 삭제 후 multi-row INSERT 로 교체한다.
+def replace_reports(rows, chunk_size=200):
+    if not rows:
+        return 0
+
+    connection = get_re_db_connection()
+    cursor = connection.cursor()
+
+    try:
+        store_business_numbers = [row[0] for row in rows]
+        for start in range(0, len(store_business_numbers), chunk_size):
+            chunk = store_business_numbers[start:start + chunk_size]
+            cursor.execute(
+                f"DELETE FROM REPORT WHERE STORE_BUSINESS_NUMBER IN ({', '.join(['%s'] * len(chunk))})",
+                chunk,
+            )
+
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            params = [value for row in chunk for value in row]
+            cursor.execute(_build_report_insert_query(len(chunk)), params)
+
+        connection.commit()
+        return len(rows)
+
+    except Exception as e:
+        print("❌ 리포트 일괄 저장 중 오류 발생:", e)
+        connection.rollback()
+        raise
+
+    finally:
+        if cursor:
+            cursor.close()
+        connection.close()
@@ -8,6 +8,7 @@ from app.db.connect import (
     commit,
     rollback,
 )
+from app.db.async_connect import async_fetch_all, async_stream
 from app.schemas.population import Population, PopulationOutput, Population_by_ages, Population_by_gender, PopulationFindByFilter, PopulationDataDate
 from typing import List
 from mysql.connector.cursor import MySQLCursorDict
@@ -17,11 +18,8 @@ from fastapi import HTTPException
 
 logger = logging.getLogger(__name__)
 
-def download_data_ex(filters):
-    # 데이터베이스 연결
-    connection = get_db_connection()
-    cursor = None
-
+def build_download_query(filters):
+    """엑셀 다운로드 쿼리와 파라미터 생성"""
     # 연령대에 따른 나이 범위 매핑
     age_groups = {
         "age_under_10": range(0, 10),
@@ -33,89 +31,93 @@ def download_data_ex(filters):
         "age_60_plus": range(60, 111),  # 60세 이상은 60세부터 110세까지 포함
     }
 
-    try:
-        # 기본 쿼리 시작
-        query = """
-            SELECT
-                city.city_name,
-                district.district_name,
-                sub_district.sub_district_name,
-                p.male_population,
-                p.female_population,
-                p.reference_date,
-                gender.gender_name
-        """
-
-        # 나이 컬럼들을 동적으로 선택
-        age_columns = []
+    # 기본 쿼리 시작
+    query = """
+        SELECT
+            city.city_name,
+            district.district_name,
+            sub_district.sub_district_name,
+            p.male_population,
+            p.female_population,
+            p.reference_date,
+            gender.gender_name
+    """
 
-        if filters.get("ageGroupMin") or filters.get("ageGroupMax"):
-            # ageGroupMin 및 ageGroupMax 처리
-            if filters.get("ageGroupMin"):
-                min_age_range = age_groups[filters["ageGroupMin"]]
-            else:
-                min_age_range = age_groups["age_under_10"]
+    # 나이 컬럼들을 동적으로 선택
+    age_columns = []
 
-            if filters.get("ageGroupMax"):
-                max_age_range = age_groups[filters["ageGroupMax"]]
-            else:
-                max_age_range = age_groups["age_60_plus"]
+    if filters.get("ageGroupMin") or filters.get("ageGroupMax"):
+        # ageGroupMin 및 ageGroupMax 처리
+        if filters.get("ageGroupMin"):
+            min_age_range = age_groups[filters["ageGroupMin"]]
+        else:
+            min_age_range = age_groups["age_under_10"]
 
-            # 최소 나이부터 최대 나이까지의 범위에 해당하는 컬럼을 동적으로 생성
-            min_age = min(min_age_range)
-            max_age = max(max_age_range)
-            # print(min_age, max_age)
+        if filters.get("ageGroupMax"):
+            max_age_range = age_groups[filters["ageGroupMax"]]
+        else:
+            max_age_range = age_groups["age_60_plus"]
 
-            # 선택된 나이 범위에 해당하는 모든 컬럼 추가
-            age_columns = [f"p.age_{i}" for i in range(min_age, min(max_age + 1, 110))]
+        # 최소 나이부터 최대 나이까지의 범위에 해당하는 컬럼을 동적으로 생성
+        min_age = min(min_age_range)
+        max_age = max(max_age_range)
+        # print(min_age, max_age)
 
-            if max_age >= 110:
-                age_columns.append("p.age_110_over")  # age_110_over 추가
+        # 선택된 나이 범위에 해당하는 모든 컬럼 추가
+        age_columns = [f"p.age_{i}" for i in range(min_age, min(max_age + 1, 110))]
 
-        else:
-            # 나이 필터가 없으면 모든 나이대 컬럼을 추가
-            age_columns = [f"p.age_{i}" for i in range(0, 110)]  # age_0 ~ age_109
+        if max_age >= 110:
             age_columns.append("p.age_110_over")  # age_110_over 추가
 
-        # 나이 컬럼을 쿼리에 추가
-        if age_columns:
-            query += ", " + ", ".join(age_columns)
+    else:
+        # 나이 필터가 없으면 모든 나이대 컬럼을 추가
+        age_columns = [f"p.age_{i}" for i in range(0, 110)]  # age_0 ~ age_109
+        age_columns.append("p.age_110_over")  # age_110_over 추가
+
+    # 나이 컬럼을 쿼리에 추가
+    if age_columns:
+        query += ", " + ", ".join(age_columns)
+
+    query += """
+        FROM population p
+        JOIN city ON p.city_id = city.city_id
+        JOIN district ON p.district_id = district.district_id
+        JOIN sub_district ON p.sub_district_id = sub_district.sub_district_id
+        JOIN gender ON p.gender_id = gender.gender_id
+        WHERE p.reference_date = '2024-07-31'
+    """
 
-        query += """
-            FROM population p
-            JOIN city ON p.city_id = city.city_id
-            JOIN district ON p.district_id = district.district_id
-            JOIN sub_district ON p.sub_district_id = sub_district.sub_district_id
-            JOIN gender ON p.gender_id = gender.gender_id
-            WHERE p.reference_date = '2024-07-31'
-        """
+    # 파라미터 목록 초기화
+    query_params = []
 
-        # 파라미터 목록 초기화
-        query_params = []
+    # 필터 값에 따라 동적 쿼리 추가
+    if filters.get("city"):
+        query += " AND p.city_id = %s"
+        query_params.append(filters["city"])
 
-        # 필터 값에 따라 동적 쿼리 추가
-        if filters.get("city"):
-            query += " AND p.city_id = %s"
-            query_params.append(filters["city"])
+    if filters.get("district"):
+        query += " AND p.district_id = %s"
+        query_params.append(filters["district"])
 
-        if filters.get("district"):
-            query += " AND p.district_id = %s"
-            query_params.append(filters["district"])
+    if filters.get("subDistrict"):
+        query += " AND p.sub_district_id = %s"
+        query_params.append(filters["subDistrict"])
 
-        if filters.get("subDistrict"):
-            query += " AND p.sub_district_id = %s"
-            query_params.append(filters["subDistrict"])
+    if filters.get("gender"):
+        query += " AND p.gender_id = %s"
+        query_params.append(filters["gender"])
 
-        if filters.get("gender"):
-            query += " AND p.gender_id = %s"
-            query_params.append(filters["gender"])
+    query += " ORDER BY city.city_name ASC, district.district_name ASC, sub_district.sub_district_name ASC"
 
-        query += " ORDER BY city.city_name ASC, district.district_name ASC, sub_district.sub_district_name ASC"
+    return query, query_params
 
-        # 쿼리 실행
-        cursor = connection.cursor()
-        cursor.execute(query, query_params)
-        result = cursor.fetchall()
+
+async def download_data_ex(filters):
+    try:
+        query, query_params = build_download_query(filters)
+
+        # 쿼리 실행 (비동기 풀, 튜플 결과)
+        result = await async_fetch_all(query, query_params, dict_cursor=False)
         # print(query)
         return result
 
@@ -123,10 +125,12 @@ def download_data_ex(filters):
         print(f"데이터베이스 조회 중 오류 발생: {e}")
         return None
 
-    finally:
-        if cursor:
-            cursor.close()
-        connection.close()
+
+async def stream_download_data_ex(filters):
+    """엑셀 다운로드용 - 서버 측 커서로 청크(튜플 list) 단위 조회"""
+    query, query_params = build_download_query(filters)
+    async for rows in async_stream(query, query_params, dict_cursor=False):
+        yield rows
 
 
 def check_previous_month_data_exists(connection, previous_month):
@@ -155,10 +159,7 @@ def convert_decimal_to_float(data):
     return data
 
 
-def get_filtered_population_data(filters):
-    # 데이터베이스 연결
-    connection = get_db_connection()
-    cursor = None
+async def get_filtered_population_data(filters):
     results = []
     # print(filters)
     try:
@@ -241,10 +242,8 @@ def get_filtered_population_data(filters):
             query += " AND p.gender_id = %s"
             params.append(filters["gender"])
 
-        # 쿼리 실행
-        cursor = connection.cursor(pymysql.cursors.DictCursor)
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
+        # 쿼리 실행 (비동기 풀)
+        rows = await async_fetch_all(query, params)
 
         for row in rows:
             population_age = PopulationFindByFilter(
@@ -266,12 +265,9 @@ def get_filtered_population_data(filters):
         # print(results)
         return results
 
-    finally:
-        # 커서와 연결 닫기
-        if cursor:
-            cursor.close()
-        if connection:
-            connection.close()
+    except Exception as e:
+        logger.error(f"Error in get_filtered_population_data: {str(e)}")
+        raise
 
 
 
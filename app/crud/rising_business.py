@@ -8,6 +8,7 @@ from app.schemas.rising_business import (
     RisingBusinessDataDate,
     RisingBusinessOutput,
 )
+from app.core.responses import plain_row
 from app.db.connect import (
     get_db_connection,
     close_connection,
@@ -31,7 +32,7 @@ def select_all_rising_business_by_dynamic_query(
     rank_min: Optional[int] = None,
     rank_max: Optional[int] = None,
     y_m: Optional[date] = None,
-) -> List[RisingBusinessOutput]:
+) -> List[dict]:
     connection = get_db_connection()
     cursor = connection.cursor(pymysql.cursors.DictCursor)
     logger = logging.getLogger(__name__)
@@ -99,7 +100,8 @@ def select_all_rising_business_by_dynamic_query(
             rows = cursor.fetchall()
 
             for row in rows:
-                rising_business_ouput = RisingBusinessOutput(
+                rising_business_ouput = plain_row(
+                    RisingBusinessOutput,
                     rising_business_id=row.get("RISING_BUSINESS_ID"),
                     city_name=row.get("CITY_NAME"),
                     district_name=row.get("DISTRICT_NAME"),
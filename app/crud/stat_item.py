@@ -194,3 +194,63 @@ def select_stat_item_info_by_stat_item_id(stat_item_id: int) -> StatItemInfo:
     finally:
         close_cursor(cursor)
         close_connection(connection)
+
+
+def select_stat_item_info_by_stat_item_ids(stat_item_ids) -> dict:
+    """여러 stat_item_id 의 테이블/컬럼 정보를 한 번에 조회 {stat_item_id: StatItemInfo}"""
+    if not stat_item_ids:
+        return {}
+
+    connection = get_db_connection()
+    cursor = connection.cursor(pymysql.cursors.DictCursor)
+
+    try:
+        select_query = f"""
+            SELECT
+                STAT_ITEM_ID,
+                TABLE_NAME,
+                COLUMN_NAME,
+                DETAIL_CATEGORY_ID
+            FROM
+                STAT_ITEM
+            WHERE STAT_ITEM_ID IN ({", ".join(["%s"] * len(stat_item_ids))})
+        """
+        cursor.execute(select_query, list(stat_item_ids))
+
+        return {
+            row["STAT_ITEM_ID"]: StatItemInfo(
+                table_name=row["TABLE_NAME"],
+                column_name=row["COLUMN_NAME"],
+                biz_detail_category_id=row["DETAIL_CATEGORY_ID"],
+            )
+            for row in cursor.fetchall()
+        }
+
+    except Exception as e:
+        print(f"Error selecting from stat_item: {e}")
+        connection.rollback()
+        raise
+
+    finally:
+        close_cursor(cursor)
+        close_connection(connection)
+
+
+def select_commercial_stat_item_ids():
+    """상권 통계 항목(소분류가 지정된 stat_item) id 목록"""
+    connection = get_db_connection()
+    cursor = connection.cursor(pymysql.cursors.DictCursor)
+
+    try:
+        select_query = """
+            SELECT STAT_ITEM_ID
+            FROM STAT_ITEM
+            WHERE DETAIL_CATEGORY_ID > 0
+            ORDER BY STAT_ITEM_ID
+        """
+        cursor.execute(select_query)
+        return [row["STAT_ITEM_ID"] for row in cursor.fetchall()]
+
+    finally:
+        close_cursor(cursor)
+        close_connection(connection)
@@ -1,7 +1,11 @@
 import logging
 from typing import Dict, List, Optional
+import numpy as np
 import pymysql
 from app.db.connect import get_db_connection, close_connection, close_cursor
+from app.db.async_connect import get_async_db_connection, async_fetch_all
+from app.crud.loc_info_snapshot import get_loc_info_snapshots, find_first_loc_info, find_loc_info_rows
+from app.crud.dimension_cache import get_dimensions
 from app.schemas.commercial_district import CommercialStatisticsData
 from app.schemas.statistics import CommercialStatistics, StatisticsJscoreOutput
 
@@ -77,14 +81,11 @@ def select_state_item_id(table_name: str, column_name: str) -> int:
 
 ############### 값 조회 ######################
 # 전국 J-Score 값 조회
-def get_stat_data(filters_dict):
+async def get_stat_data(filters_dict):
     # print(filters_dict)
 
     # 여기서 직접 DB 연결을 설정
-    connection = get_db_connection()
-    cursor = None
-
-    try:
+    async with get_async_db_connection() as connection:
         query = """
             SELECT 
                    city.city_name AS city_name, 
@@ -111,26 +112,17 @@ def get_stat_data(filters_dict):
             query += " AND statistics.district_id = %s"
             query_params.append(filters_dict["district"])
 
-        cursor = connection.cursor(pymysql.cursors.DictCursor)
-        cursor.execute(query, query_params)
-        result = cursor.fetchall()
+        result = await async_fetch_all(query, query_params, connection)
 
         return result
 
-    finally:
-        if cursor:
-            cursor.close()
-        connection.close()  # 연결 종료
 
 # 시/도 내의 동 끼리 비교 J-Score 값 조회
-def get_stat_data_by_city(filters_dict):
+async def get_stat_data_by_city(filters_dict):
     # print(filters_dict)
 
     # 여기서 직접 DB 연결을 설정
-    connection = get_db_connection()
-    cursor = None
-
-    try:
+    async with get_async_db_connection() as connection:
         query = """
             SELECT 
                    city.city_name AS city_name, 
@@ -157,27 +149,18 @@ def get_stat_data_by_city(filters_dict):
             query += " AND statistics.district_id = %s"
             query_params.append(filters_dict["district"])
 
-        cursor = connection.cursor(pymysql.cursors.DictCursor)
-        cursor.execute(query, query_params)
-        result = cursor.fetchall()
+        result = await async_fetch_all(query, query_params, connection)
 
         return result
 
-    finally:
-        if cursor:
-            cursor.close()
-        connection.close()  # 연결 종료
     
 
 # 시/군/구 내의 동 끼리 비교 J-Score 값 조회
-def get_stat_data_by_distirct(filters_dict):
+async def get_stat_data_by_distirct(filters_dict):
     # print(filters_dict)
 
     # 여기서 직접 DB 연결을 설정
-    connection = get_db_connection()
-    cursor = None
-
-    try:
+    async with get_async_db_connection() as connection:
         query = """
             SELECT 
                    city.city_name AS city_name, 
@@ -204,16 +187,10 @@ def get_stat_data_by_distirct(filters_dict):
             query += " AND statistics.district_id = %s"
             query_params.append(filters_dict["district"])
 
-        cursor = connection.cursor(pymysql.cursors.DictCursor)
-        cursor.execute(query, query_params)
-        result = cursor.fetchall()
+        result = await async_fetch_all(query, query_params, connection)
 
         return result
 
-    finally:
-        if cursor:
-            cursor.close()
-        connection.close()  # 연결 종료
 
 
 ########## 모든 city_id 값 가져오기 ###################
@@ -398,6 +375,29 @@ def get_national_data():
             close_connection(connection)
 
 
+############## 전국 데이터를 시/도, 시/군/구 id 와 함께 가져오는 함수 ################
+def get_national_data_by_region():
+    """(city_id, district_id, resident) 목록 - 지역별 통계를 한 번에 계산할 때 사용"""
+    connection = None
+    cursor = None
+    try:
+        connection = get_db_connection()
+        cursor = connection.cursor()
+
+        query = """
+            SELECT city_id, district_id, resident
+            FROM loc_info
+        """
+        cursor.execute(query)
+        return list(cursor.fetchall())
+
+    finally:
+        if cursor:
+            close_cursor(cursor)
+        if connection:
+            close_connection(connection)
+
+
 def get_national_data_by_detail_category(column_name, table_name, detail_category_id):
     connection = None
     cursor = None
@@ -489,31 +489,36 @@ def get_city_district_data(city_id, district_id):
 ############## 읍면동 단위 모든 컬럼 정보 가져오기 ################
 # 컬럼 값 테이블에서 가져오는 함수
 def get_j_score_national_data(national_data):
+    """
+    national_data(city_id, district_id, sub_district_id) 순서대로 resident 값 반환
+    loc_info 를 한 번에 읽어서 붙이고, 데이터가 없는 읍/면/동은 0
+    """
     connection = get_db_connection()
     cursor = connection.cursor(pymysql.cursors.DictCursor)
 
     j_score_data = []
 
     try:
-        for city_id, district_id, sub_district_id in national_data:
-            query = """
-                SELECT resident
+        # 읍/면/동 별 첫 번째 loc_info 행
+        query = """
+            SELECT li.city_id, li.district_id, li.sub_district_id, li.resident
+            FROM loc_info li
+            JOIN (
+                SELECT MIN(loc_info_id) AS loc_info_id
                 FROM loc_info
-                WHERE city_id = %s AND district_id = %s AND sub_district_id = %s
-            """
-            cursor.execute(query, (city_id, district_id, sub_district_id))
-            result = cursor.fetchone()  # 해당 읍/면/동의 컬럼 데이터를 하나 가져옴
-
-            if result:
-
-                # 튜플 (city_id, district_id, sub_district_id, 컬럼)를 리스트에 추가
-                j_score_data.append(
-                    (city_id, district_id, sub_district_id, result["resident"])
-                )
+                GROUP BY city_id, district_id, sub_district_id
+            ) first_row ON li.loc_info_id = first_row.loc_info_id
+        """
+        cursor.execute(query)
+        values = {
+            (row["city_id"], row["district_id"], row["sub_district_id"]): row["resident"]
+            for row in cursor.fetchall()
+        }
 
-            else:
-                # 만약 데이터가 없는 경우 count를 0으로 설정
-                j_score_data.append((city_id, district_id, sub_district_id, 0))
+        j_score_data = [
+            (city_id, district_id, sub_district_id, values.get((city_id, district_id, sub_district_id), 0))
+            for city_id, district_id, sub_district_id in national_data
+        ]
 
     except Exception as e:
         print(f"Error fetching j_score national data: {e}")
@@ -758,37 +763,36 @@ def update_j_score_data_region(j_score_data_region):
 
 ######################## 전국 범위 동별 mz 세대 인구 값 가져오기 ##############################
 def get_j_score_national_data_mz(national_data):
+    """national_data 순서대로 mz 세대 인구 합계 반환 (GROUP BY 한 번, 데이터가 없으면 None)"""
     connection = get_db_connection()
     cursor = connection.cursor(pymysql.cursors.DictCursor)
 
     mz_population_data = []
 
     try:
-        for city_id, district_id, sub_district_id in national_data:
-            query = """
-                SELECT 
+        query = """
+            SELECT 
+                population.city_id, population.district_id, population.sub_district_id,
                 SUM(age_14 + age_15 + age_16 + age_17 + age_18 + 
                     age_19 + age_20 + age_21 + age_22 + age_23 + 
                     age_24 + age_25 + age_26 + age_27 + age_28 + age_29) AS mz_population
-                FROM population
-                JOIN city ON population.city_id = city.city_id
-                JOIN district ON population.district_id = district.district_id
-                LEFT JOIN sub_district ON population.sub_district_id = sub_district.sub_district_id
-                WHERE population.reference_date = '2024-07-31'
-                AND population.city_id = %s AND population.district_id = %s AND population.sub_district_id = %s
-            """
-            cursor.execute(query, (city_id, district_id, sub_district_id))
-            result = cursor.fetchone()  # 해당 읍/면/동의 컬럼 데이터를 하나 가져옴
-
-            if result:
-                # 튜플 (city_id, district_id, sub_district_id, 컬럼)를 리스트에 추가
-                mz_population_data.append(
-                    (city_id, district_id, sub_district_id, result["mz_population"])
-                )
+            FROM population
+            JOIN city ON population.city_id = city.city_id
+            JOIN district ON population.district_id = district.district_id
+            LEFT JOIN sub_district ON population.sub_district_id = sub_district.sub_district_id
+            WHERE population.reference_date = '2024-07-31'
+            GROUP BY population.city_id, population.district_id, population.sub_district_id
+        """
+        cursor.execute(query)
+        values = {
+            (row["city_id"], row["district_id"], row["sub_district_id"]): row["mz_population"]
+            for row in cursor.fetchall()
+        }
 
-            else:
-                # 만약 데이터가 없는 경우 count를 0으로 설정
-                mz_population_data.append((city_id, district_id, sub_district_id, 0))
+        mz_population_data = [
+            (city_id, district_id, sub_district_id, values.get((city_id, district_id, sub_district_id)))
+            for city_id, district_id, sub_district_id in national_data
+        ]
 
     except Exception as e:
         print(f"Error fetching j_score national data: {e}")
@@ -832,6 +836,34 @@ def get_national_data_mz_population():
             close_connection(connection)
 
 
+############ 전국 읍/면/동 별 mz 세대 인구 데이터를 시/도, 시/군/구 id 와 함께 가져오는 함수 ##############
+def get_national_data_mz_population_by_region():
+    """(city_id, district_id, mz_population) 목록 - 읍/면/동 별 합계"""
+    connection = None
+    cursor = None
+    try:
+        connection = get_db_connection()
+        cursor = connection.cursor()
+
+        query = """
+            SELECT 
+            city_id, district_id,
+            SUM(age_14 + age_15 + age_16 + age_17 + age_18 + 
+                    age_19 + age_20 + age_21 + age_22 + age_23 + 
+                    age_24 + age_25 + age_26 + age_27 + age_28 + age_29) AS mz_population
+            FROM population
+            group by city_id, district_id, sub_district_id
+        """
+        cursor.execute(query)
+        return list(cursor.fetchall())
+
+    finally:
+        if cursor:
+            close_cursor(cursor)
+        if connection:
+            close_connection(connection)
+
+
 ############ 특정 시/군/구의 mz 세대 인구 데이터를 가져오는 함수 ##############
 def get_city_district_data_mz_population(city_id, district_id):
     """
@@ -946,32 +978,18 @@ def get_weighted_jscore(sub_district_id):
 
 ########### 동별 주거 환경 ###########
 def get_living_env(sub_district_id):
-    # DB 연결 설정
-    connection = get_db_connection()
-    cursor = None
-
-    try:
-        # 쿼리 실행
-        query_statistics = """
-            SELECT 
-                city_name, district_name, sub_district_name,
-                work_pop, resident
-            FROM loc_info
-            JOIN city ON loc_info.city_id = city.city_id
-            JOIN district ON loc_info.district_id = district.district_id
-            JOIN sub_district ON loc_info.sub_district_id = sub_district.sub_district_id
-            WHERE loc_info.sub_district_id = %s
-        """
-        cursor = connection.cursor(pymysql.cursors.DictCursor)
-        cursor.execute(query_statistics, (sub_district_id,))
-        statistics_result = cursor.fetchone()
-
-        return statistics_result  # 딕셔너리가 아닌 쿼리 결과를 바로 반환
-
-    finally:
-        if cursor:
-            cursor.close()
-        connection.close()  # 연결 종료
+    # loc_info 스냅샷에서 조회
+    row = find_first_loc_info(sub_district_id, names=True)
+    if row is None:
+        return None
+
+    return {
+        "city_name": row["city_name"],
+        "district_name": row["district_name"],
+        "sub_district_name": row["sub_district_name"],
+        "work_pop": row["work_pop"],
+        "resident": row["resident"],
+    }
 
 
 ################ 인근 유동 인구 #####################
@@ -980,29 +998,30 @@ def get_move_pop_and_j_score(sub_district_id):
     cursor = None
 
     try:
-        # 첫 번째 쿼리: 이동 인구 정보
-        query_move_pop = """
-            SELECT 
-                city_name, district_name, sub_district_name,
-                move_pop, y_m
-            FROM loc_info
-            JOIN city ON loc_info.city_id = city.city_id
-            JOIN district ON loc_info.district_id = district.district_id
-            JOIN sub_district ON loc_info.sub_district_id = sub_district.sub_district_id
-            WHERE loc_info.sub_district_id = %s
-        """
+        # 이동 인구 정보 / 속한 시/도의 값은 loc_info 스냅샷에서 조회
+        move_pop_result = [
+            {
+                "city_name": row["city_name"],
+                "district_name": row["district_name"],
+                "sub_district_name": row["sub_district_name"],
+                "move_pop": row["move_pop"],
+                "y_m": row["y_m"],
+            }
+            for row in find_loc_info_rows(sub_district_id, names=True)
+        ]
 
-        # 두 번째 쿼리: 속한 시/도의 값 불러오기
-        query_move_pop_list = """
-            SELECT 
-                city.city_name, district.district_name, sub_district.sub_district_name,
-                loc_info.move_pop
-            FROM loc_info
-            JOIN city ON loc_info.city_id = city.city_id
-            JOIN district ON loc_info.district_id = district.district_id
-            JOIN sub_district ON loc_info.sub_district_id = sub_district.sub_district_id
-            WHERE loc_info.city_id = (SELECT sub_district.city_id FROM sub_district WHERE sub_district.sub_district_id = %s)
-        """
+        index = get_dimensions()
+        sub_district = index.sub_districts.get(sub_district_id) if index else None
+        move_pop_list = []
+        if sub_district:
+            for snapshot in get_loc_info_snapshots().values():
+                for row in snapshot.rows(snapshot.column("city_id") == sub_district[0], names=True):
+                    move_pop_list.append({
+                        "city_name": row["city_name"],
+                        "district_name": row["district_name"],
+                        "sub_district_name": row["sub_district_name"],
+                        "move_pop": row["move_pop"],
+                    })
 
         # 세 번째 쿼리: 시/도 통계 정보 정보
         query_stat_city = """
@@ -1026,17 +1045,8 @@ def get_move_pop_and_j_score(sub_district_id):
         """
         cursor = connection.cursor(pymysql.cursors.DictCursor)
 
-        # 첫 번째 쿼리 실행
-        cursor.execute(query_move_pop, (sub_district_id,))
-        move_pop_result = cursor.fetchall()
-
-        # 두 번째 쿼리 실행
-        cursor.execute(query_move_pop_list, (sub_district_id,))
-        move_pop_list = cursor.fetchall()
-
-        # 두 번째 쿼리 실행
-        cursor.execute(query_move_pop_list, (sub_district_id,))
-        move_pop_city_stat = cursor.fetchall()
+        # 기존과 같이 시/도 값 목록을 한 번 더 반환
+        move_pop_city_stat = list(move_pop_list)
 
         # 세 번째 쿼리 실행
         cursor.execute(query_stat_city, (sub_district_id,))
@@ -1101,40 +1111,32 @@ def select_nationwide_jscore_by_stat_item_id_and_sub_district_id(
 def get_j_score_national_data_by_detail_categroy_id(
     national_data, detail_category_id, stat_item_table_name, stat_item_column_name
 ):
+    """national_data 순서대로 소분류 컬럼 값 반환 (데이터가 없는 읍/면/동은 제외)"""
     connection = get_db_connection()
     cursor = connection.cursor(pymysql.cursors.DictCursor)
-    logger = logging.getLogger(__name__)
     j_score_data = []
 
     try:
-        for city_id, district_id, sub_district_id in national_data:
-            select_query = f"""
-                SELECT `{stat_item_column_name}`
-                FROM `{stat_item_table_name}`
-                WHERE city_id = %s AND district_id = %s AND sub_district_id = %s AND biz_detail_category_id = %s
-                ;
-            """
-            # logger.info(
-            #     f"Executing query: {select_query % (city_id, district_id, sub_district_id, detail_category_id)}"
-            # )
-
-            # 쿼리 실행: 숫자나 문자열 값은 매개변수로 전달
-            cursor.execute(
-                select_query,
-                (city_id, district_id, sub_district_id, detail_category_id),
+        select_query = f"""
+            SELECT city_id, district_id, sub_district_id, `{stat_item_column_name}`
+            FROM `{stat_item_table_name}`
+            WHERE biz_detail_category_id = %s
+            ;
+        """
+        cursor.execute(select_query, (detail_category_id,))
+
+        values = {}
+        for row in cursor.fetchall():
+            values.setdefault(
+                (row["city_id"], row["district_id"], row["sub_district_id"]),
+                row[stat_item_column_name],
             )
-            result = cursor.fetchone()  # 해당 읍/면/동의 컬럼 데이터를 하나 가져옴
-
-            if result:
-                # 튜플 (city_id, district_id, sub_district_id, 컬럼)를 리스트에 추가
-                j_score_data.append(
-                    (
-                        city_id,
-                        district_id,
-                        sub_district_id,
-                        result[stat_item_column_name],
-                    )
-                )
+
+        j_score_data = [
+            (city_id, district_id, sub_district_id, values[(city_id, district_id, sub_district_id)])
+            for city_id, district_id, sub_district_id in national_data
+            if (city_id, district_id, sub_district_id) in values
+        ]
 
     except Exception as e:
         print(f"Error fetching j_score national data: {e}")
@@ -1145,6 +1147,61 @@ def get_j_score_national_data_by_detail_categroy_id(
     return j_score_data  # j_score 데이터를 반환
 
 
+def get_j_score_national_matrix(national_data, stat_item_infos):
+    """
+    여러 통계 항목 값을 (읍/면/동 x 통계 항목) 행렬로 반환 - 테이블 하나당 쿼리 한 번
+    stat_item_infos : [(stat_item_id, StatItemInfo | None), ...] 순서가 행렬의 열 순서
+    데이터가 없는 칸은 NaN, 값이 NULL 이면 0
+    """
+    region_index = {region: row for row, region in enumerate(national_data)}
+    matrix = np.full((len(national_data), len(stat_item_infos)), np.nan)
+
+    # 테이블 별로 (소분류 id, 컬럼) -> 열 번호 묶기
+    tables = {}
+    for column, (_, info) in enumerate(stat_item_infos):
+        if info is None or not info.table_name or not info.column_name:
+            continue
+        tables.setdefault(info.table_name, {}).setdefault(
+            (info.biz_detail_category_id, info.column_name), []
+        ).append(column)
+
+    connection = get_db_connection()
+    cursor = connection.cursor(pymysql.cursors.DictCursor)
+
+    try:
+        for table_name, targets in tables.items():
+            detail_category_ids = sorted({detail_category_id for detail_category_id, _ in targets})
+            column_names = sorted({column_name for _, column_name in targets})
+
+            select_query = f"""
+                SELECT city_id, district_id, sub_district_id, biz_detail_category_id,
+                    {", ".join(f"`{column_name}`" for column_name in column_names)}
+                FROM `{table_name}`
+                WHERE biz_detail_category_id IN ({", ".join(["%s"] * len(detail_category_ids))})
+            """
+            cursor.execute(select_query, detail_category_ids)
+
+            filled = set()
+            for row in cursor.fetchall():
+                region_row = region_index.get((row["city_id"], row["district_id"], row["sub_district_id"]))
+                if region_row is None:
+                    continue
+                for column_name in column_names:
+                    key = (row["biz_detail_category_id"], column_name)
+                    # 읍/면/동 + 소분류 당 첫 번째 행만 사용
+                    if key not in targets or (region_row, key) in filled:
+                        continue
+                    filled.add((region_row, key))
+                    value = row[column_name]
+                    matrix[region_row, targets[key]] = float(value) if value is not None else 0.0
+
+    finally:
+        close_cursor(cursor)
+        close_connection(connection)
+
+    return matrix
+
+
 def select_statistics_data_by_sub_district_id_detail_category_id(
     sub_district_id: int, stat_item_id_list: List[Dict[str, str]]
 ) -> CommercialStatisticsData:
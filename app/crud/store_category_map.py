@@ -0,0 +1,153 @@
+import logging
+import os
+import re
+
+import pymysql
+from app.db.connect import get_db_connection
+from app.crud.dimension_cache import get_dimensions
+
+logger = logging.getLogger(__name__)
+
+# 매장 -> 업종(biz) 분류 매핑
+# local_store.small_category_code 하나에 연결된 biz 대/중/소분류를 기준 테이블 캐시(DimensionIndex.store_categories)에 두고
+# 매장 목록은 local_store 단일 테이블만 조회한 뒤 메모리에서 분류명 / 지역명을 붙인다.
+# STORE_CATEGORY_MAP_TABLE 이 지정돼 있으면 /dimension/refresh 때 같은 매핑을 테이블로도 저장 (리포트 / 외부 조회용)
+STORE_CATEGORY_MAP_TABLE = os.getenv("STORE_CATEGORY_MAP_TABLE", "")
+
+
+def get_store_category_map():
+    """기준 테이블 캐시 (매핑 포함) - 캐시를 쓸 수 없으면 None (호출하는 쪽은 기존 조인 쿼리 사용)"""
+    index = get_dimensions()
+    if index is None or not index.store_categories:
+        # 매핑이 비어 있으면 (매핑 추가 이전에 저장된 공유 파일 / 매핑 테이블 적재 전) 기존 쿼리로 처리
+        return None
+    return index
+
+
+def _matches(ids, main_id=None, sub_id=None, detail_id=None):
+    """대분류 -> 중분류 -> 소분류 순서로 지정된 조건만 비교 (필터 값은 문자열로 들어옴)"""
+    if main_id is None:
+        return True
+    if str(ids[0]) != str(main_id):
+        return False
+    if sub_id is None:
+        return True
+    if str(ids[1]) != str(sub_id):
+        return False
+    return detail_id is None or str(ids[2]) == str(detail_id)
+
+
+def category_filter(filters):
+    """필터의 업종 조건 (main, sub, detail) - 기존 쿼리처럼 상위 분류가 있어야 하위 분류 적용"""
+    main_id = filters.get("mainCategory") or None
+    sub_id = (filters.get("subCategory") or None) if main_id else None
+    detail_id = (filters.get("detailCategory") or None) if sub_id else None
+    return main_id, sub_id, detail_id
+
+
+def find_store_category_codes(index, main_id=None, sub_id=None, detail_id=None):
+    """업종 조건에 맞는 biz 분류가 하나라도 연결된 상권 소분류 코드 목록"""
+    return [
+        code
+        for code, categories in index.store_categories.items()
+        if any(_matches(ids, main_id, sub_id, detail_id) for ids in categories)
+    ]
+
+
+def decorate_store_rows(index, rows, filters):
+    """
+    local_store 단일 테이블 조회 결과에 지역명 / biz 분류명 추가
+    매장 하나에 매핑이 여러 개면 기존 조인처럼 매핑마다 한 행씩 (같은 분류명 조합은 한 번만)
+    """
+    main_id, sub_id, detail_id = category_filter(filters)
+    decorated = []
+
+    for row in rows:
+        city_id = row.pop("city_id")
+        district_id = row.pop("district_id")
+        sub_district_id = row.pop("sub_district_id")
+        code = row.pop("small_category_code")
+
+        district = index.districts.get(district_id)
+        sub_district = index.sub_districts.get(sub_district_id)
+        if city_id not in index.city_names or district is None or sub_district is None:
+            continue
+        row["city_name"] = index.city_names[city_id]
+        row["district_name"] = district[1]
+        row["sub_district_name"] = sub_district[2]
+
+        seen = set()
+        for ids in index.store_categories.get(code, ()):
+            if not _matches(ids, main_id, sub_id, detail_id):
+                continue
+            names = (
+                index.biz_main_names.get(ids[0]),
+                index.biz_subs[ids[1]][1] if ids[1] in index.biz_subs else None,
+                index.biz_details[ids[2]][1] if ids[2] in index.biz_details else None,
+            )
+            if names in seen:
+                continue
+            seen.add(names)
+            decorated.append({
+                **row,
+                "BIZ_MAIN_CATEGORY_NAME": names[0],
+                "BIZ_SUB_CATEGORY_NAME": names[1],
+                "BIZ_DETAIL_CATEGORY_NAME": names[2],
+            })
+
+    return decorated
+
+
+def refresh_store_category_map_table():
+    """STORE_CATEGORY_MAP_TABLE 이 지정된 경우 현재 매핑으로 테이블 재생성"""
+    if not STORE_CATEGORY_MAP_TABLE:
+        return
+    if not re.fullmatch(r"[A-Za-z0-9_]+", STORE_CATEGORY_MAP_TABLE):
+        logger.error(f"invalid STORE_CATEGORY_MAP_TABLE: {STORE_CATEGORY_MAP_TABLE}")
+        return
+
+    index = get_store_category_map()
+    if index is None:
+        return
+
+    rows = [
+        (
+            code, main_id, sub_id, detail_id,
+            index.biz_main_names.get(main_id),
+            index.biz_subs[sub_id][1] if sub_id in index.biz_subs else None,
+            index.biz_details[detail_id][1] if detail_id in index.biz_details else None,
+        )
+        for code, categories in index.store_categories.items()
+        for main_id, sub_id, detail_id in categories
+    ]
+
+    connection = get_db_connection()
+    cursor = connection.cursor(pymysql.cursors.DictCursor)
+    try:
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS `{STORE_CATEGORY_MAP_TABLE}` (
+                SMALL_CATEGORY_CODE VARCHAR(20) NOT NULL,
+                BIZ_MAIN_CATEGORY_ID INT NOT NULL,
+                BIZ_SUB_CATEGORY_ID INT NOT NULL,
+                BIZ_DETAIL_CATEGORY_ID INT NOT NULL,
+                BIZ_MAIN_CATEGORY_NAME VARCHAR(100),
+                BIZ_SUB_CATEGORY_NAME VARCHAR(100),
+                BIZ_DETAIL_CATEGORY_NAME VARCHAR(100),
+                PRIMARY KEY (SMALL_CATEGORY_CODE, BIZ_DETAIL_CATEGORY_ID)
+            );
+        """)
+        cursor.execute(f"DELETE FROM `{STORE_CATEGORY_MAP_TABLE}`;")
+        cursor.executemany(f"""
+            INSERT INTO `{STORE_CATEGORY_MAP_TABLE}` (
+                SMALL_CATEGORY_CODE, BIZ_MAIN_CATEGORY_ID, BIZ_SUB_CATEGORY_ID, BIZ_DETAIL_CATEGORY_ID,
+                BIZ_MAIN_CATEGORY_NAME, BIZ_SUB_CATEGORY_NAME, BIZ_DETAIL_CATEGORY_NAME
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s);
+        """, rows)
+        connection.commit()
+    except pymysql.Error as e:
+        connection.rollback()
+        logger.error(f"store category map table refresh failed: {e}")
+    finally:
+        if cursor:
+            cursor.close()
+        connection.close()
@@ -0,0 +1,251 @@
+import logging
+import os
+import threading
+import time
+from array import array
+
+import pymysql
+from app.db.connect import get_db_connection
+from app.crud.dimension_cache import get_dimensions
+
+logger = logging.getLogger(__name__)
+
+# 매장명 포함 검색용 n-gram 역색인 (시/군/구 단위 파티션)
+# 한글은 음절 하나가 한 글자라 2-gram 만으로도 후보가 충분히 줄어든다.
+# 검색어의 모든 2-gram 을 가진 매장만 후보로 뽑고, 실제 포함 여부를 다시 확인해서
+# MySQL 에는 후보 store_business_number 만 넘긴다.
+# 다른 워커 / 서버에서 추가된 매장은 시/군/구별 변경 서명 (행 수, 최대 LOCAL_STORE_ID) 으로 확인한다.
+# 서명은 STORE_NAME_INDEX_CHECK_INTERVAL 초마다 한 번 조회하고, 바뀐 파티션은 그 검색만 기존 SQL 로 처리한 뒤
+# 백그라운드에서 한 번 다시 만든다. 파티션은 서버 시작 시 백그라운드에서 미리 생성 (STORE_NAME_INDEX_WARM=0 이면 첫 검색 시)
+STORE_NAME_INDEX_CHECK_INTERVAL = float(os.getenv("STORE_NAME_INDEX_CHECK_INTERVAL", "10"))
+# 후보가 이보다 많으면 IN 조건 대신 기존 방식(조회 후 Python 필터)으로 처리
+STORE_NAME_INDEX_MAX_CANDIDATES = int(os.getenv("STORE_NAME_INDEX_MAX_CANDIDATES", "20000"))
+
+_partitions = {}  # district_id -> StoreNamePartition
+_partition_locks = {}
+_partitions_lock = threading.Lock()
+
+
+def _grams(text):
+    """소문자 변환 후 공백을 제외한 2-gram 집합"""
+    text = text.lower()
+    return {text[i:i + 2] for i in range(len(text) - 1) if not text[i:i + 2].isspace()}
+
+
+class StoreNamePartition:
+    """시/군/구 하나의 매장명 색인"""
+
+    def __init__(self, district_id, signature=None):
+        self.district_id = district_id
+        self.signature = signature
+        self.checked_at = time.monotonic()
+        self.numbers = []  # 행 번호 -> store_business_number
+        self.names = []
+        self.sub_district_ids = []
+        self.postings = {}  # 2-gram -> array 행 번호
+        self.positions = {}  # store_business_number -> 행 번호
+
+    def add(self, store_business_number, sub_district_id, store_name):
+        position = self.positions.get(store_business_number)
+        if position is not None:
+            # 같은 매장이 다시 들어오면 이름만 교체 (이전 gram 은 검증 단계에서 걸러짐)
+            self.names[position] = store_name or ""
+            self.sub_district_ids[position] = sub_district_id
+        else:
+            position = len(self.numbers)
+            self.positions[store_business_number] = position
+            self.numbers.append(store_business_number)
+            self.names.append(store_name or "")
+            self.sub_district_ids.append(sub_district_id)
+
+        for gram in _grams(store_name or ""):
+            postings = self.postings.get(gram)
+            if postings is None:
+                postings = self.postings[gram] = array("I")
+            if not postings or postings[-1] != position:
+                postings.append(position)
+
+    def search(self, store_name, sub_district_id=None):
+        grams = _grams(store_name)
+        if grams:
+            posting_lists = sorted((self.postings.get(gram) for gram in grams), key=lambda p: len(p) if p else 0)
+            if not posting_lists[0]:
+                return []
+            candidates = set(posting_lists[0])
+            for postings in posting_lists[1:]:
+                candidates.intersection_update(postings)
+                if not candidates:
+                    return []
+        else:
+            # 한 글자 검색은 색인 없이 파티션 내에서 확인
+            candidates = range(len(self.numbers))
+
+        return [
+            self.numbers[position]
+            for position in sorted(candidates)
+            if store_name in self.names[position]
+            and (sub_district_id is None or self.sub_district_ids[position] == sub_district_id)
+        ]
+
+
+def _select_signatures(district_ids):
+    """시/군/구별 (행 수, 최대 LOCAL_STORE_ID) - DISTRICT_ID 인덱스만 읽음"""
+    connection = get_db_connection()
+    cursor = connection.cursor(pymysql.cursors.DictCursor)
+    try:
+        cursor.execute(f"""
+            SELECT DISTRICT_ID, COUNT(*) AS CNT, MAX(LOCAL_STORE_ID) AS MAX_ID
+            FROM LOCAL_STORE
+            WHERE DISTRICT_ID IN ({', '.join(['%s'] * len(district_ids))})
+            GROUP BY DISTRICT_ID;
+        """, list(district_ids))
+        signatures = {district_id: "0-None" for district_id in district_ids}
+        for row in cursor.fetchall():
+            signatures[row["DISTRICT_ID"]] = f"{row['CNT']}-{row['MAX_ID']}"
+        return signatures
+    finally:
+        if cursor:
+            cursor.close()
+        connection.close()
+
+
+def _load_partition(district_id):
+    # 서명을 먼저 읽음 - 그 사이에 추가된 매장은 다음 확인 때 한 번 더 다시 만들어짐
+    partition = StoreNamePartition(district_id, _select_signatures([district_id])[district_id])
+    connection = get_db_connection()
+    cursor = connection.cursor(pymysql.cursors.SSCursor)
+    try:
+        cursor.execute("""
+            SELECT STORE_BUSINESS_NUMBER, SUB_DISTRICT_ID, STORE_NAME
+            FROM LOCAL_STORE
+            WHERE DISTRICT_ID = %s;
+        """, (district_id,))
+        for store_business_number, sub_district_id, store_name in cursor:
+            partition.add(store_business_number, sub_district_id, store_name)
+        return partition
+    finally:
+        if cursor:
+            cursor.close()
+        connection.close()
+
+
+def _partition_lock(district_id):
+    with _partitions_lock:
+        return _partition_locks.setdefault(district_id, threading.Lock())
+
+
+def build_partition(district_id, stale=None):
+    """
+    시/군/구 파티션 생성 - 파티션이 없거나 아직 stale 파티션 그대로일 때만 (다른 스레드가 만들고 있으면 건너뜀)
+    """
+    lock = _partition_lock(district_id)
+    if not lock.acquire(blocking=False):
+        return
+    try:
+        partition = _partitions.get(district_id)
+        if partition is None or partition is stale:
+            _partitions[district_id] = _load_partition(district_id)
+    except Exception as e:
+        logger.error(f"store name index build failed (district {district_id}): {e}")
+    finally:
+        lock.release()
+
+
+def _build_in_background(district_id, stale=None):
+    threading.Thread(target=build_partition, args=(district_id, stale), daemon=True).start()
+
+
+def get_partitions(district_ids):
+    """
+    최신 파티션 목록 - 하나라도 없거나 DB 와 서명이 다르면 None (해당 파티션은 백그라운드에서 다시 생성)
+    서명은 파티션마다 STORE_NAME_INDEX_CHECK_INTERVAL 초에 한 번만 조회
+    """
+    partitions = [_partitions.get(district_id) for district_id in district_ids]
+    missing = [district_id for district_id, partition in zip(district_ids, partitions) if partition is None]
+    for district_id in missing:
+        _build_in_background(district_id)
+    if missing:
+        return None
+
+    now = time.monotonic()
+    due = [partition for partition in partitions if now - partition.checked_at >= STORE_NAME_INDEX_CHECK_INTERVAL]
+    if due:
+        signatures = _select_signatures([partition.district_id for partition in due])
+        changed = False
+        for partition in due:
+            if partition.signature == signatures[partition.district_id]:
+                partition.checked_at = now
+            else:
+                changed = True
+                _build_in_background(partition.district_id, partition)
+        if changed:
+            return None
+
+    return partitions
+
+
+def _district_ids(city_id=None, district_id=None):
+    if district_id is not None:
+        return [district_id]
+    index = get_dimensions()
+    if index is None:
+        return None
+    return [
+        candidate_id
+        for candidate_id, (candidate_city_id, _) in index.districts.items()
+        if city_id is None or candidate_city_id == city_id
+    ]
+
+
+def search_store_numbers(store_name, city_id=None, district_id=None, sub_district_id=None):
+    """
+    매장명에 store_name 이 포함된 store_business_number 목록
+    색인을 사용할 수 없거나 (전국 검색 / 파티션이 없거나 DB 와 다름) 후보가 너무 많으면 None - 호출하는 쪽은 기존 방식으로 조회
+    """
+    if not store_name or city_id is None:
+        # 전국 검색은 시/군/구 전체의 서명을 확인해야 하므로 색인을 쓰지 않음
+        return None
+
+    try:
+        district_ids = _district_ids(city_id, district_id)
+        if district_ids is None:
+            return None
+
+        partitions = get_partitions(district_ids)
+        if partitions is None:
+            return None
+
+        numbers = []
+        for partition in partitions:
+            numbers.extend(partition.search(store_name, sub_district_id))
+            if len(numbers) > STORE_NAME_INDEX_MAX_CANDIDATES:
+                return None
+        return numbers
+
+    except Exception as e:
+        logger.error(f"store name index search failed: {e}")
+        return None
+
+
+def add_store_to_index(store_business_number, district_id, sub_district_id, store_name):
+    """
+    add_new_store 후 호출 - 이 워커에 이미 만들어진 파티션에만 바로 반영
+    (다른 워커는 서명 확인 때 다시 생성, 이 워커도 서명이 바뀌었으므로 한 번 다시 생성됨)
+    """
+    partition = _partitions.get(district_id)
+    if partition is None:
+        return
+    lock = _partition_locks.get(district_id)
+    if lock is None:
+        return
+    with lock:
+        partition.add(store_business_number, sub_district_id, store_name)
+
+
+def warm_store_name_index():
+    """전체 시/군/구 파티션 미리 생성 (서버 시작 시 백그라운드)"""
+    district_ids = _district_ids() or []
+    started_at = time.monotonic()
+    for district_id in district_ids:
+        build_partition(district_id)
+    logger.info(f"store name index warmed: {len(district_ids)} districts, {time.monotonic() - started_at:.1f}s")
@@ -7,6 +7,7 @@ from app.db.connect import (
     commit,
     rollback,
 )
+from app.crud.dimension_cache import find_sub_district_id, find_sub_district_name, invalidate_dimensions
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
@@ -14,6 +15,19 @@ logging.basicConfig(
 
 
 def get_or_create_sub_district(sub_district_data: SubDistrict) -> SubDistrict:
+    cached_id = find_sub_district_id(
+        sub_district_data.city_id,
+        sub_district_data.district_id,
+        sub_district_data.sub_district_name,
+    )
+    if cached_id is not None:
+        return SubDistrict(
+            sub_district_id=cached_id,
+            sub_district_name=sub_district_data.sub_district_name,
+            district_id=sub_district_data.district_id,
+            city_id=sub_district_data.city_id,
+        )
+
     connection = get_db_connection()
     cursor = connection.cursor()
 
@@ -54,6 +68,7 @@ def get_or_create_sub_district(sub_district_data: SubDistrict) -> SubDistrict:
                 ),
             )
             commit(connection)
+            invalidate_dimensions()
             return SubDistrict(
                 sub_district_id=cursor.lastrowid,
                 sub_district_name=sub_district_data.sub_district_name,
@@ -71,6 +86,10 @@ def get_or_create_sub_district(sub_district_data: SubDistrict) -> SubDistrict:
 def get_or_create_sub_district_id(
     city_id: int, district_id: int, sub_district_name: str
 ) -> int:
+    cached_id = find_sub_district_id(city_id, district_id, sub_district_name)
+    if cached_id is not None:
+        return cached_id
+
     connection = get_db_connection()
     cursor = connection.cursor()
     logger = logging.getLogger(__name__)
@@ -113,6 +132,7 @@ def get_or_create_sub_district_id(
                 ),
             )
             commit(connection)
+            invalidate_dimensions()
             return cursor.lastrowid
     except Exception as e:
         rollback(connection)
@@ -125,6 +145,10 @@ def get_or_create_sub_district_id(
 def get_sub_district_id_by(
     city_id: int, district_id: int, sub_district_name: str
 ) -> int:
+    cached_id = find_sub_district_id(city_id, district_id, sub_district_name)
+    if cached_id is not None:
+        return cached_id
+
     connection = get_db_connection()
     cursor = connection.cursor()
     logger = logging.getLogger(__name__)
@@ -163,6 +187,10 @@ def get_sub_district_id_by(
 
 
 def get_sub_district_name_by_sub_district_id(sub_district_id: int) -> str:
+    cached_name = find_sub_district_name(sub_district_id)
+    if cached_name is not None:
+        return cached_name
+
     connection = get_db_connection()
     cursor = connection.cursor()
 
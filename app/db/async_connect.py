@@ -0,0 +1,150 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+
+import aiomysql
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 비동기 커넥션 풀 (aiomysql)
+# 이벤트 루프 하나당 DB 별 풀 하나씩 생성해서 재사용한다.
+_async_pools = {}
+_async_pool_locks = {}
+
+
+def _pool_config(db):
+    if db == "report":
+        return dict(
+            host=os.getenv("DB_RE_HOST"),
+            port=int(os.getenv("DB_PORT", "3306")),
+            user=os.getenv("DB_RE_USER"),
+            password=os.getenv("DB_RE_PASSWORD"),
+            db=os.getenv("DB_RE_DATABASE"),
+        )
+    return dict(
+        host=os.getenv("DB_HOST"),
+        port=int(os.getenv("DB_PORT", "3306")),
+        user=os.getenv("DB_USER"),
+        password=os.getenv("DB_PASSWORD"),
+        db=db or os.getenv("DB_DATABASE"),
+    )
+
+
+async def get_async_pool(db=None):
+    """db=None : 소스 DB, db="report" : 리포트 DB, 그 외 문자열 : 소스 서버의 해당 database"""
+    loop = asyncio.get_running_loop()
+    key = (id(loop), db)
+
+    pool = _async_pools.get(key)
+    if pool is not None and not pool.closed:
+        return pool
+
+    lock = _async_pool_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        pool = _async_pools.get(key)
+        if pool is None or pool.closed:
+            pool = await aiomysql.create_pool(
+                minsize=int(os.getenv("DB_ASYNC_POOL_MIN_SIZE", "1")),
+                maxsize=int(os.getenv("DB_ASYNC_POOL_MAX_SIZE", "20")),
+                pool_recycle=int(os.getenv("DB_POOL_MAX_LIFETIME", "3600")),
+                autocommit=True,
+                charset="utf8mb4",
+                **_pool_config(db),
+            )
+            _async_pools[key] = pool
+    return pool
+
+
+@asynccontextmanager
+async def get_async_db_connection(db=None):
+    """풀에서 커넥션을 빌려오고 블록이 끝나면 반납"""
+    pool = await get_async_pool(db)
+    async with pool.acquire() as connection:
+        yield connection
+
+
+@asynccontextmanager
+async def async_transaction(db=None):
+    """트랜잭션 블록 - 정상 종료 시 commit, 예외 발생 시 rollback"""
+    async with get_async_db_connection(db) as connection:
+        await connection.begin()
+        try:
+            yield connection
+        except BaseException:
+            await connection.rollback()
+            raise
+        else:
+            await connection.commit()
+
+
+async def async_fetch_all(query, params=None, connection=None, db=None, dict_cursor=True):
+    if connection is None:
+        async with get_async_db_connection(db) as connection:
+            return await async_fetch_all(query, params, connection, dict_cursor=dict_cursor)
+
+    cursor_class = aiomysql.DictCursor if dict_cursor else aiomysql.Cursor
+    async with connection.cursor(cursor_class) as cursor:
+        await cursor.execute(query, params or None)
+        return await cursor.fetchall()
+
+
+async def async_fetch_one(query, params=None, connection=None, db=None, dict_cursor=True):
+    if connection is None:
+        async with get_async_db_connection(db) as connection:
+            return await async_fetch_one(query, params, connection, dict_cursor=dict_cursor)
+
+    cursor_class = aiomysql.DictCursor if dict_cursor else aiomysql.Cursor
+    async with connection.cursor(cursor_class) as cursor:
+        await cursor.execute(query, params or None)
+        return await cursor.fetchone()
+
+
+# 서버 측 커서로 읽을 때 한 번에 가져오는 행 수
+ASYNC_STREAM_CHUNK_SIZE = int(os.getenv("DB_STREAM_CHUNK_SIZE", "2000"))
+
+
+async def async_stream(query, params=None, connection=None, db=None, dict_cursor=True, chunk_size=None):
+    """
+    서버 측 커서(SSCursor)로 조회해서 chunk_size 행씩 list 로 yield
+    결과 전체를 메모리에 올리지 않으므로 전국 단위 조회 / 다운로드용
+    (다 읽기 전에 같은 커넥션으로 다른 쿼리를 실행하면 안 됨)
+    """
+    if connection is None:
+        async with get_async_db_connection(db) as connection:
+            async for rows in async_stream(query, params, connection, dict_cursor=dict_cursor, chunk_size=chunk_size):
+                yield rows
+        return
+
+    chunk_size = chunk_size or ASYNC_STREAM_CHUNK_SIZE
+    cursor_class = aiomysql.SSDictCursor if dict_cursor else aiomysql.SSCursor
+    async with connection.cursor(cursor_class) as cursor:
+        await cursor.execute(query, params or None)
+        while True:
+            rows = await cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield rows
+
+
+async def async_execute(query, params=None, connection=None, db=None, many=False):
+    """INSERT/UPDATE 실행 후 영향받은 row 수 반환 (connection 미지정 시 단독 트랜잭션)"""
+    if connection is None:
+        async with async_transaction(db) as connection:
+            return await async_execute(query, params, connection, many=many)
+
+    async with connection.cursor() as cursor:
+        if many:
+            await cursor.executemany(query, params)
+        else:
+            await cursor.execute(query, params or None)
+        return cursor.rowcount
+
+
+async def close_async_pools():
+    loop_id = id(asyncio.get_running_loop())
+    for key in [key for key in _async_pools if key[0] == loop_id]:
+        pool = _async_pools.pop(key)
+        _async_pool_locks.pop(key, None)
+        pool.close()
+        await pool.wait_closed()
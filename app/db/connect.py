@@ -2,21 +2,31 @@ import pymysql
 import os
 from dotenv import load_dotenv
 from pymysql import OperationalError, InternalError, ProgrammingError, Error
+from app.db.pool import get_pool, get_pool_metrics, close_all_pools
 
 load_dotenv()
 
+# 커넥션 풀 설정 (DB_POOL_MAX_SIZE, DB_POOL_TIMEOUT, DB_POOL_IDLE_TIMEOUT,
+# DB_POOL_MAX_LIFETIME, DB_POOL_PING_INTERVAL 환경변수로 조정)
+# 반환되는 커넥션의 close() / with 블록 종료는 실제 연결을 끊지 않고 풀에 반납한다.
+
 # 소스 DB 연결
 def get_db_connection(db_database=None):
     connection = None
     try:
-        connection = pymysql.connect(
-            host=os.getenv("DB_HOST"),
-            port=int(os.getenv("DB_PORT", "3306")),  # 없으면 3306 기본값
-            user=os.getenv("DB_USER"),
-            password=os.getenv("DB_PASSWORD"),
-            database=db_database or os.getenv("DB_DATABASE"),
-            autocommit=False,
+        database = db_database or os.getenv("DB_DATABASE")
+        pool = get_pool(
+            f"source:{database}",
+            dict(
+                host=os.getenv("DB_HOST"),
+                port=int(os.getenv("DB_PORT", "3306")),  # 없으면 3306 기본값
+                user=os.getenv("DB_USER"),
+                password=os.getenv("DB_PASSWORD"),
+                database=database,
+                autocommit=False,
+            ),
         )
+        connection = pool.acquire()
         # print("TEST Database connection established successfully.")
     except OperationalError as e:
         print(f"OperationalError: {e}")
@@ -34,14 +44,18 @@ def get_db_connection(db_database=None):
 def get_re_db_connection():
     connection = None
     try:
-        connection = pymysql.connect(
-            host=os.getenv("DB_RE_HOST"),
-            port=int(os.getenv("DB_PORT", "3306")),  # 없으면 3306 기본값
-            user=os.getenv("DB_RE_USER"),
-            password=os.getenv("DB_RE_PASSWORD"),
-            database=os.getenv("DB_RE_DATABASE"),
-            autocommit=False,
+        pool = get_pool(
+            "report",
+            dict(
+                host=os.getenv("DB_RE_HOST"),
+                port=int(os.getenv("DB_PORT", "3306")),  # 없으면 3306 기본값
+                user=os.getenv("DB_RE_USER"),
+                password=os.getenv("DB_RE_PASSWORD"),
+                database=os.getenv("DB_RE_DATABASE"),
+                autocommit=False,
+            ),
         )
+        connection = pool.acquire()
         # print("TEST Database connection established successfully.")
     except OperationalError as e:
         print(f"OperationalError: {e}")
@@ -94,7 +108,17 @@ def get_re_db_connection():
 #     return connection
 
 
-# DB 연결 종료
+# 커넥션 풀 상태 조회
+def get_db_pool_metrics():
+    return get_pool_metrics()
+
+
+# 커넥션 풀 정리 (서버 종료 시)
+def close_db_pools():
+    close_all_pools()
+
+
+# DB 연결 종료 (풀 커넥션은 반납)
 def close_connection(connection):
     try:
         if connection:
@@ -0,0 +1,322 @@
+import os
+import threading
+import time
+from collections import deque
+
+import pymysql
+from pymysql import OperationalError
+
+
+class PoolTimeoutError(OperationalError):
+    """풀에서 정해진 시간 안에 커넥션을 받지 못한 경우"""
+
+
+class PooledConnection:
+    """
+    pymysql 커넥션 래퍼
+    close() 또는 with 블록 종료 시 실제로 끊지 않고 풀에 반납한다.
+    그 외 속성/메서드(cursor, commit, rollback ...)는 원본 커넥션으로 위임
+    """
+
+    def __init__(self, pool, raw, created_at):
+        self._pool = pool
+        self._raw = raw
+        self._created_at = created_at
+
+    def __getattr__(self, name):
+        raw = self.__dict__.get("_raw")
+        if raw is None:
+            raise pymysql.err.InterfaceError(0, "connection already returned to pool")
+        return getattr(raw, name)
+
+    @property
+    def open(self):
+        return self._raw is not None and self._raw.open
+
+    @property
+    def raw(self):
+        return self._raw
+
+    def close(self):
+        raw, self._raw = self._raw, None
+        if raw is not None:
+            self._pool.release(raw, self._created_at)
+
+    def invalidate(self):
+        """커넥션이 깨졌다고 판단될 때 풀에 돌려보내지 않고 폐기"""
+        raw, self._raw = self._raw, None
+        if raw is not None:
+            self._pool.discard(raw)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __del__(self):
+        # close() 없이 버려진 커넥션은 상태를 알 수 없으므로 재사용하지 않고 폐기
+        raw = self.__dict__.get("_raw")
+        if raw is not None:
+            self._raw = None
+            try:
+                self._pool.discard(raw, leaked=True)
+            except Exception:
+                pass
+
+
+class ConnectionPool:
+    """
+    DB 하나당 하나씩 두는 pymysql 커넥션 풀
+
+    - max_size       : 동시에 열 수 있는 최대 커넥션 수 (초과 요청은 timeout 까지 대기)
+    - idle_timeout   : 이 시간(초) 이상 놀고 있던 커넥션은 닫음
+    - max_lifetime   : 생성 후 이 시간(초)이 지난 커넥션은 반납 시 새로 교체
+    - ping_interval  : 마지막 사용 후 이 시간(초)이 지났으면 대여 전에 ping 으로 상태 확인
+    """
+
+    def __init__(
+        self,
+        name,
+        connect_kwargs,
+        max_size=10,
+        timeout=30.0,
+        idle_timeout=300.0,
+        max_lifetime=3600.0,
+        ping_interval=30.0,
+    ):
+        self.name = name
+        self._connect_kwargs = dict(connect_kwargs)
+        self.max_size = max_size
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+        self.ping_interval = ping_interval
+
+        self._pid = os.getpid()
+        self._cond = threading.Condition(threading.Lock())
+        # (raw, created_at, last_used) - 오른쪽 끝이 가장 최근 반납된 커넥션
+        self._idle = deque()
+        self._size = 0
+        self._metrics = {
+            "created": 0,
+            "closed": 0,
+            "checkouts": 0,
+            "reused": 0,
+            "waits": 0,
+            "wait_time_total": 0.0,
+            "timeouts": 0,
+            "health_check_failures": 0,
+            "idle_evicted": 0,
+            "lifetime_recycled": 0,
+            "leaked": 0,
+        }
+
+    # 커넥션 대여
+    def acquire(self):
+        deadline = time.monotonic() + self.timeout
+        waited_from = None
+
+        while True:
+            entry = None
+            create = False
+            expired = []
+
+            with self._cond:
+                now = time.monotonic()
+                expired = self._evict_expired(now)
+
+                if self._idle:
+                    entry = self._idle.pop()
+                elif self._size < self.max_size:
+                    self._size += 1
+                    create = True
+                else:
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self._metrics["timeouts"] += 1
+                        raise PoolTimeoutError(
+                            0, f"connection pool '{self.name}' exhausted (max_size={self.max_size})"
+                        )
+                    if waited_from is None:
+                        waited_from = now
+                        self._metrics["waits"] += 1
+                    self._cond.wait(remaining)
+                    continue
+
+            self._close_raw_all(expired)
+
+            if create:
+                try:
+                    raw = pymysql.connect(**self._connect_kwargs)
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                created_at = time.monotonic()
+                with self._cond:
+                    self._metrics["created"] += 1
+                return self._checkout(raw, created_at, waited_from)
+
+            raw, created_at, last_used = entry
+            if time.monotonic() - last_used >= self.ping_interval:
+                try:
+                    raw.ping(reconnect=False)
+                except Exception:
+                    with self._cond:
+                        self._metrics["health_check_failures"] += 1
+                    self.discard(raw)
+                    continue
+
+            with self._cond:
+                self._metrics["reused"] += 1
+            return self._checkout(raw, created_at, waited_from)
+
+    def _checkout(self, raw, created_at, waited_from):
+        with self._cond:
+            self._metrics["checkouts"] += 1
+            if waited_from is not None:
+                self._metrics["wait_time_total"] += time.monotonic() - waited_from
+        return PooledConnection(self, raw, created_at)
+
+    # 커넥션 반납
+    def release(self, raw, created_at):
+        if os.getpid() != self._pid:
+            # fork 이후 부모 프로세스의 풀로 돌아온 커넥션은 재사용하지 않는다
+            self._close_raw(raw)
+            return
+
+        reusable = raw.open
+        if reusable:
+            try:
+                # 커밋되지 않은 트랜잭션/스냅샷을 정리해서 다음 사용자에게 깨끗한 상태로 넘김
+                raw.rollback()
+            except Exception:
+                reusable = False
+
+        now = time.monotonic()
+        recycle = now - created_at >= self.max_lifetime
+
+        if not reusable or recycle:
+            with self._cond:
+                if recycle and reusable:
+                    self._metrics["lifetime_recycled"] += 1
+                self._size -= 1
+                self._cond.notify()
+            self._close_raw(raw)
+            return
+
+        with self._cond:
+            self._idle.append((raw, created_at, now))
+            self._cond.notify()
+
+    # 커넥션 폐기 (풀 크기에서 제외)
+    def discard(self, raw, leaked=False):
+        if os.getpid() == self._pid:
+            with self._cond:
+                self._size -= 1
+                if leaked:
+                    self._metrics["leaked"] += 1
+                self._cond.notify()
+        self._close_raw(raw)
+
+    def _evict_expired(self, now):
+        """lock 을 잡은 상태에서 호출 - 만료된 유휴 커넥션을 빼서 돌려줌"""
+        expired = []
+        kept = deque()
+        while self._idle:
+            raw, created_at, last_used = self._idle.popleft()
+            if now - last_used >= self.idle_timeout:
+                self._metrics["idle_evicted"] += 1
+                expired.append(raw)
+            elif now - created_at >= self.max_lifetime:
+                self._metrics["lifetime_recycled"] += 1
+                expired.append(raw)
+            else:
+                kept.append((raw, created_at, last_used))
+        self._idle = kept
+        self._size -= len(expired)
+        if expired:
+            self._cond.notify(len(expired))
+        return expired
+
+    def _close_raw(self, raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+        if os.getpid() == self._pid:
+            with self._cond:
+                self._metrics["closed"] += 1
+
+    def _close_raw_all(self, raws):
+        for raw in raws:
+            self._close_raw(raw)
+
+    def close_all(self):
+        """유휴 커넥션을 모두 닫음 (사용 중인 커넥션은 반납 시점에 정리됨)"""
+        with self._cond:
+            idle = [raw for raw, _, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        self._close_raw_all(idle)
+
+    def metrics(self):
+        with self._cond:
+            stats = dict(self._metrics)
+            stats["name"] = self.name
+            stats["size"] = self._size
+            stats["idle"] = len(self._idle)
+            stats["in_use"] = self._size - len(self._idle)
+            stats["max_size"] = self.max_size
+        return stats
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _env_number(name, default, cast=float):
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    return cast(value)
+
+
+def get_pool(key, connect_kwargs):
+    """
+    key 별로 하나의 풀을 생성/재사용
+    프로세스가 fork 된 경우(멀티 워커, ProcessPool) 자식 프로세스에서 새 풀을 만든다.
+    """
+    pid = os.getpid()
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None or pool._pid != pid:
+            pool = ConnectionPool(
+                name=key,
+                connect_kwargs=connect_kwargs,
+                max_size=_env_number("DB_POOL_MAX_SIZE", 10, int),
+                timeout=_env_number("DB_POOL_TIMEOUT", 30.0),
+                idle_timeout=_env_number("DB_POOL_IDLE_TIMEOUT", 300.0),
+                max_lifetime=_env_number("DB_POOL_MAX_LIFETIME", 3600.0),
+                ping_interval=_env_number("DB_POOL_PING_INTERVAL", 30.0),
+            )
+            _pools[key] = pool
+        return pool
+
+
+def get_pool_metrics():
+    """풀 별 지표 조회"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return {pool.name: pool.metrics() for pool in pools}
+
+
+def close_all_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close_all()
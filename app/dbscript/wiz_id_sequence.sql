@@ -0,0 +1,14 @@
+-- 일련번호 시퀀스 (app/crud/id_allocator.py)
+-- NEXT_VALUE : 다음에 발급할 번호 (워커가 UPDATE ... LAST_INSERT_ID(NEXT_VALUE + n) 로 구간을 예약)
+CREATE TABLE IF NOT EXISTS
+    `ID_SEQUENCE` (
+        `NAME` VARCHAR(50) NOT NULL COMMENT '시퀀스 이름',
+        `NEXT_VALUE` BIGINT UNSIGNED NOT NULL COMMENT '다음 번호',
+        PRIMARY KEY (`NAME`)
+    );
+
+-- JS 매장 관리 번호 (JS0001 형식) - 기존 JS 번호의 최대값 + 1 부터 발급
+INSERT IGNORE INTO `ID_SEQUENCE` (`NAME`, `NEXT_VALUE`)
+SELECT 'STORE_BUSINESS_NUMBER_JS', IFNULL(MAX(CAST(SUBSTRING(STORE_BUSINESS_NUMBER, 3) AS UNSIGNED)), 0) + 1
+FROM `LOCAL_STORE`
+WHERE STORE_BUSINESS_NUMBER LIKE 'JS%';
@@ -1,5 +1,6 @@
 import sys
 import os
+import threading
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -32,8 +33,15 @@ from app.api.endpoints import city
 from app.api.endpoints import loc_store
 from app.api.endpoints import business_area_category
 from app.api.endpoints import statistics
+from app.db.connect import get_db_pool_metrics, close_db_pools
+from app.db.async_connect import close_async_pools
+from app.crud.dimension_cache import invalidate_dimensions
+from app.crud.store_category_map import refresh_store_category_map_table
+from app.crud.store_name_index import warm_store_name_index
+from app.core.compression import CompressionMiddleware
+from app.core.responses import FastJSONResponse
 
-app = FastAPI()
+app = FastAPI(default_response_class=FastJSONResponse)
 
 load_dotenv()
 
@@ -47,6 +55,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 응답 압축 (brotli / gzip) - RESPONSE_COMPRESS_MIN_SIZE 바이트 이상만
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=int(os.getenv("RESPONSE_COMPRESS_MIN_SIZE", "1024")),
+)
+
 # print(os.getenv("ALLOWED_ORIGINS", ""))
 
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
@@ -57,6 +71,34 @@ async def read_root():
     return {"message": "Welcome to FastAPI!"}
 
 
+# DB 커넥션 풀 상태 확인
+@app.get("/db/pool")
+def read_db_pool():
+    return get_db_pool_metrics()
+
+
+# 지역 / 업종 기준 테이블 캐시 비우기 (데이터 적재 후 호출)
+@app.post("/dimension/refresh")
+def refresh_dimension_cache():
+    invalidate_dimensions()
+    # 업종 매핑 테이블 (STORE_CATEGORY_MAP_TABLE 지정 시)
+    refresh_store_category_map_table()
+    return {"success": True}
+
+
+# 매장명 색인 미리 생성 (백그라운드, STORE_NAME_INDEX_WARM=0 이면 첫 검색 시 시/군/구별로 생성)
+@app.on_event("startup")
+def warm_store_name_index_on_startup():
+    if os.getenv("STORE_NAME_INDEX_WARM", "1") == "1":
+        threading.Thread(target=warm_store_name_index, daemon=True).start()
+
+
+@app.on_event("shutdown")
+async def shutdown_db_pools():
+    close_db_pools()
+    await close_async_pools()
+
+
 app.include_router(hello.router, prefix="/hello")
 app.include_router(population.router, prefix="/population")
 app.include_router(loc_info.router, prefix="/loc/info")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, Dict, Union
 from datetime import datetime, date
 
 
@@ -58,9 +58,23 @@ class FilterRequest(BaseModel):
     jScoreMax: Optional[int] = None
     selectedOptions: Optional[List[str]] 
     isLikeSearch : bool = False
+    # 유사 지역 검색 방식 - None : j_score ±10% 범위, "knn" : 입지 지표 다중 항목 최근접 이웃
+    similarMode: Optional[str] = None
+    similarK: Optional[int] = None
+    similarWeights: Optional[Dict[str, float]] = None
 
 
 
+# 입지 통계 컬럼 형식 조회 요청
+# scope 미지정 시 city / district / subDistrict 값으로 비교 범위 결정 (nation, city, district, sub_district)
+# cursor 는 이전 응답의 next_cursor ([ref_date, sub_district_id, target_item])
+class StatColumnarRequest(FilterRequest):
+    scope: Optional[str] = None
+    fields: Optional[List[str]] = None
+    cursor: Optional[List[Union[int, str]]] = None
+    limit: int = 5000
+
+
 class LocationInfoReportOutput(BaseModel):
     resident: Optional[int] = None
     work_pop: Optional[int] = None
@@ -13,6 +13,9 @@ class FilterRequest(BaseModel):
     subCategory: Optional[str] = None
     detailCategory: Optional[str] = None
     selectedOptions: Optional[list] = None
+    pageSize: Optional[int] = None  # 지정 시 페이지 조회 (없으면 전체 목록)
+    cursor: Optional[list] = None  # 이전 페이지의 next_cursor [store_name, store_business_number]
+    withTotal: Optional[str] = None  # exact / approx 지정 시 전체 건수 포함
 
 
 
@@ -197,10 +200,24 @@ class AddRequest(BaseModel):
     selected: Optional[List[str]] = None
 
 
+# 매장 일괄 등록 - 행마다 AddRequest 형식 (검증은 행별로 해서 결과에 오류 표시)
+class BulkAddRequest(BaseModel):
+    stores: List[dict]
+
+
 class ReportRequest(BaseModel):
     store_business_number: str
 
 
+# 리포트 대량 재생성 요청 (매장 번호 목록 또는 필터, job_id 를 넘기면 이어서 실행)
+class BulkReportRequest(BaseModel):
+    store_business_numbers: Optional[List[str]] = None
+    filters: Optional[FilterRequest] = None
+    job_id: Optional[str] = None
+    workers: Optional[int] = None
+    batch_size: Optional[int] = 50
+
+
 
 class OneStoreRequest(BaseModel):
     city_id: int
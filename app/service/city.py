@@ -1,4 +1,8 @@
+import gzip
+import hashlib
+import json
 import os
+import time
 import pandas as pd
 from dotenv import load_dotenv
 from app.schemas.city import City
@@ -8,45 +12,62 @@ from app.crud.city import get_or_create_city
 from app.crud.district import get_or_create_district
 from app.crud.sub_district import get_or_create_sub_district
 from app.db.connect import *
+from app.db.async_connect import get_async_db_connection, async_fetch_all
+from app.crud.dimension_cache import get_dimensions_version
 
 
 
-async def get_locations_service():
-    """도시, 군/구, 읍/면/동 데이터를 한 번에 조회하는 서비스"""
-    
-    connection = get_db_connection()
-    cursor = None
-    try:
-        cursor = connection.cursor()
+# 지역 목록 응답 캐시 (직렬화된 JSON + gzip + ETag)
+# 지역 테이블이 바뀌면(get_or_create_*) dimension 버전이 올라가서 다음 요청 때 다시 만든다.
+LOCATIONS_CACHE_TTL = float(os.getenv("LOCATIONS_CACHE_TTL", "600"))
+locations_cache = None
+
 
+async def fetch_locations():
+    """도시, 군/구, 읍/면/동 데이터를 한 번에 조회"""
+    async with get_async_db_connection() as connection:
         # cities 데이터 조회
         cities_query = "SELECT city_id, city_name FROM city"
-        cursor.execute(cities_query)
-        cities = cursor.fetchall()
+        cities = await async_fetch_all(cities_query, connection=connection, dict_cursor=False)
 
         # districts 데이터 조회
         districts_query = "SELECT district_id, city_id, district_name FROM district"
-        cursor.execute(districts_query)
-        districts = cursor.fetchall()
+        districts = await async_fetch_all(districts_query, connection=connection, dict_cursor=False)
 
         # sub_districts 데이터 조회
         sub_districts_query = "SELECT sub_district_id, district_id, city_id, sub_district_name FROM sub_district"
-        cursor.execute(sub_districts_query)
-        sub_districts = cursor.fetchall()
+        sub_districts = await async_fetch_all(sub_districts_query, connection=connection, dict_cursor=False)
 
-        # 계층적 데이터 구조 생성
-        return {
-            "cities": cities,
-            "districts": districts,
-            "sub_districts": sub_districts,
-        }
-
-    finally:
-        if cursor:
-            cursor.close()
-        connection.close()
+    # 계층적 데이터 구조 생성
+    return {
+        "cities": cities,
+        "districts": districts,
+        "sub_districts": sub_districts,
+    }
 
 
+async def get_locations_service():
+    """지역 목록 응답 캐시 반환 {"body", "gzip", "etag"} - 캐시가 유효하면 DB 조회 없음"""
+    global locations_cache
 
+    cache = locations_cache
+    if (
+        cache is not None
+        and cache["version"] == get_dimensions_version()
+        and time.monotonic() - cache["built_at"] < LOCATIONS_CACHE_TTL
+    ):
+        return cache
 
+    version = get_dimensions_version()
+    locations = await fetch_locations()
 
+    body = json.dumps(locations, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    cache = {
+        "body": body,
+        "gzip": gzip.compress(body),
+        "etag": '"' + hashlib.sha1(body).hexdigest() + '"',
+        "version": version,
+        "built_at": time.monotonic(),
+    }
+    locations_cache = cache
+    return cache
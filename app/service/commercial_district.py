@@ -13,7 +13,6 @@ from app.crud.commercial_district import (
 from app.crud.district import get_district_id
 from app.crud.sub_district import get_sub_district_id_by
 from app.schemas.commercial_district import (
-    CommercialDistrictOutput,
     CommercialStatisticsDataDate,
 )
 
@@ -42,7 +41,7 @@ def select_commercial_district_by_dynamic_query(
     avg_profit_min: Optional[int] = None,
     avg_profit_max: Optional[int] = None,
     y_m: Optional[date] = None,
-) -> List[CommercialDistrictOutput]:
+) -> List[dict]:
     try:
         return crud_select_commercial_district_by_dynamic_query(
             city_id,
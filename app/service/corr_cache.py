@@ -0,0 +1,152 @@
+import asyncio
+import json
+import logging
+import os
+
+import pandas as pd
+from app.crud.loc_info import get_corr_source_data as crud_get_corr_source_data
+from app.crud.loc_info_snapshot import get_loc_info_snapshots
+
+logger = logging.getLogger(__name__)
+
+# 입지 지표 상관분석 캐시
+# 기준 날짜(loc_info.Y_M)별로 전국 상관행렬과 시/군/구별 상관행렬을 한 번만 계산해서
+# CORR_CACHE_DIR/{ref_date}_{signature}.json 에 저장하고, 이후에는 메모리에서 바로 반환한다.
+# signature 는 loc_info 스냅샷의 Y_M 별 (행 수, 최대 id, 최종 수정 시각) 이라
+# loc_info 가 재적재되면 모든 워커가 스냅샷 확인 주기(LOC_INFO_SNAPSHOT_TTL) 안에 다시 계산한다.
+CORR_COLUMNS = [
+    "SALES",
+    "SHOP",
+    "MOVE_POP",
+    "WORK_POP",
+    "INCOME",
+    "SPEND",
+    "HOUSE",
+    "RESIDENT",
+    "APART_PRICE",
+]
+CORR_CACHE_DIR = os.getenv("CORR_CACHE_DIR", "corr_cache")
+
+_corr_cubes = {}  # (ref_date, signature) -> {"national": ..., "by_district": [...], "by_city": {city_id: [...]}}
+_corr_lock = None
+
+
+def _district_corr_records(df):
+    """시/군/구별 상관행렬 (기존 filter_corr 응답 형식과 동일)"""
+    if df.empty:
+        return []
+    matrix = df.groupby("DISTRICT_NAME")[CORR_COLUMNS].corr().fillna('-')
+    return matrix.reset_index().to_dict(orient="records")
+
+
+def build_corr_cube(data):
+    """기준 날짜 하나의 loc_info 지표(컬럼별 배열)로 전국 / 전체 시군구 / 시도별 시군구 상관행렬 계산"""
+    df = pd.DataFrame(data, columns=["CITY_ID", "DISTRICT_NAME", *CORR_COLUMNS])
+
+    return {
+        "national": df[CORR_COLUMNS].corr().fillna('-').to_dict(),
+        "by_district": _district_corr_records(df),
+        # json 저장 시 키가 문자열이 되므로 처음부터 문자열 키 사용
+        "by_city": {
+            str(city_id): _district_corr_records(group)
+            for city_id, group in df.groupby("CITY_ID")
+        },
+    }
+
+
+def _cube_path(ref_date, signature):
+    return os.path.join(CORR_CACHE_DIR, f"{ref_date}_{signature}.json")
+
+
+def _read_cube(ref_date, signature):
+    path = _cube_path(ref_date, signature)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.error(f"corr cache read failed ({path}): {e}")
+        return None
+
+
+def _write_cube(ref_date, signature, cube):
+    os.makedirs(CORR_CACHE_DIR, exist_ok=True)
+    path = _cube_path(ref_date, signature)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cube, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+    # 같은 기준 날짜의 이전 signature 파일 삭제
+    prefix = f"{ref_date}_"
+    for name in os.listdir(CORR_CACHE_DIR):
+        if name.startswith(prefix) and name.endswith(".json") and os.path.join(CORR_CACHE_DIR, name) != path:
+            try:
+                os.remove(os.path.join(CORR_CACHE_DIR, name))
+            except OSError:
+                pass
+
+
+async def _load_cube(ref_date, signature):
+    """파일에 저장된 결과가 있으면 사용, 없으면 스냅샷에서 읽어 계산 후 저장"""
+    cube = await asyncio.to_thread(_read_cube, ref_date, signature)
+    if cube is not None:
+        return cube
+
+    data = await crud_get_corr_source_data(ref_date)
+    cube = await asyncio.to_thread(build_corr_cube, data)
+    try:
+        await asyncio.to_thread(_write_cube, ref_date, signature, cube)
+    except OSError as e:
+        logger.error(f"corr cache write failed ({ref_date}): {e}")
+    return cube
+
+
+async def get_corr_cubes():
+    """기준 날짜 -> 상관분석 결과 (메모리 캐시 -> 파일 -> 스냅샷 계산 순, 스냅샷 signature 가 바뀌면 다시 계산)"""
+    global _corr_lock
+
+    snapshots = await asyncio.to_thread(get_loc_info_snapshots)
+    keys = [(str(ref_date), snapshot.signature) for ref_date, snapshot in snapshots.items()]
+
+    missing = [key for key in keys if key not in _corr_cubes]
+    if missing:
+        if _corr_lock is None:
+            _corr_lock = asyncio.Lock()
+
+        async with _corr_lock:
+            missing = [key for key in keys if key not in _corr_cubes]
+            cubes = await asyncio.gather(*(_load_cube(ref_date, signature) for ref_date, signature in missing))
+            _corr_cubes.update(zip(missing, cubes))
+
+            # 재적재로 바뀐 이전 signature 결과는 메모리에서 제거
+            current = set(keys)
+            for key in [key for key in _corr_cubes if key not in current]:
+                del _corr_cubes[key]
+
+    return {ref_date: _corr_cubes[(ref_date, signature)] for ref_date, signature in keys}
+
+
+async def get_national_corr():
+    """기준 날짜별 전국 상관행렬"""
+    cubes = await get_corr_cubes()
+    return {ref_date: cube["national"] for ref_date, cube in cubes.items()}
+
+
+async def get_district_corr(city_id=None):
+    """기준 날짜별 시/군/구 상관행렬 (city_id 지정 시 해당 시/도만)"""
+    cubes = await get_corr_cubes()
+    if city_id is None:
+        return {ref_date: cube["by_district"] for ref_date, cube in cubes.items()}
+    return {ref_date: cube["by_city"].get(str(city_id), []) for ref_date, cube in cubes.items()}
+
+
+def refresh_corr_cache():
+    """저장된 결과를 지우고 다음 조회 때 다시 계산 (다른 워커는 스냅샷 signature 변경으로 자동 갱신)"""
+    if os.path.isdir(CORR_CACHE_DIR):
+        for name in os.listdir(CORR_CACHE_DIR):
+            if name.endswith(".json"):
+                os.remove(os.path.join(CORR_CACHE_DIR, name))
+
+    _corr_cubes.clear()
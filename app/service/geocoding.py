@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import os
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# 도로명 주소 -> 위경도 (vworld 주소 API)
+# 매장 일괄 등록에서 주소를 동시에 조회하기 위한 비동기 클라이언트.
+# GEOCODER_URL 을 로컬 스텁 서버로 바꾸면 외부 API 없이 확인할 수 있다.
+GEOCODER_URL = os.getenv("GEOCODER_URL", "https://api.vworld.kr/req/address")
+GEOCODER_CONCURRENCY = int(os.getenv("GEOCODER_CONCURRENCY", "8"))
+# 초당 최대 요청 수 (0 이면 제한 없음)
+GEOCODER_RATE_PER_SEC = float(os.getenv("GEOCODER_RATE_PER_SEC", "20"))
+GEOCODER_TIMEOUT = float(os.getenv("GEOCODER_TIMEOUT", "10"))
+GEOCODER_RETRIES = int(os.getenv("GEOCODER_RETRIES", "2"))
+
+
+class RateLimiter:
+    """요청 시작 간격을 1 / rate 초 이상으로 유지"""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate > 0 else 0
+        self.next_at = 0.0
+        self.lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self.interval:
+            return
+        loop = asyncio.get_running_loop()
+        async with self.lock:
+            now = loop.time()
+            delay = self.next_at - now
+            self.next_at = max(now, self.next_at) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+# 이벤트 루프 id -> (루프, semaphore, RateLimiter)
+# 동시에 들어온 일괄 등록 요청도 같은 동시 요청 수 / 초당 요청 수 제한을 나눠 쓴다.
+_throttles = {}
+
+
+def _get_throttle():
+    loop = asyncio.get_running_loop()
+    throttle = _throttles.get(id(loop))
+    if throttle is None or throttle[0] is not loop:
+        throttle = _throttles[id(loop)] = (
+            loop,
+            asyncio.Semaphore(GEOCODER_CONCURRENCY),
+            RateLimiter(GEOCODER_RATE_PER_SEC),
+        )
+    return throttle[1], throttle[2]
+
+
+def parse_coordinates(data):
+    """vworld 응답 -> (longitude, latitude) 문자열, 결과가 없으면 KeyError / TypeError"""
+    point = data["response"]["result"]["point"]
+    return str(point["x"]), str(point["y"])
+
+
+async def _geocode_one(client, semaphore, limiter, road_name):
+    params = {
+        "service": "address",
+        "request": "getcoord",
+        "crs": "epsg:4326",
+        "address": road_name,
+        "format": "json",
+        "type": "road",
+        "key": os.getenv("ROAD_NAME_KEY"),
+    }
+
+    async with semaphore:
+        for attempt in range(GEOCODER_RETRIES + 1):
+            await limiter.wait()
+            try:
+                response = await client.get(GEOCODER_URL, params=params)
+            except httpx.RequestError as e:
+                message = f"위경도 조회 실패 ({e.__class__.__name__})"
+            else:
+                # 429 / 5xx 만 재시도
+                if response.status_code == 200:
+                    try:
+                        return parse_coordinates(response.json()), None
+                    except (KeyError, TypeError, ValueError):
+                        return None, "좌표 파싱 실패"
+                message = "위경도 조회 실패"
+                if response.status_code != 429 and response.status_code < 500:
+                    return None, message
+
+            if attempt < GEOCODER_RETRIES:
+                await asyncio.sleep(0.5 * (attempt + 1))
+
+        return None, message
+
+
+async def geocode_road_names(road_names, transport=None):
+    """
+    도로명 주소 목록 -> {주소: ((longitude, latitude) 또는 None, 오류 메시지)}
+    같은 주소는 한 번만 조회하고, 커넥션 풀 하나로 GEOCODER_CONCURRENCY 개씩 동시에 조회
+    transport : httpx 전송 계층 교체용 (테스트에서 httpx.MockTransport 사용)
+    """
+    unique = list(dict.fromkeys(road_names))
+    if not unique:
+        return {}
+
+    semaphore, limiter = _get_throttle()
+    limits = httpx.Limits(max_connections=GEOCODER_CONCURRENCY, max_keepalive_connections=GEOCODER_CONCURRENCY)
+
+    async with httpx.AsyncClient(limits=limits, timeout=GEOCODER_TIMEOUT, transport=transport) as client:
+        results = await asyncio.gather(*(
+            _geocode_one(client, semaphore, limiter, road_name) for road_name in unique
+        ))
+
+    return dict(zip(unique, results))
@@ -1,20 +1,25 @@
+import asyncio
+import os
+import time
 from fastapi import HTTPException
 from datetime import date
 from app.crud.loc_info import *
 from app.crud.loc_info import (
     select_stat_data_avg,
-    get_all_corr,
     select_info_list as crud_select_info_list,
-    get_filter_corr,
     get_stat_data,
     get_stat_data_by_city,
     get_stat_data_by_distirct,
     get_stat_data_by_sub_distirct,
     get_nation_j_score,
     select_loc_info_data_date as crud_select_loc_info_data_date,
-    select_info_list_similar as crud_select_info_list_similar 
+    select_info_list_similar as crud_select_info_list_similar,
+    select_loc_info_features as crud_select_loc_info_features,
+    get_stat_data_columnar as crud_get_stat_data_columnar,
+    STAT_COLUMNAR_SCOPES,
 )
-import pandas as pd
+import numpy as np
+from app.service.corr_cache import get_national_corr, get_district_corr
 from app.crud.statistics import (
     select_nationwide_jscore_by_stat_item_id_and_sub_district_id as crud_select_nationwide_jscore_by_stat_item_id_and_sub_district_id,
     select_state_item_id as crud_select_state_item_id,
@@ -27,117 +32,191 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-def get_init_stat_data():
-    result = select_stat_data_avg()
-    return result
-
-def get_init_corr_data():
-    years = ['2024-08-01', '2024-10-01', '2024-11-01']
-
-    # 년도별로 결과를 저장하기 위한 딕셔너리
-    all_corr_matrices = {}
-
-    for year in years:
-        # 해당 날짜의 데이터를 가져옴
-        all_corr = get_all_corr(year)
-
-        # 필요한 항목들로 DataFrame 생성 (SALES와 다른 변수들)
-        df_all = pd.DataFrame(
-            all_corr,
-            columns=[
-                "SALES",
-                "SHOP",
-                "MOVE_POP",
-                "WORK_POP",
-                "INCOME",
-                "SPEND",
-                "HOUSE",
-                "RESIDENT",
-                "APART_PRICE"
-            ],
-        )
-        
+# 유사 지역(kNN) 검색에 쓰는 입지 지표
+SIMILAR_FEATURES = ("shop", "move_pop", "sales", "work_pop", "income", "spend", "house", "resident", "apart_price")
+SIMILAR_DEFAULT_K = 10
+SIMILAR_MATRIX_TTL = float(os.getenv("SIMILAR_MATRIX_TTL", "3600"))
 
-        # 전국 상관분석 수행
-        all_corr_matrix = df_all.corr().fillna('-')  # NaN 값을 '-'로 대체
-        all_corr_matrix_dict = all_corr_matrix.to_dict()
-        # 년도별 상관분석 결과를 저장
-        all_corr_matrices[year] = all_corr_matrix_dict
+# 기준 날짜별 정규화된 지표 행렬 캐시 - ref_date -> SimilarMatrix
+_similar_matrices = {}
+_similar_matrix_locks = {}
 
+async def get_init_stat_data():
+    result = await select_stat_data_avg()
+    return result
 
-    return all_corr_matrices
+async def get_init_corr_data():
+    # 기준 날짜별 전국 상관분석 결과 (캐시에서 조회)
+    return await get_national_corr()
 
-def select_info_list(filters: dict):
+async def select_info_list(filters: dict):
     if filters.get('isLikeSearch') == False :
         # 필터링 로직: 필요하면 여기서 추가적인 필터 처리를 할 수 있습니다.
-        filtered_locations = crud_select_info_list(filters)
+        filtered_locations = await crud_select_info_list(filters)
 
-        # 상관 분석 처리
-        years = ['2024-08-01', '2024-10-01', '2024-11-01']
+        # 지역 내 상관 분석 결과 (기준 날짜별, 캐시에서 조회)
+        filter_corr_matrices = await get_district_corr(filters.get("city"))
 
-        # 년도별로 결과를 저장하기 위한 딕셔너리
-        filter_corr_matrices = {}
-
-        for year in years:
-            # 해당 날짜의 데이터를 가져옴
-
-            # 지역 내 상관 분석
-            filter_corr = get_filter_corr(filters, year)
-
-            # 지역 내 분석 수행
-            df_filter = pd.DataFrame(filter_corr)
+        # 필요 시 추가적인 비즈니스 로직을 처리할 수 있음
+        return filtered_locations, filter_corr_matrices
 
-            filter_corr_matrix = df_filter.groupby("DISTRICT_NAME")[
-                [
-                    "SALES",
-                    "SHOP",
-                    "MOVE_POP",
-                    "WORK_POP",
-                    "INCOME",
-                    "SPEND",
-                    "HOUSE",
-                    "RESIDENT",
-                    "APART_PRICE"
-                ]
-            ].corr()
-            
-            # NaN 값을 '-'로 대체
-            filter_corr_matrix = filter_corr_matrix.fillna('-')
+    elif filters.get('similarMode') == "knn" :
+        return await select_info_list_knn(filters)
 
-            # 년도별 지역 내 상관분석 결과를 저장
-            filter_corr_matrix = filter_corr_matrix.reset_index().to_dict(orient="records")
-            filter_corr_matrices[year] = filter_corr_matrix
+    else :
+        filtered_locations, base_data = await crud_select_info_list_similar(filters)
+    return filtered_locations, base_data
 
 
-        # 필요 시 추가적인 비즈니스 로직을 처리할 수 있음
-        return filtered_locations, filter_corr_matrices
+class SimilarMatrix:
+    """기준 날짜 하나의 읍/면/동 지표 행렬 (항목별 z-score, 결측값은 평균 = 0)"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.positions = {}  # sub_district_id -> 행 번호
+        for position, row in enumerate(rows):
+            self.positions.setdefault(row["sub_district_id"], position)
+
+        values = np.array(
+            [[np.nan if row[feature] is None else row[feature] for feature in SIMILAR_FEATURES] for row in rows],
+            dtype=np.float64,
+        ).reshape(len(rows), len(SIMILAR_FEATURES))
+
+        observed = ~np.isnan(values)
+        counts = observed.sum(axis=0)
+        filled = np.where(observed, values, 0.0)
+        mean = filled.sum(axis=0) / np.maximum(counts, 1)
+        std = np.sqrt((np.where(observed, values - mean, 0.0) ** 2).sum(axis=0) / np.maximum(counts, 1))
+        std[std == 0] = 1.0
+
+        self.matrix = np.where(observed, (values - mean) / std, 0.0)
+        self.built_at = time.monotonic()
+
+
+async def get_similar_matrix(ref_date):
+    """기준 날짜의 지표 행렬 - 처음 한 번만 DB 에서 읽고 TTL 동안 재사용"""
+    index = _similar_matrices.get(ref_date)
+    if index is not None and time.monotonic() - index.built_at < SIMILAR_MATRIX_TTL:
+        return index
+
+    lock = _similar_matrix_locks.setdefault(ref_date, asyncio.Lock())
+    async with lock:
+        index = _similar_matrices.get(ref_date)
+        if index is None or time.monotonic() - index.built_at >= SIMILAR_MATRIX_TTL:
+            rows = await crud_select_loc_info_features(ref_date)
+            index = SimilarMatrix(list(rows))
+            _similar_matrices[ref_date] = index
+    return index
+
+
+def _similar_weights(weights):
+    """항목별 가중치 (지정하지 않은 항목은 1, 음수는 0)"""
+    weights = weights or {}
+    return np.array(
+        [max(float(weights.get(feature, 1.0)), 0.0) for feature in SIMILAR_FEATURES],
+        dtype=np.float64,
+    )
+
+
+def find_nearest_regions(index: SimilarMatrix, sub_district_id, k, weights):
+    """기준 읍/면/동과 가중 거리가 가까운 순서로 k 개 (행 번호, 거리) 반환"""
+    position = index.positions.get(sub_district_id)
+    if position is None:
+        return None, []
+
+    distances = np.sqrt(((index.matrix - index.matrix[position]) ** 2) @ weights)
+    distances[position] = np.inf
+
+    k = min(k, len(distances) - 1)
+    if k <= 0:
+        return position, []
+
+    nearest = np.argpartition(distances, k - 1)[:k]
+    nearest = nearest[np.argsort(distances[nearest], kind="stable")]
+    return position, [(int(i), float(distances[i])) for i in nearest]
+
+
+async def select_info_list_knn(filters: dict):
+    """
+    입지 지표(점포수, 유동인구, 매출 ... 아파트 가격) 전체를 기준으로 한 유사 지역 검색
+    선택한 읍/면/동과 기준 날짜별로 가까운 순 k 개를 반환
+    """
+    sub_district_id = filters.get("subDistrict")
+    ref_dates = filters.get("selectedOptions")
+    if sub_district_id is None or not ref_dates:
+        raise HTTPException(status_code=400, detail="유사 지역 검색에는 읍/면/동과 기준 날짜 선택이 필요합니다.")
+
+    k = filters.get("similarK") or SIMILAR_DEFAULT_K
+    weights = _similar_weights(filters.get("similarWeights"))
+
+    indexes = await asyncio.gather(*(get_similar_matrix(ref_date) for ref_date in ref_dates))
+
+    filtered_locations = []
+    base_data = []
+    for index in indexes:
+        position, nearest = find_nearest_regions(index, sub_district_id, k, weights)
+        if position is None:
+            continue
+        base_data.append(index.rows[position])
+        for rank, (i, distance) in enumerate(nearest, start=1):
+            filtered_locations.append({**index.rows[i], "similar_rank": rank, "similar_distance": distance})
+
+    if not base_data:
+        raise HTTPException(status_code=404, detail="선택한 읍/면/동의 입지 지표가 없습니다.")
 
-    else :
-        filtered_locations, base_data = crud_select_info_list_similar(filters)
     return filtered_locations, base_data
 
 
 # 추가 j_score 로직 변경
 
 
-def select_stat_data(filters_dict):
-    result = get_stat_data(filters_dict)
+async def select_stat_data(filters_dict):
+    result = await get_stat_data(filters_dict)
+    return result
+
+async def select_stat_data_by_city(filters_dict):
+    result = await get_stat_data_by_city(filters_dict)
     return result
 
-def select_stat_data_by_city(filters_dict):
-    result = get_stat_data_by_city(filters_dict)
+async def select_stat_data_by_district(filters_dict):
+    result = await get_stat_data_by_distirct(filters_dict)
     return result
 
-def select_stat_data_by_district(filters_dict):
-    result = get_stat_data_by_distirct(filters_dict)
+async def select_stat_data_by_sub_district(filters_dict):
+    result = await get_stat_data_by_sub_distirct(filters_dict)
     return result
 
-def select_stat_data_by_sub_district(filters_dict):
-    result = get_stat_data_by_sub_distirct(filters_dict)
+async def select_nation_j_score(filters_dict):
+    result = await get_nation_j_score(filters_dict)
     return result
 
-def select_nation_j_score(filters_dict):
-    result = get_nation_j_score(filters_dict)
+STAT_COLUMNAR_MAX_LIMIT = 50000
+
+async def select_stat_data_columnar(filters_dict):
+    # 비교 범위 - 지정하지 않으면 기존 /select/list 와 같은 기준으로 결정
+    scope = filters_dict.get("scope")
+    if scope is None:
+        if filters_dict.get("city") is None:
+            scope = "nation"
+        elif filters_dict.get("district") is None:
+            scope = "city"
+        elif filters_dict.get("subDistrict") is None:
+            scope = "district"
+        else:
+            scope = "sub_district"
+    if scope not in STAT_COLUMNAR_SCOPES:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 scope 입니다: {scope}")
+
+    cursor = filters_dict.get("cursor")
+    if cursor is not None and len(cursor) != 3:
+        raise HTTPException(status_code=400, detail="cursor 는 [ref_date, sub_district_id, target_item] 형식이어야 합니다.")
+
+    limit = min(max(int(filters_dict.get("limit") or 5000), 1), STAT_COLUMNAR_MAX_LIMIT)
+
+    result = await crud_get_stat_data_columnar(
+        filters_dict, scope, fields=filters_dict.get("fields"), cursor=cursor, limit=limit
+    )
+    result["scope"] = scope
     return result
 
 
@@ -8,9 +8,9 @@ from app.crud.loc_store import *
 
 
 # 필터로 조회
-def filter_loc_store(filters):
+async def filter_loc_store(filters):
 
-    data = get_filtered_loc_store(
+    data = await get_filtered_loc_store(
         filters.dict()
     )  # 필터 데이터를 딕셔너리로 전달
 
@@ -1,37 +1,36 @@
+from app.crud.id_allocator import (
+    next_store_business_number as crud_next_store_business_number,
+    next_store_business_numbers as crud_next_store_business_numbers,
+)
 from app.crud.loc_store_to_report import (
     match_exist_store as crud_match_exist_store,
     get_category_name as crud_get_category_name,
-    get_max_number as crud_get_max_number, 
     add_new_store as crud_add_new_store,
-    get_store_data as crud_get_store_data,
-    get_city_data as crud_get_city_data,
-    get_loc_info_data as crud_get_loc_info_data,
-    get_loc_info_j_score as crud_get_loc_info_j_score,
-    get_district_move_pop as crud_get_district_move_pop,
-    get_category_data as crud_get_category_data,
-    get_biz_id as crud_get_biz_id,
-    get_biz_category_name as crud_get_biz_category_name,
-    get_ref_date as crud_get_ref_date,
-    get_top5 as crud_get_top5,
-    get_pop_info as crud_get_pop_info,
-    get_mz_j_score as crud_get_mz_j_score,
-    get_commercial_j_score as crud_get_commercial_j_score,
-    get_commercial_count_data as crud_get_commercial_count_data,
-    get_commercial_data as crud_get_commercial_data,
-    get_nation_commercial_data as crud_get_nation_commercial_data,
-    get_top5_sub_district as crud_get_top5_sub_district,
-    get_sub_district_name as crud_get_sub_district_name,
-    get_rising_nation as crud_get_rising_nation,
-    get_rising as crud_get_rising,
-    get_nice_category_name as crud_get_nice_category_name,
-    get_district_name as crud_get_district_name,
-    get_sub_district_name_nation as crud_get_sub_district_name_nation,
-    get_hot_place as crud_get_hot_place,
-    get_hot_place_loc_info as crud_get_hot_place_loc_info,
+    find_existing_stores as crud_find_existing_stores,
+    add_new_stores as crud_add_new_stores,
     insert_into_report as crud_insert_into_report,
+    get_report_source_data as crud_get_report_source_data,
+    get_report_shared_data as crud_get_report_shared_data,
+    select_store_business_numbers_by_filter as crud_select_store_business_numbers_by_filter,
+    replace_reports as crud_replace_reports,
     select_one_store as crud_select_one_store
 )
+from app.schemas.loc_store import AddRequest
+from app.service.geocoding import geocode_road_names
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from fastapi import HTTPException
 from decimal import Decimal
+from pydantic import ValidationError
+import asyncio
+import csv
+import io
+import json
+import openpyxl
+import os
+import re
+import threading
+import uuid
 
 
 
@@ -72,6 +71,22 @@ def match_exist_store(data) :
     return sucess
 
 
+def get_tag_flags(selected):
+    # 초기값은 모두 0
+    tag_flags = {
+        "jsam": 0,
+        "ktmyshop": 0,
+        "PULMUONE": 0
+    }
+
+    # selected 리스트에 포함된 항목이 있으면 해당 플래그를 1로 설정
+    for key in tag_flags:
+        if key in (selected or []):
+            tag_flags[key] = 1
+
+    return tag_flags
+
+
 # 값 넣기
 def add_new_store(data, longitude, latitude):
     city_id = data.city_id
@@ -83,33 +98,12 @@ def add_new_store(data, longitude, latitude):
     small_category_code = data.small_category_code
     store_name = data.store_name
     road_name = data.road_name
-    selected = data.selected or []
-
-    # 초기값은 모두 0
-    tag_flags = {
-        "jsam": 0,
-        "ktmyshop": 0,
-        "PULMUONE": 0
-    }
-
-    # selected 리스트에 포함된 항목이 있으면 해당 플래그를 1로 설정
-    for key in tag_flags:
-        if key in selected:
-            tag_flags[key] = 1
+    tag_flags = get_tag_flags(data.selected)
 
     large_category_name, medium_category_name, small_cateogry_name = crud_get_category_name(small_category_code)
 
-    # MAX 매장 관리 번호 값 뽑기
-    prev_number = crud_get_max_number()  # 예: "JS0012"
-    # print(prev_number)
-    # JS 접두사 제거 + 숫자 변환
-    if prev_number:
-        number = int(prev_number[0]) + 1
-    else:
-        number = 1  # 처음 등록이라면 JS0001부터 시작
-
-    # 다음 store_business_number 구성
-    store_business_number = f"JS{number:04d}"  # JS0013 형식
+    # 매장 관리 번호 발급 (워커별로 미리 예약한 번호 구간에서 하나씩, 예: JS0013)
+    store_business_number = crud_next_store_business_number()
     sucess = crud_add_new_store(
         store_business_number, city_id, district_id, sub_district_id, reference_id, 
         large_category_code, medium_category_code, small_category_code,
@@ -120,20 +114,398 @@ def add_new_store(data, longitude, latitude):
     return sucess, store_business_number
 
 
+
+# 매장 일괄 등록
+BULK_STORE_MAX_ROWS = int(os.getenv("BULK_STORE_MAX_ROWS", "5000"))
+
+
+def _cell_value(value):
+    """엑셀 / CSV 셀 값 -> 앞뒤 공백 제거한 문자열 (빈 값은 None, 12.0 같은 정수형 실수는 12)"""
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    value = str(value).strip()
+    return value or None
+
+
+def parse_store_upload(filename, content):
+    """
+    CSV / XLSX 파일 -> 매장 행 dict 목록
+    첫 행은 AddRequest 필드명 (city_id, district_id, ..., road_name, selected), selected 는 쉼표로 구분
+    """
+    name = (filename or "").lower()
+    if name.endswith((".xlsx", ".xlsm")):
+        workbook = openpyxl.load_workbook(io.BytesIO(content), read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = [_cell_value(cell) for cell in next(rows, ())]
+            records = [
+                dict(zip(header, (_cell_value(cell) for cell in row)))
+                for row in rows
+                if any(_cell_value(cell) is not None for cell in row)
+            ]
+        finally:
+            workbook.close()
+    elif name.endswith(".csv"):
+        reader = csv.DictReader(io.StringIO(content.decode("utf-8-sig")))
+        records = [
+            {_cell_value(key): _cell_value(value) for key, value in row.items()}
+            for row in reader
+            if any(_cell_value(value) is not None for value in row.values())
+        ]
+    else:
+        raise ValueError("CSV 또는 XLSX 파일만 등록할 수 있습니다.")
+
+    for record in records:
+        record.pop(None, None)
+        if isinstance(record.get("selected"), str):
+            record["selected"] = [item.strip() for item in record["selected"].split(",") if item.strip()]
+    return records
+
+
+def _store_key(values):
+    """기존 매장 비교 키 (match_exist_store 조건) - 문자열은 DB 비교처럼 대소문자 / 앞뒤 공백 무시"""
+    return tuple(value.strip().lower() if isinstance(value, str) else value for value in values)
+
+
+def _bulk_result(index, success, message, number=""):
+    return {"index": index, "success": success, "message": message, "number": number}
+
+
+async def add_new_stores_bulk(rows):
+    """
+    매장 여러 개 등록 -> 행별 결과 (index 는 요청 순서)
+    기존 매장 확인은 쿼리 1번, 위경도는 동시 조회, 매장 관리 번호는 한 구간으로 예약 후 한 트랜잭션으로 저장
+    """
+    results = [None] * len(rows)
+
+    # 1. 입력값 검증 + 요청 내 중복 제거
+    candidates = []
+    seen = {}
+    for index, row in enumerate(rows):
+        try:
+            data = row if isinstance(row, AddRequest) else AddRequest.model_validate(row)
+        except ValidationError as e:
+            error = e.errors()[0]
+            field = ".".join(str(loc) for loc in error["loc"])
+            results[index] = _bulk_result(index, False, f"입력값 오류 ({field}: {error['msg']})")
+            continue
+
+        values = (
+            data.city_id, data.district_id, data.sub_district_id,
+            data.large_category_code, data.medium_category_code, data.small_category_code,
+            data.store_name,
+        )
+        key = _store_key(values)
+        if key in seen:
+            results[index] = _bulk_result(index, False, f"요청 내 중복 매장입니다. ({seen[key]}번 행)")
+            continue
+        seen[key] = index
+        candidates.append((index, data, values))
+
+    # 2. 기존 매장 여부 (쿼리 1번)
+    if candidates:
+        existing = await asyncio.to_thread(crud_find_existing_stores, [values for _, _, values in candidates])
+        existing = {_store_key(values) for values in existing}
+        remaining = []
+        for index, data, values in candidates:
+            if _store_key(values) in existing:
+                results[index] = _bulk_result(index, False, "이미 등록된 매장입니다.")
+            else:
+                remaining.append((index, data))
+        candidates = remaining
+
+    # 3. 위경도 조회 (동시 조회)
+    coordinates = await geocode_road_names([data.road_name for _, data in candidates])
+    remaining = []
+    for index, data in candidates:
+        point, message = coordinates[data.road_name]
+        if point is None:
+            results[index] = _bulk_result(index, False, message)
+        else:
+            remaining.append((index, data, point))
+    candidates = remaining
+
+    if candidates:
+        # 4. 업종명 (기준 테이블 캐시) + 매장 관리 번호 일괄 예약
+        category_names = {}
+        for _, data, _ in candidates:
+            if data.small_category_code not in category_names:
+                category_names[data.small_category_code] = await asyncio.to_thread(
+                    crud_get_category_name, data.small_category_code
+                )
+        numbers = await asyncio.to_thread(crud_next_store_business_numbers, len(candidates))
+
+        stores = []
+        for (index, data, (longitude, latitude)), store_business_number in zip(candidates, numbers):
+            large_category_name, medium_category_name, small_category_name = category_names[data.small_category_code]
+            stores.append({
+                "store_business_number": store_business_number,
+                "city_id": data.city_id,
+                "district_id": data.district_id,
+                "sub_district_id": data.sub_district_id,
+                "reference_id": data.reference_id,
+                "large_category_code": data.large_category_code,
+                "medium_category_code": data.medium_category_code,
+                "small_category_code": data.small_category_code,
+                "large_category_name": large_category_name,
+                "medium_category_name": medium_category_name,
+                "small_category_name": small_category_name,
+                "store_name": data.store_name,
+                "road_name": data.road_name,
+                "longitude": longitude,
+                "latitude": latitude,
+                "tag_flags": get_tag_flags(data.selected),
+            })
+
+        # 5. 한 트랜잭션으로 저장 (실패 시 전체 롤백)
+        success = await asyncio.to_thread(crud_add_new_stores, stores)
+        for (index, _, _), store in zip(candidates, stores):
+            if success:
+                results[index] = _bulk_result(index, True, "매장이 성공적으로 등록되었습니다.", store["store_business_number"])
+            else:
+                results[index] = _bulk_result(index, False, "매장 등록 중 오류 발생")
+
+    return results
+
+
 # DB 연동
 def copy_new_store(store_business_number):
+    # 리포트에 필요한 원천 데이터를 커넥션 1개로 일괄 조회
+    source = crud_get_report_source_data(store_business_number)
+    if source is None:
+        return False
+
+    # 조회한 값으로 리포트 row 조립 후 저장
+    report_row = build_report_row(store_business_number, source)
+    sucess = crud_insert_into_report(*report_row)
+
+    return sucess
+
+
+# 리포트 대량 재생성 작업
+# 진행 상황은 프로세스 메모리(report_jobs)에, 대상/완료 목록은 REPORT_JOB_DIR 파일에 남겨서
+# 서버가 재시작돼도 같은 job_id 로 완료되지 않은 매장부터 이어서 실행할 수 있다.
+REPORT_JOB_DIR = os.getenv("REPORT_JOB_DIR", "report_jobs")
+report_jobs = {}
+report_jobs_lock = threading.Lock()
+
+# 워커 프로세스에서 사용하는 공통 데이터 (initializer 에서 한 번 설정)
+_worker_shared = None
+
+
+def _init_report_worker(shared):
+    global _worker_shared
+    _worker_shared = shared
+
 
-    # 매장 데이터 꺼내오기
-    sub_district_id, store_name, road_name, small_category_name, small_category_code, longitude, latitude = crud_get_store_data(store_business_number)
+def _build_report_rows(store_business_numbers):
+    rows = []
+    failed = []
+    for store_business_number in store_business_numbers:
+        try:
+            source = crud_get_report_source_data(store_business_number, _worker_shared)
+            if source is None:
+                failed.append(store_business_number)
+                continue
+            rows.append(build_report_row(store_business_number, source))
+        except Exception as e:
+            print(f"❌ 리포트 생성 실패 ({store_business_number}):", e)
+            failed.append(store_business_number)
+    return rows, failed
 
-    # 지역 명 가져오기
-    city_name, district_name, district_id, sub_district_name = crud_get_city_data(sub_district_id)
 
-    # 입지 정보 값 가져오기
-    shop, move_pop, sales, work_pop, income, spend, house, resident, loc_info_ref_date = crud_get_loc_info_data(sub_district_id)
+# job_id 는 서버에서 만든 uuid4().hex 만 허용 (파일 경로에 그대로 쓰이므로)
+JOB_ID_PATTERN = re.compile(r"[0-9a-f]{32}")
+# 대량 재생성 대상을 좁히는 필터 키 (이 중 하나도 없으면 전국 전체가 되므로 거부)
+REPORT_TARGET_FILTER_KEYS = ("city", "district", "subDistrict", "mainCategory", "subCategory", "detailCategory")
+REPORT_TARGET_TAGS = ("jsam", "ktmyshop", "PULMUONE")
+
+
+def is_valid_job_id(job_id):
+    return isinstance(job_id, str) and JOB_ID_PATTERN.fullmatch(job_id) is not None
+
+
+def _job_path(job_id, ext):
+    return os.path.join(REPORT_JOB_DIR, f"{job_id}.{ext}")
+
+
+def _load_done(job_id):
+    path = _job_path(job_id, "done")
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+def _has_target_filter(filters):
+    if not filters:
+        return False
+    if any(filters.get(key) for key in REPORT_TARGET_FILTER_KEYS):
+        return True
+    return any(option in REPORT_TARGET_TAGS for option in filters.get("selectedOptions") or [])
+
+
+def start_report_regeneration(store_business_numbers=None, filters=None, job_id=None, workers=None, batch_size=50):
+    """
+    리포트 대량 재생성 시작 - job_id 반환
+    job_id 를 넘기면 기존 작업을 이어서 실행 (없는 작업이면 404),
+    새 작업은 매장 번호 목록 또는 지역 / 업종 / 태그 조건이 있는 필터가 필요 (빈 필터로 전국 전체 재생성 불가)
+    """
+    if job_id:
+        if not is_valid_job_id(job_id) or not os.path.exists(_job_path(job_id, "json")):
+            raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+        with open(_job_path(job_id, "json"), encoding="utf-8") as f:
+            spec = json.load(f)
+    else:
+        if store_business_numbers:
+            targets = list(dict.fromkeys(store_business_numbers))
+        elif _has_target_filter(filters):
+            targets = crud_select_store_business_numbers_by_filter(filters)
+        else:
+            raise HTTPException(status_code=400, detail="store_business_numbers 또는 지역 / 업종 / 태그 조건이 필요합니다.")
+        if not targets:
+            raise HTTPException(status_code=400, detail="조건에 맞는 매장이 없습니다.")
+
+        job_id = uuid.uuid4().hex
+        spec = {
+            "job_id": job_id,
+            "store_business_numbers": targets,
+            "workers": workers,
+            "batch_size": batch_size,
+            "created_at": datetime.now().isoformat(),
+        }
+        os.makedirs(REPORT_JOB_DIR, exist_ok=True)
+        with open(_job_path(job_id, "json"), "w", encoding="utf-8") as f:
+            json.dump(spec, f, ensure_ascii=False)
+
+    done = _load_done(job_id)
+
+    # 실행 중 확인과 등록을 한 번에 (같은 작업을 동시에 이어서 실행해도 스레드는 하나만)
+    with report_jobs_lock:
+        if report_jobs.get(job_id, {}).get("status") == "running":
+            return job_id
+        report_jobs[job_id] = {
+            "job_id": job_id,
+            "status": "running",
+            "total": len(spec["store_business_numbers"]),
+            "done": len(done),
+            "failed": [],
+            "started_at": datetime.now().isoformat(),
+            "finished_at": None,
+            "error": None,
+        }
+
+    thread = threading.Thread(target=run_report_regeneration, args=(job_id, spec, done), daemon=True)
+    thread.start()
+    return job_id
+
+
+def run_report_regeneration(job_id, spec, done):
+    pending = [number for number in spec["store_business_numbers"] if number not in done]
+    batch_size = max(1, spec.get("batch_size") or 50)
+    workers = spec.get("workers") or os.cpu_count() or 1
+
+    try:
+        # 전국 공통 데이터(상권 기준 날짜, 전국 뜨는 업종, 가중 평균)는 한 번만 조회
+        shared = crud_get_report_shared_data()
+        chunks = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_report_worker, initargs=(shared,)
+        ) as executor:
+            futures = [executor.submit(_build_report_rows, chunk) for chunk in chunks]
+
+            with open(_job_path(job_id, "done"), "a", encoding="utf-8") as done_file:
+                for future in as_completed(futures):
+                    rows, failed = future.result()
+                    crud_replace_reports(rows)
+
+                    # 저장까지 끝난 매장만 완료 처리
+                    done_file.write("".join(f"{row[0]}\n" for row in rows))
+                    done_file.flush()
+
+                    with report_jobs_lock:
+                        report_jobs[job_id]["done"] += len(rows)
+                        report_jobs[job_id]["failed"].extend(failed)
+
+        status = "completed"
+        error = None
+    except Exception as e:
+        print(f"❌ 리포트 대량 재생성 중 오류 발생 ({job_id}):", e)
+        status = "failed"
+        error = str(e)
+
+    with report_jobs_lock:
+        report_jobs[job_id]["status"] = status
+        report_jobs[job_id]["error"] = error
+        report_jobs[job_id]["finished_at"] = datetime.now().isoformat()
+
+
+def get_report_job(job_id):
+    """작업 진행 상황 조회 (메모리에 없으면 파일 기준으로 계산)"""
+    if not is_valid_job_id(job_id):
+        return None
+
+    with report_jobs_lock:
+        job = report_jobs.get(job_id)
+        if job is not None:
+            return {**job, "failed": list(job["failed"])}
+
+    if not os.path.exists(_job_path(job_id, "json")):
+        return None
+    with open(_job_path(job_id, "json"), encoding="utf-8") as f:
+        spec = json.load(f)
+    total = len(spec["store_business_numbers"])
+    done = len(_load_done(job_id))
+    return {
+        "job_id": job_id,
+        "status": "completed" if done >= total else "stopped",
+        "total": total,
+        "done": done,
+        "failed": [],
+        "started_at": None,
+        "finished_at": None,
+        "error": None,
+    }
+
 
-    resident = resident or 0
-    work_pop = work_pop or 0
+# 리포트 row 조립 (insert_into_report 인자 순서)
+def build_report_row(store_business_number, source):
+    store = source["store"]
+
+    # 매장 데이터
+    store_name = store["STORE_NAME"]
+    road_name = store["ROAD_NAME_ADDRESS"]
+    small_category_name = store["SMALL_CATEGORY_NAME"]
+    longitude = store["LONGITUDE"]
+    latitude = store["LATITUDE"]
+
+    # 지역 명
+    city_name = store["CITY_NAME"]
+    district_name = store["DISTRICT_NAME"]
+    sub_district_name = store["SUB_DISTRICT_NAME"]
+
+    # 카테고리 매핑
+    business_area_category_id = store["BUSINESS_AREA_CATEGORY_ID"]
+    biz_main_category_id = store["BIZ_MAIN_CATEGORY_ID"]
+    biz_sub_category_id = store["BIZ_SUB_CATEGORY_ID"]
+    biz_detail_category_name = store["BIZ_DETAIL_CATEGORY_NAME"]
+
+    # 기준 날짜
+    loc_info_ref_date = store["LOC_INFO_REF_DATE"]
+    nice_biz_map_data_ref_date = store["NICE_BIZ_MAP_DATA_REF_DATE"]
+
+    # 입지 정보 값
+    resident = store["RESIDENT"] or 0
+    work_pop = store["WORK_POP"] or 0
+    move_pop = store["MOVE_POP"] or 0
+    shop = store["SHOP"] or 0
+    income = store["INCOME"] or 0
+    sales = store["SALES"] or 0
+    spend = store["SPEND"] or 0
+    house = store["HOUSE"] or 0
 
     # 0으로 나누기 방지
     total_pop = resident + work_pop
@@ -144,31 +516,44 @@ def copy_new_store(store_business_number):
         loc_info_resident_per = resident / total_pop
         loc_info_work_pop_per = work_pop / total_pop
 
-    # 입지 j-score 값 가져오기
-    loc_info_j_score_average = crud_get_loc_info_j_score(sub_district_id, loc_info_ref_date, 'j_score_average')
+    # 입지 정보 값 가공
+    loc_info_resident_k = resident / 1000
+    loc_info_work_pop_k = work_pop / 1000
+    loc_info_move_pop_k = move_pop / 1000
+    loc_info_shop_k = shop / 1000
+    loc_info_income_won = income / 10000  # 만 단위
+    loc_info_sales_k = sales / 1000
+    loc_info_spend_k = spend / 1000
+    loc_info_house_k = house / 1000
 
-    # 상권 정보 값 가져오기
-    ## 카테고리 엮기
-    
-    ### 상권 정보 분류표 ID 가져오기
-    business_area_category_id = crud_get_category_data(small_category_code)
+    # 입지 j-score
+    loc_info_j_scores = source["loc_info_j_scores"]
+    loc_info_j_score_average = loc_info_j_scores.get("j_score_average")
+    loc_info_resident_j_score = loc_info_j_scores.get("resident")
+    loc_info_work_pop_j_score = loc_info_j_scores.get("work_pop")
+    loc_info_move_pop_j_score = loc_info_j_scores.get("move_pop")
+    loc_info_shop_j_score = loc_info_j_scores.get("shop")
+    loc_info_income_j_score = loc_info_j_scores.get("income")
+    loc_info_spend_j_score = loc_info_j_scores.get("spend")
+    loc_info_sales_j_score = loc_info_j_scores.get("sales")
+    loc_info_house_j_score = loc_info_j_scores.get("house")
 
-    ### 매핑 값 가져오기
-    rep_id = crud_get_biz_id(business_area_category_id)
+    loc_info_district_move_pop = source["district_move_pop"]
 
-    ### 매핑한 NAME 값 가져오기
-    biz_main_category_id, biz_sub_category_id, biz_detail_category_name = crud_get_biz_category_name(rep_id)
+    # MZ 인구 j_score
+    loc_info_mz_j_score = source["mz_j_score"]
 
-    
-    # 상권 정보 날짜값
-    nice_biz_map_data_ref_date = crud_get_ref_date()
-    
-    # 소분류 주문 TOP 메뉴 가져오기
-    top_1, top_2, top_3, top_4, top_5 = crud_get_top5(sub_district_id, rep_id)
+    # 소분류 주문 TOP 메뉴
+    top_menu = source["top_menu"] or {}
+    top_1, top_2, top_3, top_4, top_5 = (top_menu.get(f"TOP_MENU_{i}") for i in range(1, 6))
 
-    # 인구 분포 가져오기
-    m_under_10, m_10, m_20, m_30, m_40, m_50, m_60, population_date =  crud_get_pop_info(sub_district_id, 1)
-    f_under_10, f_10, f_20, f_30, f_40, f_50, f_60, population_date =  crud_get_pop_info(sub_district_id, 2)
+    # 인구 분포 (남: 1, 여: 2)
+    age_columns = ["AGE_UNDER_10s", "AGE_10s", "AGE_20s", "AGE_30s", "AGE_40s", "AGE_50s", "AGE_PLUS_60s"]
+    male = source["population"].get(1, {})
+    female = source["population"].get(2, {})
+    m_under_10, m_10, m_20, m_30, m_40, m_50, m_60 = (male.get(column) for column in age_columns)
+    f_under_10, f_10, f_20, f_30, f_40, f_50, f_60 = (female.get(column) for column in age_columns)
+    population_date = female.get("REF_DATE")
 
     m_population_total = (m_under_10 + m_10 + m_20 + m_30 + m_40 + m_50 + m_60)
     f_population_total = (f_under_10 + f_10 + f_20 + f_30 + f_40 + f_50 + f_60)
@@ -184,218 +569,81 @@ def copy_new_store(store_business_number):
     population_50 = m_50 + f_50
     population_60 = m_60 + f_60
 
-    resident = resident or 0
-    work_pop = work_pop or 0
-    move_pop = move_pop or 0
-    shop = shop or 0
-    income = income or 0
-    sales = sales or 0
-    spend = spend or 0
-    house = house or 0
-
-    # 입지 정보 값 가공
-    loc_info_resident_k = resident / 1000
-    loc_info_work_pop_k = work_pop / 1000
-    loc_info_move_pop_k = move_pop / 1000
-    loc_info_shop_k = shop / 1000
-    loc_info_income_won = income / 10000  # 만 단위
-    loc_info_sales_k = sales / 1000
-    loc_info_spend_k = spend / 1000
-    loc_info_house_k = house / 1000
-    loc_info_resident_k = resident / 1000
-
-    loc_info_resident_j_score = crud_get_loc_info_j_score(sub_district_id, loc_info_ref_date, 'resident')
-    loc_info_work_pop_j_score = crud_get_loc_info_j_score(sub_district_id, loc_info_ref_date, 'work_pop')
-    loc_info_move_pop_j_score = crud_get_loc_info_j_score(sub_district_id, loc_info_ref_date, 'move_pop')
-    loc_info_shop_j_score = crud_get_loc_info_j_score(sub_district_id, loc_info_ref_date, 'shop')
-    loc_info_income_j_score = crud_get_loc_info_j_score(sub_district_id, loc_info_ref_date, 'income')
-    loc_info_spend_j_score = crud_get_loc_info_j_score(sub_district_id, loc_info_ref_date, 'spend')
-    loc_info_sales_j_score = crud_get_loc_info_j_score(sub_district_id, loc_info_ref_date, 'sales')
-    loc_info_house_j_score = crud_get_loc_info_j_score(sub_district_id, loc_info_ref_date, 'house')
-
-    loc_info_district_move_pop = crud_get_district_move_pop(district_id, loc_info_ref_date)
-
-    # MZ 인구 j_score
-    loc_info_mz_j_score = crud_get_mz_j_score(sub_district_id, loc_info_ref_date)
-
     # 상권 정보 j_score
-    commercial_district_j_score_average = crud_get_commercial_j_score(rep_id, 'commercial_district_weighted_average')
-    
-
-
+    nation_commercial = source["nation_commercial"]
+    commercial_district_j_score_average = nation_commercial.get("commercial_district_weighted_average", {}).get("J_SCORE_AVG")
 
     # 상권 정보 대분류 별 값
-    commercial_district_food_count = crud_get_commercial_count_data(sub_district_id, nice_biz_map_data_ref_date, 1)
-    commercial_district_health_count = crud_get_commercial_count_data(sub_district_id, nice_biz_map_data_ref_date, 2)
-    commercial_district_edu_count = crud_get_commercial_count_data(sub_district_id, nice_biz_map_data_ref_date, 3)
-    commercial_district_enter_count = crud_get_commercial_count_data(sub_district_id, nice_biz_map_data_ref_date, 4)
-    commercial_district_life_count = crud_get_commercial_count_data(sub_district_id, nice_biz_map_data_ref_date, 5)
-    commercial_district_retail_count = crud_get_commercial_count_data(sub_district_id, nice_biz_map_data_ref_date, 6)
-
+    category_counts = source["category_counts"]
+    commercial_district_food_count = category_counts.get(1, 0)
+    commercial_district_health_count = category_counts.get(2, 0)
+    commercial_district_edu_count = category_counts.get(3, 0)
+    commercial_district_enter_count = category_counts.get(4, 0)
+    commercial_district_life_count = category_counts.get(5, 0)
+    commercial_district_retail_count = category_counts.get(6, 0)
+
+    commercial = source["commercial"] or {}
+    density = commercial.get("SUB_DISTRICT_DENSITY")
+    market_size = commercial.get("MARKET_SIZE")
+    average_sales = commercial.get("AVERAGE_SALES")
+    average_payment = commercial.get("AVERAGE_PAYMENT")
+    usage_count = commercial.get("USAGE_COUNT")
     (
-        density, market_size, average_sales, average_payment, usage_count,
-        avg_profit_per_mon, avg_profit_per_tue, avg_profit_per_wed, avg_profit_per_thu, avg_profit_per_fri, avg_profit_per_sat, avg_profit_per_sun, 
-        avg_profit_per_06_09, avg_profit_per_09_12, avg_profit_per_12_15, avg_profit_per_15_18, avg_profit_per_18_21, avg_profit_per_21_24, avg_profit_per_24_06, 
-        avg_client_per_m_20, avg_client_per_m_30, avg_client_per_m_40, avg_client_per_m_50, avg_client_per_m_60, 
-        avg_client_per_f_20, avg_client_per_f_30, avg_client_per_f_40, avg_client_per_f_50, avg_client_per_f_60, 
-    ) = crud_get_commercial_data(sub_district_id, rep_id, nice_biz_map_data_ref_date)
-
-
-
-    n_density, density_j_score = crud_get_nation_commercial_data(sub_district_id, rep_id, nice_biz_map_data_ref_date, 'commercial_district_sub_district_density_statistics')
-    n_market_size, market_size_j_score = crud_get_nation_commercial_data(sub_district_id, rep_id, nice_biz_map_data_ref_date, 'commercial_district_market_size_statistics')
-    n_average_sales, average_sales_j_score = crud_get_nation_commercial_data(sub_district_id, rep_id, nice_biz_map_data_ref_date, 'commercial_district_average_sales_statistics')
-    n_average_payment, average_payment_j_score = crud_get_nation_commercial_data(sub_district_id, rep_id, nice_biz_map_data_ref_date, 'commercial_district_average_payment_statistics')
-    n_usage_count, usage_j_score = crud_get_nation_commercial_data(sub_district_id, rep_id, nice_biz_map_data_ref_date, 'commercial_district_useage_count_statistics')
-
-    # 해당 소분류 시군구에서 1등 읍면동
-    # 1. 상위 5개 데이터 조회
-    top_rows = crud_get_top5_sub_district(district_id, nice_biz_map_data_ref_date, rep_id)
-
-    # 2. ID 리스트
-    ids = [row["SUB_DISTRICT_ID"] for row in top_rows]
-    ids += [None] * (5 - len(ids))
-
-    # 3. 이름 리스트
-    names = crud_get_sub_district_name(*ids)
-
-    # 4. 매출 리스트
-    sales = [row["AVERAGE_SALES"] for row in top_rows]
-    sales += [None] * (5 - len(sales))
-
-    # 5. "이름,매출" 문자열 조합
-    top1 = f"{names[0]},{sales[0]}" if names[0] and sales[0] else None
-    top2 = f"{names[1]},{sales[1]}" if names[1] and sales[1] else None
-    top3 = f"{names[2]},{sales[2]}" if names[2] and sales[2] else None
-    top4 = f"{names[3]},{sales[3]}" if names[3] and sales[3] else None
-    top5 = f"{names[4]},{sales[4]}" if names[4] and sales[4] else None
-
-    
-    # 뜨는 업종 MAX 날짜 값
-    top5_rising = crud_get_rising_nation()
-
-    top1_district_id = top5_rising[0]["DISTRICT_ID"]
-    top1_sub_district_id = top5_rising[0]["SUB_DISTRICT_ID"]
-    top1_category_id = top5_rising[0]["CATEGORY_ID"]
-    top1_growth = top5_rising[0]["GROWTH"]
-
-    top2_district_id = top5_rising[1]["DISTRICT_ID"]
-    top2_sub_district_id = top5_rising[1]["SUB_DISTRICT_ID"]
-    top2_category_id = top5_rising[1]["CATEGORY_ID"]
-    top2_growth = top5_rising[1]["GROWTH"]
-
-    top3_district_id = top5_rising[2]["DISTRICT_ID"]
-    top3_sub_district_id = top5_rising[2]["SUB_DISTRICT_ID"]
-    top3_category_id = top5_rising[2]["CATEGORY_ID"]
-    top3_growth = top5_rising[2]["GROWTH"]
-
-    top4_district_id = top5_rising[3]["DISTRICT_ID"]
-    top4_sub_district_id = top5_rising[3]["SUB_DISTRICT_ID"]
-    top4_category_id = top5_rising[3]["CATEGORY_ID"]
-    top4_growth = top5_rising[3]["GROWTH"]
-
-    top5_district_id = top5_rising[4]["DISTRICT_ID"]
-    top5_sub_district_id = top5_rising[4]["SUB_DISTRICT_ID"]
-    top5_category_id = top5_rising[4]["CATEGORY_ID"]
-    top5_growth = top5_rising[4]["GROWTH"]
-
-    nation_top1_name = crud_get_nice_category_name(top1_category_id)
-    nation_top2_name = crud_get_nice_category_name(top2_category_id)
-    nation_top3_name = crud_get_nice_category_name(top3_category_id)
-    nation_top4_name = crud_get_nice_category_name(top4_category_id)
-    nation_top5_name = crud_get_nice_category_name(top5_category_id)
-
-    nation_top1_district_name = crud_get_district_name(top1_district_id)
-    nation_top2_district_name = crud_get_district_name(top2_district_id)
-    nation_top3_district_name = crud_get_district_name(top3_district_id)
-    nation_top4_district_name = crud_get_district_name(top4_district_id)
-    nation_top5_district_name = crud_get_district_name(top5_district_id)
-
-    nation_top1_sub_district_name = crud_get_sub_district_name_nation(top1_sub_district_id)
-    nation_top2_sub_district_name = crud_get_sub_district_name_nation(top2_sub_district_id)
-    nation_top3_sub_district_name = crud_get_sub_district_name_nation(top3_sub_district_id)
-    nation_top4_sub_district_name = crud_get_sub_district_name_nation(top4_sub_district_id)
-    nation_top5_sub_district_name = crud_get_sub_district_name_nation(top5_sub_district_id)
-
-    nation_top1 = f"{nation_top1_district_name},{nation_top1_sub_district_name},{nation_top1_name},{top1_growth}"
-    nation_top2 = f"{nation_top2_district_name},{nation_top2_sub_district_name},{nation_top2_name},{top2_growth}"
-    nation_top3 = f"{nation_top3_district_name},{nation_top3_sub_district_name},{nation_top3_name},{top3_growth}"
-    nation_top4 = f"{nation_top4_district_name},{nation_top4_sub_district_name},{nation_top4_name},{top4_growth}"
-    nation_top5 = f"{nation_top5_district_name},{nation_top5_sub_district_name},{nation_top5_name},{top5_growth}"
-
-    local_rising_top3 = crud_get_rising(sub_district_id)
-
-    local_top1_district_id = local_rising_top3[0]["DISTRICT_ID"]
-    local_top1_sub_district_id = local_rising_top3[0]["SUB_DISTRICT_ID"]
-    local_top1_category_id = local_rising_top3[0]["CATEGORY_ID"]
-    local_top1_growth = local_rising_top3[0]["GROWTH"]
-
-    local_top2_district_id = local_rising_top3[1]["DISTRICT_ID"]
-    local_top2_sub_district_id = local_rising_top3[1]["SUB_DISTRICT_ID"]
-    local_top2_category_id = local_rising_top3[1]["CATEGORY_ID"]
-    local_top2_growth = local_rising_top3[1]["GROWTH"]
+        avg_profit_per_mon, avg_profit_per_tue, avg_profit_per_wed, avg_profit_per_thu, avg_profit_per_fri, avg_profit_per_sat, avg_profit_per_sun,
+    ) = (commercial.get(f"AVG_PROFIT_PER_{day}") for day in ("MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN"))
+    (
+        avg_profit_per_06_09, avg_profit_per_09_12, avg_profit_per_12_15, avg_profit_per_15_18, avg_profit_per_18_21, avg_profit_per_21_24,
+    ) = (commercial.get(f"AVG_PROFIT_PER_{hour}") for hour in ("06_09", "09_12", "12_15", "15_18", "18_21", "21_24"))
+    (
+        avg_client_per_m_20, avg_client_per_m_30, avg_client_per_m_40, avg_client_per_m_50, avg_client_per_m_60,
+    ) = (commercial.get(f"AVG_CLIENT_PER_M_{age}") for age in (20, 30, 40, 50, 60))
+    (
+        avg_client_per_f_20, avg_client_per_f_30, avg_client_per_f_40, avg_client_per_f_50, avg_client_per_f_60,
+    ) = (commercial.get(f"AVG_CLIENT_PER_F_{age}") for age in (20, 30, 40, 50, 60))
+
+    def nation_value(table_name):
+        row = nation_commercial.get(table_name, {})
+        return row.get("AVG_VAL"), row.get("J_SCORE")
+
+    n_density, density_j_score = nation_value('commercial_district_sub_district_density_statistics')
+    n_market_size, market_size_j_score = nation_value('commercial_district_market_size_statistics')
+    n_average_sales, average_sales_j_score = nation_value('commercial_district_average_sales_statistics')
+    n_average_payment, average_payment_j_score = nation_value('commercial_district_average_payment_statistics')
+    n_usage_count, usage_j_score = nation_value('commercial_district_useage_count_statistics')
+
+    rankings = source["rankings"]
+
+    # 해당 소분류 시군구에서 매출 상위 5개 읍면동 "이름,매출"
+    top_sales = rankings["top_sales"] + [{}] * (5 - len(rankings["top_sales"]))
+    top1, top2, top3, top4, top5 = (
+        f"{row['SUB_DISTRICT_NAME']},{row['AVERAGE_SALES']}"
+        if row.get("SUB_DISTRICT_NAME") and row.get("AVERAGE_SALES") else None
+        for row in top_sales[:5]
+    )
 
-    local_top3_district_id = local_rising_top3[2]["DISTRICT_ID"]
-    local_top3_sub_district_id = local_rising_top3[2]["SUB_DISTRICT_ID"]
-    local_top3_category_id = local_rising_top3[2]["CATEGORY_ID"]
-    local_top3_growth = local_rising_top3[2]["GROWTH"]
+    # 뜨는 업종 "시군구,읍면동,업종,증가율"
+    def rising_info(row):
+        if not row:
+            return None
+        growth = round(row["GROWTH_RATE"], 2) if row["GROWTH_RATE"] is not None else None
+        return f"{row['DISTRICT_NAME']},{row['SUB_DISTRICT_NAME']},{row['CATEGORY_NAME']},{growth}"
 
+    nation_rising = rankings["nation_rising"] + [None] * (5 - len(rankings["nation_rising"]))
+    nation_top1, nation_top2, nation_top3, nation_top4, nation_top5 = (rising_info(row) for row in nation_rising[:5])
 
-    local_top1_name = crud_get_nice_category_name(local_top1_category_id)
-    local_top2_name = crud_get_nice_category_name(local_top2_category_id)
-    local_top3_name = crud_get_nice_category_name(local_top3_category_id)
-
-    local_top1_district_name = crud_get_district_name(local_top1_district_id)
-    local_top2_district_name = crud_get_district_name(local_top2_district_id)
-    local_top3_district_name = crud_get_district_name(local_top3_district_id)
-
-    local_top1_sub_district_name = crud_get_sub_district_name_nation(local_top1_sub_district_id)
-    local_top2_sub_district_name = crud_get_sub_district_name_nation(local_top2_sub_district_id)
-    local_top3_sub_district_name = crud_get_sub_district_name_nation(local_top3_sub_district_id)
-
-    local_top1 = f"{local_top1_district_name},{local_top1_sub_district_name},{local_top1_name},{local_top1_growth}"
-    local_top2 = f"{local_top2_district_name},{local_top2_sub_district_name},{local_top2_name},{local_top2_growth}"
-    local_top3 = f"{local_top3_district_name},{local_top3_sub_district_name},{local_top3_name},{local_top3_growth}"
-
-
-    hot_place_top5 = crud_get_hot_place(district_id, loc_info_ref_date)
-
-    hot_place_top1_sub_district_id = hot_place_top5[0]["SUB_DISTRICT_ID"]
-    hot_place_top1_j_score = hot_place_top5[0]["J_SCORE_NON_OUTLIERS"]
-
-    hot_place_top2_sub_district_id = hot_place_top5[1]["SUB_DISTRICT_ID"]
-    hot_place_top2_j_score = hot_place_top5[1]["J_SCORE_NON_OUTLIERS"]
-
-    hot_place_top3_sub_district_id = hot_place_top5[2]["SUB_DISTRICT_ID"]
-    hot_place_top3_j_score = hot_place_top5[2]["J_SCORE_NON_OUTLIERS"]
-
-    hot_place_top4_sub_district_id = hot_place_top5[3]["SUB_DISTRICT_ID"]
-    hot_place_top4_j_score = hot_place_top5[3]["J_SCORE_NON_OUTLIERS"]
-
-    hot_place_top5_sub_district_id = hot_place_top5[4]["SUB_DISTRICT_ID"]
-    hot_place_top5_j_score = hot_place_top5[4]["J_SCORE_NON_OUTLIERS"]
-
-    hot_place_top1_sub_district_name = crud_get_sub_district_name_nation(hot_place_top1_sub_district_id)
-    hot_place_top2_sub_district_name = crud_get_sub_district_name_nation(hot_place_top2_sub_district_id)
-    hot_place_top3_sub_district_name = crud_get_sub_district_name_nation(hot_place_top3_sub_district_id)
-    hot_place_top4_sub_district_name = crud_get_sub_district_name_nation(hot_place_top4_sub_district_id)
-    hot_place_top5_sub_district_name = crud_get_sub_district_name_nation(hot_place_top5_sub_district_id)
-
-    hot_place_top1_move_pop, hot_place_top1_sales = crud_get_hot_place_loc_info(hot_place_top1_sub_district_id, loc_info_ref_date)
-    hot_place_top2_move_pop, hot_place_top2_sales = crud_get_hot_place_loc_info(hot_place_top2_sub_district_id, loc_info_ref_date)
-    hot_place_top3_move_pop, hot_place_top3_sales = crud_get_hot_place_loc_info(hot_place_top3_sub_district_id, loc_info_ref_date)
-    hot_place_top4_move_pop, hot_place_top4_sales = crud_get_hot_place_loc_info(hot_place_top4_sub_district_id, loc_info_ref_date)
-    hot_place_top5_move_pop, hot_place_top5_sales = crud_get_hot_place_loc_info(hot_place_top5_sub_district_id, loc_info_ref_date)
-
-    hot_place_top1_info = f"{hot_place_top1_sub_district_name},{hot_place_top1_move_pop},{hot_place_top1_sales},{hot_place_top1_j_score}"
-    hot_place_top2_info = f"{hot_place_top2_sub_district_name},{hot_place_top2_move_pop},{hot_place_top2_sales},{hot_place_top2_j_score}"
-    hot_place_top3_info = f"{hot_place_top3_sub_district_name},{hot_place_top3_move_pop},{hot_place_top3_sales},{hot_place_top3_j_score}"
-    hot_place_top4_info = f"{hot_place_top4_sub_district_name},{hot_place_top4_move_pop},{hot_place_top4_sales},{hot_place_top4_j_score}"
-    hot_place_top5_info = f"{hot_place_top5_sub_district_name},{hot_place_top5_move_pop},{hot_place_top5_sales},{hot_place_top5_j_score}"
+    local_rising = rankings["local_rising"] + [None] * (3 - len(rankings["local_rising"]))
+    local_top1, local_top2, local_top3 = (rising_info(row) for row in local_rising[:3])
 
+    # 핫플레이스 "읍면동,유동인구,매출,j_score"
+    hot_place = rankings["hot_place"] + [None] * (5 - len(rankings["hot_place"]))
+    (
+        hot_place_top1_info, hot_place_top2_info, hot_place_top3_info, hot_place_top4_info, hot_place_top5_info,
+    ) = (
+        f"{row['SUB_DISTRICT_NAME']},{row['MOVE_POP']},{row['SALES']},{row['J_SCORE_NON_OUTLIERS']}" if row else None
+        for row in hot_place[:5]
+    )
 
-    # 리포트에 넣기
-    sucess = crud_insert_into_report(
+    return (
         store_business_number, city_name, district_name, sub_district_name,
         small_category_name, store_name, road_name, latitude, longitude, business_area_category_id, biz_detail_category_name, biz_main_category_id, biz_sub_category_id,
         top_1, top_2, top_3, top_4, top_5,
@@ -16,7 +16,9 @@ from app.crud.population import (
 from app.crud.loc_store import (
     select_loc_info_report_data_by_sub_district_id as crud_select_loc_info_report_data_by_sub_district_id,
 )
+import io
 import logging
+import xlsxwriter
 
 logger = logging.getLogger(__name__)
 
@@ -25,7 +27,7 @@ async def filter_population_data(filters: dict):
     # print("서비스 전")
     try:
         # select/population.py의 쿼리 함수 호출
-        results = get_filtered_population_data(filters)
+        results = await get_filtered_population_data(filters)
         return results
     except Exception as e:
         raise Exception(f"Error in filtering population data: {str(e)}")
@@ -34,13 +36,37 @@ async def filter_population_data(filters: dict):
 # 엑셀 다운
 async def download_data(filters: dict):
     try:
-        results = download_data_ex(filters)
+        results = await download_data_ex(filters)
         # print("엑셀 다운 로드 후")
         return results
     except Exception as e:
         raise Exception(f"Error in filtering population data: {str(e)}")
 
 
+# 엑셀 다운 (스트리밍) - 서버 측 커서로 읽은 청크를 바로 시트에 기록
+async def download_excel(filters: dict, column_names):
+    output = io.BytesIO()
+    # constant_memory : 기록이 끝난 행은 임시 파일로 내보내서 메모리에 쌓지 않음
+    workbook = xlsxwriter.Workbook(output, {"constant_memory": True, "default_date_format": "yyyy-mm-dd"})
+    try:
+        worksheet = workbook.add_worksheet()
+        header_format = workbook.add_format({"bold": True, "border": 1, "align": "center", "valign": "top"})
+        worksheet.write_row(0, 0, column_names, header_format)
+
+        row_index = 1
+        async for rows in stream_download_data_ex(filters):
+            for row in rows:
+                worksheet.write_row(row_index, 0, row)
+                row_index += 1
+    except Exception as e:
+        raise Exception(f"Error in filtering population data: {str(e)}")
+    finally:
+        workbook.close()
+
+    output.seek(0)
+    return output
+
+
 # 기준 날짜 조회
 def select_population_data_date() -> List[PopulationDataDate]:
     try:
@@ -12,7 +12,6 @@ from app.crud.rising_business import (
 )
 from app.schemas.rising_business import (
     RisingBusinessDataDate,
-    RisingBusinessOutput,
 )
 
 logger = logging.getLogger(__name__)
@@ -31,7 +30,7 @@ def select_all_rising_business_by_dynamic_query(
     rank_min: Optional[int] = None,
     rank_max: Optional[int] = None,
     y_m: Optional[date] = None,
-) -> List[RisingBusinessOutput]:
+) -> List[dict]:
     try:
         if search_cate:
             cate_list = crud_get__all_biz_categories_id_like_biz_detail_category_name(
@@ -1,5 +1,10 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import date
+import json
+import os
+import time
 import numpy as np
+import pandas as pd
 from tqdm import tqdm
 from app.crud.biz_detail_category import (
     select_biz_detail_category_id_by_biz_detail_category_name as crud_select_biz_detail_category_id_by_biz_detail_category_name,
@@ -25,6 +30,8 @@ from app.crud.district import get_district_id as crud_get_district_id
 from app.crud.stat_item import (
     select_detail_category_id_by_stat_item_id as crud_select_detail_category_id_by_stat_item_id,
     select_stat_item_info_by_stat_item_id as crud_select_stat_item_info_by_stat_item_id,
+    select_stat_item_info_by_stat_item_ids as crud_select_stat_item_info_by_stat_item_ids,
+    select_commercial_stat_item_ids as crud_select_commercial_stat_item_ids,
 )
 from app.crud.statistics import (
     select_statistics_data_by_sub_district_id_detail_category_id as crud_select_statistics_data_by_sub_district_id_detail_category_id,
@@ -211,18 +218,18 @@ def fetch_move_pop(sub_district_id):
 ################## 입지 정보 통계 값 조회 #############################
 
 
-def select_stat_data(filters_dict):
-    result = get_stat_data(filters_dict)
+async def select_stat_data(filters_dict):
+    result = await get_stat_data(filters_dict)
     return result
 
 
-def select_stat_data_by_city(filters_dict):
-    result = get_stat_data_by_city(filters_dict)
+async def select_stat_data_by_city(filters_dict):
+    result = await get_stat_data_by_city(filters_dict)
     return result
 
 
-def select_stat_data_by_district(filters_dict):
-    result = get_stat_data_by_distirct(filters_dict)
+async def select_stat_data_by_district(filters_dict):
+    result = await get_stat_data_by_distirct(filters_dict)
     return result
 
 
@@ -298,6 +305,80 @@ def calculate_statistics(data):
     }
 
 
+################## 지역별 통계 값 한 번에 구하기 ###################
+def calculate_grouped_statistics(rows, group_count):
+    """
+    rows : (그룹 키 ..., 값) 목록, 앞의 group_count 개 컬럼이 그룹 키
+    반환 : {그룹 키: calculate_statistics 와 같은 형식의 dict}
+    (그룹 키가 하나면 키는 값 그대로, 여러 개면 튜플)
+    """
+    key_columns = [f"key_{i}" for i in range(group_count)]
+    frame = pd.DataFrame(list(rows), columns=[*key_columns, "value"])
+    frame["value"] = frame["value"].astype(float)
+    frame = frame.dropna(subset=["value"])
+
+    grouped = frame.groupby(key_columns if group_count > 1 else key_columns[0])["value"]
+    # np.std 와 같이 모표준편차 (ddof=0)
+    aggregated = pd.DataFrame({
+        "average": grouped.mean(),
+        "median": grouped.median(),
+        "stddev": grouped.std(ddof=0),
+        "max": grouped.max(),
+        "min": grouped.min(),
+    })
+
+    return {
+        key: {name: float(value) for name, value in stats.items()}
+        for key, stats in aggregated.to_dict(orient="index").items()
+    }
+
+
+################## j_score 순위 계산 ###################
+def calculate_j_scores(values):
+    """
+    j_score = 10 * ((전체 수 + 1 - 순위) / 전체 수), 0 이하 값은 0
+
+    values : 1차원(지역) 또는 2차원(지역 x 통계 항목) 배열, 열 단위로 계산
+             None 은 0, NaN 은 데이터 없음으로 보고 순위/전체 수에서 제외 (결과도 NaN)
+    순위는 내림차순 정렬에서 같은 값이 처음 나오는 위치 (ranked_counts.index(value) + 1 과 동일)
+    """
+    x = np.asarray(values)
+    if x.dtype == object:
+        x = np.frompyfunc(lambda value: 0 if value is None else value, 1, 1)(x)
+    x = x.astype(float)
+
+    one_dimension = x.ndim == 1
+    if one_dimension:
+        x = x[:, None]
+
+    row_count = x.shape[0]
+    if row_count == 0:
+        return x[:, 0] if one_dimension else x
+
+    # 내림차순 정렬 (NaN 은 맨 뒤)
+    order = np.argsort(-x, axis=0, kind="stable")
+    sorted_values = np.take_along_axis(x, order, axis=0)
+
+    # 같은 값이 이어지는 구간의 시작 위치를 순위로 사용
+    run_start = np.ones(sorted_values.shape, dtype=bool)
+    run_start[1:] = sorted_values[1:] != sorted_values[:-1]
+    positions = np.arange(row_count)[:, None]
+    sorted_ranks = np.maximum.accumulate(np.where(run_start, positions, 0), axis=0) + 1
+
+    ranks = np.empty_like(sorted_ranks)
+    np.put_along_axis(ranks, order, sorted_ranks, axis=0)
+
+    missing = np.isnan(x)
+    totals = (~missing).sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        j_scores = 10 * ((totals + 1 - ranks) / totals)
+
+    j_scores = np.where(x > 0, j_scores, 0.0)
+    j_scores = np.where(missing, np.nan, j_scores)
+
+    return j_scores[:, 0] if one_dimension else j_scores
+
+
 ################### 전국 단위 j_score 계산 후 인서트 #######################
 def get_j_score_national(stat_item_id):
     national_data = get_all_city_district_sub_district()
@@ -305,29 +386,14 @@ def get_j_score_national(stat_item_id):
     # data는 city_id, district_id, sub_district_id, count로 구성된 리스트
     data = get_j_score_national_data(national_data)
 
-    # 원하는 컬럼만 추출하여 별도의 리스트 생성
-    counts = [item[-1] for item in data]
-
-    # 데이터 기준으로 순위 계산
-    ranked_counts = sorted(counts, reverse=True)  # 내림차순으로 정렬
-
-    j_score_data_nation = []
-
-    for city_id, district_id, sub_district_id, j_column in data:
-        if j_column > 0:
-            # 해당 매장 수의 순위
-            rank = ranked_counts.index(j_column) + 1
-            totals = len(counts)
+    # 데이터 기준으로 순위 계산 후 j_score 계산 (값이 0 이하면 j_score 도 0)
+    j_scores = calculate_j_scores([item[-1] for item in data])
 
-            # j_score 계산
-            j_score = 10 * ((totals + 1 - rank) / totals)
-        else:
-            j_score = 0  # 매장 수가 0인 경우 j_score도 0
-
-        # j_score_data에 (city_id, district_id, sub_district_id, count, j_score) 형태로 추가
-        j_score_data_nation.append(
-            (stat_item_id, city_id, district_id, sub_district_id, j_score)
-        )
+    # j_score_data에 (stat_item_id, city_id, district_id, sub_district_id, j_score) 형태로 추가
+    j_score_data_nation = [
+        (stat_item_id, city_id, district_id, sub_district_id, float(j_score))
+        for (city_id, district_id, sub_district_id, _), j_score in zip(data, j_scores)
+    ]
 
     # print(j_score_data_nation)
     # insert_j_score_nation(j_score_data_nation)
@@ -340,8 +406,9 @@ def get_city_district_and_national_statistics(stat_item_id):
     """
     전국 통계와 시/군/구별 통계를 계산하는 함수
     """
-    # 1. 전국 데이터를 가져와 통계 계산
-    national_data = get_national_data()
+    # 1. 전국 데이터를 (시/도, 시/군/구) id 와 함께 한 번만 가져와 통계 계산
+    national_rows = get_national_data_by_region()
+    national_data = [value for _, _, value in national_rows]
     national_stats = calculate_statistics(national_data)
 
     # 2. 전국 단위 통계값 업데이트
@@ -352,19 +419,18 @@ def get_city_district_and_national_statistics(stat_item_id):
     # 3. 모든 시/도 값 가져옴
     city_value = fetch_city()
 
-    # 4. 시/도 별 통계 계산
-    city_stat_list = []
-    for city_id in city_value:
-        city_data = get_city_data(city_id)
-        city_stats = calculate_statistics(city_data)
-        city_stat_list.append(
-            {
-                "city_id": city_id,
-                "statistics": city_stats,
-            }
-        )
+    # 4. 시/도 별 통계 계산 (groupby 한 번, 데이터가 없는 시/도는 빈 통계)
+    empty_stats = calculate_statistics([])
+    city_stats = calculate_grouped_statistics(
+        ((city_id, value) for city_id, _, value in national_rows), 1
+    )
     city_stat_list = [
-        {"stat_item_id": stat_item_id, **entry} for entry in city_stat_list
+        {
+            "stat_item_id": stat_item_id,
+            "city_id": city_id,
+            "statistics": city_stats.get(city_id, empty_stats),
+        }
+        for city_id in city_value
     ]
 
     # 5. 시/도 별 통계 값 인서트
@@ -374,17 +440,15 @@ def get_city_district_and_national_statistics(stat_item_id):
     city_district_pairs = fetch_city_district_pairs()
 
     # 7. 시/군/구별 통계 계산
-    city_district_stats_list = []
-    for city_id, district_id in city_district_pairs:
-        city_district_data = get_city_district_data(city_id, district_id)
-        city_district_stats = calculate_statistics(city_district_data)
-        city_district_stats_list.append(
-            {
-                "city_id": city_id,
-                "district_id": district_id,
-                "statistics": city_district_stats,
-            }
-        )
+    city_district_stats = calculate_grouped_statistics(national_rows, 2)
+    city_district_stats_list = [
+        {
+            "city_id": city_id,
+            "district_id": district_id,
+            "statistics": city_district_stats.get((city_id, district_id), empty_stats),
+        }
+        for city_id, district_id in city_district_pairs
+    ]
 
     # 8. 시/군/구 별 통계 값 인서트
     city_district_stats_list = [
@@ -418,25 +482,14 @@ def get_j_score_for_region(stat_item_id):
         # (city_id, district_id, total_count) 형태로 리스트에 추가
         data.append((city_id, district_id, total_count))
 
-    # 매장 수 기준으로 순위 계산 (내림차순)
-    counts = [item[2] for item in data]
-    ranked_counts = sorted(counts, reverse=True)
-
-    j_score_data_region = []
-
-    for city_id, district_id, count in data:
-        if count > 0:
-            # 해당 매장 수의 순위
-            rank = ranked_counts.index(count) + 1
-            totals = len(counts)
+    # 매장 수 기준으로 순위 계산 (내림차순) 후 j_score 계산
+    j_scores = calculate_j_scores([item[2] for item in data])
 
-            # j_score 계산
-            j_score = 10 * ((totals + 1 - rank) / totals)
-        else:
-            j_score = 0  # 매장 수가 0인 경우 j_score도 0
-
-        # j_score_data에 (city_id, district_id, count, j_score) 형태로 추가
-        j_score_data_region.append((stat_item_id, city_id, district_id, None, j_score))
+    # j_score_data에 (stat_item_id, city_id, district_id, None, j_score) 형태로 추가
+    j_score_data_region = [
+        (stat_item_id, city_id, district_id, None, float(j_score))
+        for (city_id, district_id, _), j_score in zip(data, j_scores)
+    ]
 
     # print(j_score_data_region)
     update_j_score_data_region(j_score_data_region)
@@ -456,34 +509,14 @@ def get_j_score_national_mz_population(stat_item_id):
     # 2. 전국 지역 id 값으로 mz 세대 인구 읍면동 별 값 가져오기
     data = get_j_score_national_data_mz(national_data)
 
-    # 3. 전국의 동별 mz 세대 인구 j_score 값 계산
-    counts = [
-        item[-1] if item[-1] is not None else 0 for item in data
-    ]  # None 값을 0으로 변환
-
-    # 데이터 기준으로 순위 계산
-    ranked_counts = sorted(counts, reverse=True)  # 내림차순으로 정렬
+    # 3. 전국의 동별 mz 세대 인구 j_score 값 계산 (None 값은 0 으로 처리)
+    j_scores = calculate_j_scores([item[-1] for item in data])
 
-    j_score_data_nation_mz = []
-
-    for city_id, district_id, sub_district_id_mz, j_column in data:
-        # None 값을 0으로 처리
-        j_column = j_column if j_column is not None else 0
-
-        if j_column > 0:
-            # 해당 mz_population의 순위
-            rank = ranked_counts.index(j_column) + 1
-            totals = len(counts)
-
-            # j_score 계산
-            j_score = 10 * ((totals + 1 - rank) / totals)
-        else:
-            j_score = 0  # mz_population이 0인 경우 j_score도 0
-
-        # j_score_data에 (stat_item_id, city_id, district_id, sub_district_id, j_score) 형태로 추가
-        j_score_data_nation_mz.append(
-            (stat_item_id, city_id, district_id, sub_district_id_mz, j_score)
-        )
+    # j_score_data에 (stat_item_id, city_id, district_id, sub_district_id, j_score) 형태로 추가
+    j_score_data_nation_mz = [
+        (stat_item_id, city_id, district_id, sub_district_id_mz, float(j_score))
+        for (city_id, district_id, sub_district_id_mz, _), j_score in zip(data, j_scores)
+    ]
 
     insert_j_score_nation(j_score_data_nation_mz)
     # print(j_score_data_nation_mz)
@@ -496,25 +529,24 @@ def get_city_district_and_national_statistics_mz_population(stat_item_id):
     """
     전국 통계와 시/군/구별 통계를 계산하는 함수
     """
-    # 1. 전국 데이터를 가져와 통계 계산
-    national_data = get_national_data_mz_population()
-    national_stats = calculate_statistics(national_data)
+    # 1. 전국 데이터를 (시/도, 시/군/구) id 와 함께 한 번만 가져와 통계 계산
+    national_rows = get_national_data_mz_population_by_region()
+    national_stats = calculate_statistics([value for _, _, value in national_rows])
 
     # 2. 모든 시/군/구(city_id, district_id) 쌍을 가져옴
     city_district_pairs = fetch_city_district_pairs()
 
-    # 3. 시/군/구별 통계 계산
-    city_district_stats_list = []
-    for city_id, district_id in city_district_pairs:
-        city_district_data = get_city_district_data_mz_population(city_id, district_id)
-        city_district_stats = calculate_statistics(city_district_data)
-        city_district_stats_list.append(
-            {
-                "city_id": city_id,
-                "district_id": district_id,
-                "statistics": city_district_stats,
-            }
-        )
+    # 3. 시/군/구별 통계 계산 (groupby 한 번)
+    empty_stats = calculate_statistics([])
+    city_district_stats = calculate_grouped_statistics(national_rows, 2)
+    city_district_stats_list = [
+        {
+            "city_id": city_id,
+            "district_id": district_id,
+            "statistics": city_district_stats.get((city_id, district_id), empty_stats),
+        }
+        for city_id, district_id in city_district_pairs
+    ]
 
     # 전국 단위 통계값 업데이트
     national_stats = {"stat_item_id": stat_item_id, **national_stats}
@@ -552,25 +584,14 @@ def get_j_score_for_region_mz_population(stat_item_id):
         # (city_id, district_id, total_count) 형태로 리스트에 추가
         data.append((city_id, district_id, total_count))
 
-    # 매장 수 기준으로 순위 계산 (내림차순)
-    counts = [item[2] for item in data]
-    ranked_counts = sorted(counts, reverse=True)
-
-    j_score_data_region = []
+    # 매장 수 기준으로 순위 계산 (내림차순) 후 j_score 계산
+    j_scores = calculate_j_scores([item[2] for item in data])
 
-    for city_id, district_id, count in data:
-        if count > 0:
-            # 해당 매장 수의 순위
-            rank = ranked_counts.index(count) + 1
-            totals = len(counts)
-
-            # j_score 계산
-            j_score = 10 * ((totals + 1 - rank) / totals)
-        else:
-            j_score = 0  # 매장 수가 0인 경우 j_score도 0
-
-        # j_score_data에 (city_id, district_id, count, j_score) 형태로 추가
-        j_score_data_region.append((stat_item_id, city_id, district_id, None, j_score))
+    # j_score_data에 (stat_item_id, city_id, district_id, None, j_score) 형태로 추가
+    j_score_data_region = [
+        (stat_item_id, city_id, district_id, None, float(j_score))
+        for (city_id, district_id, _), j_score in zip(data, j_scores)
+    ]
     # print(j_score_data_region)
     update_j_score_data_region(j_score_data_region)
 
@@ -603,37 +624,14 @@ def get_j_score_national_commercial_distirct(stat_item_id: int):
 
     # print(data)
 
-    # 원하는 컬럼만 추출하여 별도의 리스트 생성
-    counts = [item[-1] for item in data]
-
-    # 데이터 기준으로 순위 계산
-    ranked_counts = sorted(counts, reverse=True)  # 내림차순으로 정렬
-
-    j_score_data_nation = []
-
-    for city_id, district_id, sub_district_id, j_column in data:
-        if j_column > 0:
-            # 해당 매장 수의 순위
-            rank = ranked_counts.index(j_column) + 1
-            totals = len(counts)
-
-            # j_score 계산
-            j_score = 10 * ((totals + 1 - rank) / totals)
-        else:
-            j_score = 0
-
-        # j_score_data에 (city_id, district_id, sub_district_id, count, j_score) 형태로 추가
-        j_score_data_nation.append(
-            (
-                stat_item_id,
-                city_id,
-                district_id,
-                sub_district_id,
-                j_score,
-                1,
-                "2024-08-01",
-            )
-        )
+    # 데이터 기준으로 순위 계산 후 j_score 계산
+    j_scores = calculate_j_scores([item[-1] for item in data])
+
+    # j_score_data에 (stat_item_id, city_id, district_id, sub_district_id, j_score, ...) 형태로 추가
+    j_score_data_nation = [
+        (stat_item_id, city_id, district_id, sub_district_id, float(j_score), 1, "2024-08-01")
+        for (city_id, district_id, sub_district_id, _), j_score in zip(data, j_scores)
+    ]
 
     # print(j_score_data_nation)
     # insert_j_score_nation(j_score_data_nation)
@@ -641,6 +639,34 @@ def get_j_score_national_commercial_distirct(stat_item_id: int):
     return j_score_data_nation
 
 
+def get_j_score_national_commercial_district_all(stat_item_ids):
+    """
+    여러 상권 통계 항목의 전국 j_score 를 (읍/면/동 x 통계 항목) 행렬로 한 번에 계산
+    항목별 결과 형식은 get_j_score_national_commercial_distirct 와 동일 {stat_item_id: [...]}
+    """
+    national_data = get_all_city_district_sub_district()
+
+    # 항목 정보는 한 번에, 값은 테이블 하나당 쿼리 한 번으로 읽음 (데이터가 없는 칸은 NaN)
+    stat_item_infos = crud_select_stat_item_info_by_stat_item_ids(stat_item_ids)
+    matrix = get_j_score_national_matrix(
+        national_data,
+        [(stat_item_id, stat_item_infos.get(stat_item_id)) for stat_item_id in stat_item_ids],
+    )
+    present = ~np.isnan(matrix)
+
+    j_scores = calculate_j_scores(matrix)
+
+    j_score_data = {}
+    for column, stat_item_id in enumerate(stat_item_ids):
+        rows = np.flatnonzero(present[:, column])
+        j_score_data[stat_item_id] = [
+            (stat_item_id, *national_data[row], float(j_scores[row, column]), 1, "2024-08-01")
+            for row in rows
+        ]
+
+    return j_score_data
+
+
 def get_city_district_and_national_statistics_commercial_district(stat_item_id):
     # 1. 전국 데이터를 가져와 통계 계산
     stat_item_info = crud_select_stat_item_info_by_stat_item_id(stat_item_id)
@@ -670,28 +696,115 @@ def get_city_district_and_national_statistics_commercial_district(stat_item_id):
     }
 
 
-def loop_commercial_district_statistics():
-    statistics_start_id, statistics_end_id = 11, 1699
-    for idx in tqdm(
-        range(statistics_start_id, statistics_end_id + 1), desc="Processing"
-    ):
-        tqdm.write(f"Currently processing idx: {idx}")
-        get_j_score_national_commercial_distirct(idx)
+################## 상권 통계 일괄 실행 (프로세스 병렬 + 체크포인트) ###################
+# 완료된 stat_item_id 와 항목별 소요 시간을 STATISTICS_STATE_DIR/{job_name}.json 에 기록해서
+# 중간에 죽어도 같은 job_name 으로 다시 실행하면 남은 항목부터 이어서 처리한다.
+STATISTICS_STATE_DIR = os.getenv("STATISTICS_STATE_DIR", "statistics_state")
+# 동시에 DB 를 쓰는 워커 프로세스 수 상한
+STATISTICS_MAX_WORKERS = int(os.getenv("STATISTICS_MAX_WORKERS", "4"))
+
+
+def _run_j_score_national_shard(stat_item_ids):
+    # 전국 j_score 는 항목 묶음을 행렬 하나로 계산 - 항목별로 나눌 수 없어 묶음 단위로 성공 / 실패, 시간은 항목 수로 나눈 값
+    started = time.perf_counter()
+    try:
+        get_j_score_national_commercial_district_all(stat_item_ids)
+        error = None
+    except Exception as e:
+        error = str(e)
+    seconds = (time.perf_counter() - started) / max(len(stat_item_ids), 1)
+    return [(stat_item_id, seconds, error) for stat_item_id in stat_item_ids]
+
+
+def _run_national_statistics_shard(stat_item_ids):
+    # 항목마다 따로 커밋되므로 시간 / 오류도 항목별로 기록 (하나가 실패해도 나머지는 계속)
+    results = []
+    for stat_item_id in stat_item_ids:
+        started = time.perf_counter()
+        try:
+            get_city_district_and_national_statistics_commercial_district(stat_item_id)
+            error = None
+        except Exception as e:
+            error = str(e)
+        results.append((stat_item_id, time.perf_counter() - started, error))
+    return results
+
+
+STATISTICS_TASKS = {
+    "j_score_national": _run_j_score_national_shard,
+    "national_statistics": _run_national_statistics_shard,
+}
+
+
+def _run_statistics_shard(task_name, stat_item_ids):
+    """워커 프로세스에서 실행 - [(stat_item_id, 소요 시간, 오류), ...] 반환"""
+    return STATISTICS_TASKS[task_name](stat_item_ids)
 
-    for idx in tqdm(
-        range(statistics_start_id, statistics_end_id + 1), desc="Processing"
-    ):
-        tqdm.write(f"Currently processing idx: {idx}")
-        get_city_district_and_national_statistics_commercial_district(idx)
+
+def _load_statistics_state(job_name):
+    path = os.path.join(STATISTICS_STATE_DIR, f"{job_name}.json")
+    if not os.path.exists(path):
+        return {"done": [], "timings": {}, "failed": {}}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_statistics_state(job_name, state):
+    os.makedirs(STATISTICS_STATE_DIR, exist_ok=True)
+    path = os.path.join(STATISTICS_STATE_DIR, f"{job_name}.json")
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def run_statistics_batch(task_name, stat_item_ids=None, job_name=None, workers=None, shard_size=20):
+    """
+    stat_item_id 를 shard_size 개씩 나눠서 프로세스 풀로 실행
+    stat_item_ids 를 생략하면 STAT_ITEM 에서 상권 통계 항목을 조회
+    job_name 을 생략하면 작업명_실행일 - 같은 날 다시 실행하면 이어서 처리
+    """
+    if stat_item_ids is None:
+        stat_item_ids = crud_select_commercial_stat_item_ids()
+    job_name = job_name or f"{task_name}_{date.today().isoformat()}"
+    workers = min(workers or STATISTICS_MAX_WORKERS, STATISTICS_MAX_WORKERS)
+
+    state = _load_statistics_state(job_name)
+    done = set(state["done"])
+    pending = [stat_item_id for stat_item_id in stat_item_ids if stat_item_id not in done]
+    shards = [pending[i:i + shard_size] for i in range(0, len(pending), shard_size)]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_run_statistics_shard, task_name, shard) for shard in shards]
+
+        with tqdm(total=len(stat_item_ids), initial=len(stat_item_ids) - len(pending), desc=job_name) as progress:
+            for future in as_completed(futures):
+                results = future.result()
+                for stat_item_id, seconds, error in results:
+                    if error:
+                        tqdm.write(f"failed stat_item_id {stat_item_id}: {error}")
+                        state["failed"][str(stat_item_id)] = error
+                    else:
+                        state["done"].append(stat_item_id)
+                        state["timings"][str(stat_item_id)] = round(seconds, 3)
+                        state["failed"].pop(str(stat_item_id), None)
+
+                # 묶음 하나 끝날 때마다 체크포인트 저장
+                _save_statistics_state(job_name, state)
+                progress.update(len(results))
+
+    return state
+
+
+def loop_commercial_district_statistics():
+    run_statistics_batch("j_score_national")
+    run_statistics_batch("national_statistics")
 
 
 def loop_avg_commercial_district_statistics():
-    statistics_start_id, statistics_end_id = 11, 1699
-    for idx in tqdm(
-        range(statistics_start_id, statistics_end_id + 1), desc="Processing"
-    ):
-        tqdm.write(f"Currently processing idx: {idx}")
-        get_city_district_and_national_statistics_commercial_district(idx)
+    run_statistics_batch(
+        "national_statistics", job_name=f"avg_national_statistics_{date.today().isoformat()}"
+    )
 
 
 # 테스트 실행 예시
@@ -0,0 +1,112 @@
+import functools
+
+import httpx
+import pytest
+
+from app.service import geocoding
+from app.service import loc_store_to_report
+
+
+# 주소 -> 좌표 (없는 주소는 결과 없음 응답)
+COORDINATES = {
+    "서울 강남구 테헤란로 1": ("127.0276", "37.4979"),
+    "서울 강남구 테헤란로 2": ("127.0280", "37.4981"),
+}
+
+
+def make_transport(calls):
+    """vworld 주소 API 스텁 - 요청한 주소를 calls 에 기록"""
+
+    def handler(request):
+        address = request.url.params["address"]
+        calls.append(address)
+        if address not in COORDINATES:
+            return httpx.Response(200, json={"response": {"status": "NOT_FOUND"}})
+        x, y = COORDINATES[address]
+        return httpx.Response(200, json={"response": {"result": {"point": {"x": x, "y": y}}}})
+
+    return httpx.MockTransport(handler)
+
+
+def store_row(store_name, road_name="서울 강남구 테헤란로 1", **values):
+    row = {
+        "city_id": 1,
+        "district_id": 10,
+        "sub_district_id": 100,
+        "reference_id": 1,
+        "large_category_code": "I2",
+        "medium_category_code": "I201",
+        "small_category_code": "I20101",
+        "store_name": store_name,
+        "road_name": road_name,
+    }
+    row.update(values)
+    return row
+
+
+@pytest.mark.asyncio
+async def test_geocode_road_names_queries_each_address_once():
+    calls = []
+    results = await geocoding.geocode_road_names(
+        ["서울 강남구 테헤란로 1", "없는 주소", "서울 강남구 테헤란로 1"],
+        transport=make_transport(calls),
+    )
+
+    assert sorted(calls) == ["서울 강남구 테헤란로 1", "없는 주소"]
+    assert results["서울 강남구 테헤란로 1"] == (("127.0276", "37.4979"), None)
+    assert results["없는 주소"] == (None, "좌표 파싱 실패")
+
+
+@pytest.mark.asyncio
+async def test_geocode_throttle_is_shared_per_loop():
+    semaphore, limiter = geocoding._get_throttle()
+    assert geocoding._get_throttle() == (semaphore, limiter)
+
+
+@pytest.mark.asyncio
+async def test_add_new_stores_bulk_results(monkeypatch):
+    calls = []
+    saved = []
+
+    def find_existing_stores(keys):
+        # 기존 매장 : "기존매장"
+        return {key for key in keys if key[-1] == "기존매장"}
+
+    def add_new_stores(stores):
+        saved.extend(stores)
+        return True
+
+    monkeypatch.setattr(loc_store_to_report, "crud_find_existing_stores", find_existing_stores)
+    monkeypatch.setattr(loc_store_to_report, "crud_get_category_name", lambda code: ("음식", "한식", "백반"))
+    monkeypatch.setattr(loc_store_to_report, "crud_next_store_business_numbers", lambda count: [f"JS{100 + i:04d}" for i in range(count)])
+    monkeypatch.setattr(loc_store_to_report, "crud_add_new_stores", add_new_stores)
+    monkeypatch.setattr(
+        loc_store_to_report,
+        "geocode_road_names",
+        functools.partial(geocoding.geocode_road_names, transport=make_transport(calls)),
+    )
+
+    results = await loc_store_to_report.add_new_stores_bulk([
+        store_row("새매장"),
+        store_row(" 새매장 "),  # 0번 행과 같은 매장 (앞뒤 공백 무시)
+        store_row("기존매장"),
+        store_row("주소오류", road_name="없는 주소"),
+        store_row("입력오류", city_id="서울"),
+        store_row("두번째매장", road_name="서울 강남구 테헤란로 2", selected=["jsam"]),
+    ])
+
+    assert [result["index"] for result in results] == [0, 1, 2, 3, 4, 5]
+    assert [result["success"] for result in results] == [True, False, False, False, False, True]
+    assert results[1]["message"] == "요청 내 중복 매장입니다. (0번 행)"
+    assert results[2]["message"] == "이미 등록된 매장입니다."
+    assert results[3]["message"] == "좌표 파싱 실패"
+    assert results[4]["message"].startswith("입력값 오류 (city_id")
+    assert results[0]["number"] == "JS0100"
+    assert results[5]["number"] == "JS0101"
+
+    # 중복 / 기존 매장은 위경도를 조회하지 않고, 같은 주소는 한 번만 조회
+    assert sorted(calls) == ["서울 강남구 테헤란로 1", "서울 강남구 테헤란로 2", "없는 주소"]
+
+    assert [store["store_name"] for store in saved] == ["새매장", "두번째매장"]
+    assert saved[1]["longitude"] == "127.0280"
+    assert saved[1]["tag_flags"] == {"jsam": 1, "ktmyshop": 0, "PULMUONE": 0}
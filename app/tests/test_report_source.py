@@ -0,0 +1,70 @@
+from datetime import date
+
+from app.crud import loc_store_to_report
+
+
+NICE_REF_DATE = date(2024, 6, 1)
+
+STORE = {
+    "SUB_DISTRICT_ID": 100,
+    "DISTRICT_ID": 10,
+    "REP_ID": 7,
+    "STORE_NAME": "새매장",
+    "LOC_INFO_REF_DATE": date(2024, 7, 1),
+}
+
+COMMERCIAL_ROWS = [
+    {"Y_M": date(2024, 5, 1), "MARKET_SIZE": 1},
+    {"Y_M": NICE_REF_DATE, "MARKET_SIZE": 2},
+]
+
+
+class FakeCursor:
+    """쿼리 내용으로 결과를 고르는 DictCursor 스텁 - 바인딩한 값을 SELECT 로 받으면 MySQL 처럼 문자열로 돌려줌"""
+
+    def __init__(self):
+        self.result = []
+
+    def execute(self, query, params=None):
+        if "MAX(Y_M) as REF_DATE" in query:
+            self.result = [{"REF_DATE": NICE_REF_DATE}]
+        elif "FROM LOCAL_STORE ls" in query:
+            if "%s AS NICE_BIZ_MAP_DATA_REF_DATE" in query:
+                nice_ref_date = str(params[0])
+            elif "NULL AS NICE_BIZ_MAP_DATA_REF_DATE" in query:
+                nice_ref_date = None
+            else:
+                nice_ref_date = NICE_REF_DATE
+            self.result = [{**STORE, "NICE_BIZ_MAP_DATA_REF_DATE": nice_ref_date}]
+        elif "FROM COMMERCIAL_DISTRICT\n            WHERE SUB_DISTRICT_ID = %s AND BIZ_DETAIL_CATEGORY_ID = %s" in query:
+            self.result = [dict(row) for row in COMMERCIAL_ROWS]
+        else:
+            self.result = []
+
+    def fetchone(self):
+        return self.result[0] if self.result else None
+
+    def fetchall(self):
+        return list(self.result)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def cursor(self, *args):
+        return FakeCursor()
+
+    def close(self):
+        pass
+
+
+def test_bulk_report_source_matches_single(monkeypatch):
+    monkeypatch.setattr(loc_store_to_report, "get_db_connection", FakeConnection)
+
+    single = loc_store_to_report.get_report_source_data("JS0001")
+    shared = loc_store_to_report.get_report_shared_data()
+    bulk = loc_store_to_report.get_report_source_data("JS0001", shared)
+
+    assert single["commercial"] == {"Y_M": NICE_REF_DATE, "MARKET_SIZE": 2}
+    assert bulk == single